@@ -0,0 +1,38 @@
+"""checksums de anexos: sha256, verified_at, checksum_mismatch; tabela job_cursors
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("attachments", sa.Column("sha256", sa.String(64), nullable=True))
+    op.add_column("attachments", sa.Column("verified_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "attachments",
+        sa.Column("checksum_mismatch", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.create_table(
+        "job_cursors",
+        sa.Column("name", sa.String(64), primary_key=True),
+        sa.Column("position", sa.String(512), nullable=False, server_default=""),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_cursors")
+    op.drop_column("attachments", "checksum_mismatch")
+    op.drop_column("attachments", "verified_at")
+    op.drop_column("attachments", "sha256")
@@ -0,0 +1,26 @@
+"""original retido na normalização: original_file_path, original_mime_type
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("attachments", sa.Column("original_file_path", sa.String(512), nullable=True))
+    op.add_column("attachments", sa.Column("original_mime_type", sa.String(128), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("attachments", "original_mime_type")
+    op.drop_column("attachments", "original_file_path")
@@ -0,0 +1,87 @@
+"""filtros admin: lookup administrative_regions e índices compostos (filtro, created_at, id)
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.utils.text import fold_text
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = {
+    "ix_manifestations_status_created_at": ["status", "created_at", "id"],
+    "ix_manifestations_input_type_created_at": ["input_type", "created_at", "id"],
+    "ix_manifestations_region_created_at": ["administrative_region_id", "created_at", "id"],
+    "ix_manifestations_anonymous_created_at": ["anonymous", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "administrative_regions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("key", sa.String(128), nullable=False),
+        sa.Column("name", sa.String(128), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("key"),
+    )
+    op.add_column("manifestations", sa.Column("administrative_region_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "fk_manifestations_administrative_region",
+        "manifestations",
+        "administrative_regions",
+        ["administrative_region_id"],
+        ["id"],
+    )
+
+    # Backfill: um registro por nome normalizado (primeira grafia encontrada vira o nome).
+    conn = op.get_bind()
+    names = conn.execute(
+        sa.text(
+            "SELECT DISTINCT administrative_region FROM manifestations "
+            "WHERE administrative_region IS NOT NULL ORDER BY administrative_region"
+        )
+    ).scalars().all()
+    keys: dict[str, int] = {}
+    for name in names:
+        key = fold_text(name)[:128]
+        if not key:
+            continue
+        if key not in keys:
+            conn.execute(
+                sa.text("INSERT INTO administrative_regions (`key`, name) VALUES (:k, :n)"),
+                {"k": key, "n": " ".join(name.split())[:128]},
+            )
+            keys[key] = conn.execute(
+                sa.text("SELECT id FROM administrative_regions WHERE `key` = :k"), {"k": key}
+            ).scalar_one()
+        conn.execute(
+            sa.text("UPDATE manifestations SET administrative_region_id = :id WHERE administrative_region = :n"),
+            {"id": keys[key], "n": name},
+        )
+    op.drop_column("manifestations", "administrative_region")
+
+    for name, cols in _INDEXES.items():
+        op.create_index(name, "manifestations", cols, unique=False)
+
+
+def downgrade() -> None:
+    for name in _INDEXES:
+        op.drop_index(name, table_name="manifestations")
+    op.add_column("manifestations", sa.Column("administrative_region", sa.String(128), nullable=True))
+    op.execute(
+        "UPDATE manifestations m JOIN administrative_regions r ON r.id = m.administrative_region_id "
+        "SET m.administrative_region = r.name"
+    )
+    op.drop_constraint("fk_manifestations_administrative_region", "manifestations", type_="foreignkey")
+    op.drop_column("manifestations", "administrative_region_id")
+    op.drop_table("administrative_regions")
@@ -0,0 +1,30 @@
+"""busca textual: índice FULLTEXT (original_text, extracted_text, summary, subject_label)
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = ["original_text", "extracted_text", "summary", "subject_label"]
+
+
+def upgrade() -> None:
+    # Só MySQL/MariaDB; nos demais bancos a busca usa o índice em processo.
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.create_index("ft_manifestations_text", "manifestations", _COLUMNS, mysql_prefix="FULLTEXT")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.drop_index("ft_manifestations_text", table_name="manifestations")
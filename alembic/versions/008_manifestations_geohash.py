@@ -0,0 +1,52 @@
+"""mapa: coluna geohash (calculada de location_lat/lng) e índice de cobertura
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.utils.geohash import encode
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("manifestations", sa.Column("geohash", sa.String(12), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, location_lat, location_lng FROM manifestations "
+            "WHERE location_lat IS NOT NULL AND location_lng IS NOT NULL"
+        )
+    ).all()
+    update = sa.text("UPDATE manifestations SET geohash = :g WHERE id = :id")
+    batch = []
+    for row in rows:
+        if -90 <= row.location_lat <= 90 and -180 <= row.location_lng <= 180:
+            batch.append({"g": encode(row.location_lat, row.location_lng), "id": row.id})
+        if len(batch) >= 1000:
+            conn.execute(update, batch)
+            batch = []
+    if batch:
+        conn.execute(update, batch)
+
+    op.create_index(
+        "ix_manifestations_geohash",
+        "manifestations",
+        ["geohash", "location_lat", "location_lng", "status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_manifestations_geohash", table_name="manifestations")
+    op.drop_column("manifestations", "geohash")
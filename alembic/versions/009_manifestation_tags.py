@@ -0,0 +1,61 @@
+"""tags complementares: tabela manifestation_tags indexada, preenchida do JSON
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+import json
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.utils.text import fold_text
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "manifestation_tags",
+        sa.Column("manifestation_id", sa.String(36), nullable=False),
+        sa.Column("tag", sa.String(64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["manifestation_id"], ["manifestations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("manifestation_id", "tag"),
+    )
+
+    # Backfill a partir do JSON (mesma normalização de app.infrastructure.db.tags).
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, complementary_tags, created_at FROM manifestations WHERE complementary_tags IS NOT NULL")
+    ).all()
+    insert = sa.text("INSERT INTO manifestation_tags (manifestation_id, tag, created_at) VALUES (:m, :t, :c)")
+    batch = []
+    for row in rows:
+        tags = json.loads(row.complementary_tags) if isinstance(row.complementary_tags, str) else row.complementary_tags
+        if not isinstance(tags, list):
+            tags = [tags]
+        keys = dict.fromkeys(k for k in (fold_text(str(t))[:64] for t in tags) if k)
+        batch.extend({"m": row.id, "t": k, "c": row.created_at} for k in keys)
+        if len(batch) >= 1000:
+            conn.execute(insert, batch)
+            batch = []
+    if batch:
+        conn.execute(insert, batch)
+
+    op.create_index(
+        "ix_manifestation_tags_tag_created_at",
+        "manifestation_tags",
+        ["tag", "created_at", "manifestation_id"],
+        unique=False,
+    )
+    op.create_index("ix_manifestation_tags_created_at_tag", "manifestation_tags", ["created_at", "tag"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table("manifestation_tags")
@@ -0,0 +1,38 @@
+"""estatísticas: rollup diário por status, tipo de entrada e região
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "manifestation_daily_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("input_type", sa.String(16), nullable=False),
+        sa.Column("administrative_region_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("day", "status", "input_type", "administrative_region_id"),
+    )
+    # Carga inicial (depois, python -m app.jobs.rebuild_stats reconcilia quando preciso).
+    op.execute(
+        "INSERT INTO manifestation_daily_stats (day, status, input_type, administrative_region_id, count) "
+        "SELECT DATE(created_at), status, input_type, COALESCE(administrative_region_id, 0), COUNT(*) "
+        "FROM manifestations GROUP BY DATE(created_at), status, input_type, COALESCE(administrative_region_id, 0)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("manifestation_daily_stats")
@@ -0,0 +1,94 @@
+"""ids: UUIDv7 e armazenamento opcional em BINARY(16) (ID_STORAGE=binary16)
+
+Com ID_STORAGE=char36 (padrão) não há mudança de esquema: a aplicação passa a gerar
+UUIDv7 e as linhas antigas (UUID4) continuam válidas no mesmo CHAR(36).
+
+Com ID_STORAGE=binary16 no momento do upgrade (MySQL), os ids e as FKs para
+manifestations.id são convertidos no lugar: CHAR(36) → VARBINARY(36) (mesmos bytes)
+→ UNHEX sem hífens → BINARY(16). Tabelas grandes: ALTER reescreve cada tabela; rodar
+em janela de manutenção. O downgrade faz o caminho inverso.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.config import get_settings
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabela, coluna): ids e FKs para manifestations.id
+_ID_COLUMNS = [
+    ("manifestations", "id"),
+    ("attachments", "id"),
+    ("attachments", "manifestation_id"),
+    ("manifestation_tags", "manifestation_id"),
+]
+_REFERENCING = ("attachments", "manifestation_tags")
+
+
+def _binary_requested() -> bool:
+    if get_settings().id_storage != "binary16":
+        return False
+    if op.get_bind().dialect.name != "mysql":
+        raise RuntimeError(
+            "ID_STORAGE=binary16 só tem migração para MySQL; em outros bancos recrie o esquema (init_db)."
+        )
+    return True
+
+
+def _drop_fks() -> list[dict]:
+    """Remove as FKs para manifestations.id; devolve-as para recriar."""
+    insp = sa.inspect(op.get_bind())
+    dropped = []
+    for table in _REFERENCING:
+        for fk in insp.get_foreign_keys(table):
+            if fk["referred_table"] == "manifestations":
+                op.drop_constraint(fk["name"], table, type_="foreignkey")
+                dropped.append({**fk, "source_table": table})
+    return dropped
+
+
+def _create_fks(fks: list[dict]) -> None:
+    for fk in fks:
+        op.create_foreign_key(
+            fk["name"],
+            fk["source_table"],
+            "manifestations",
+            fk["constrained_columns"],
+            fk["referred_columns"],
+            ondelete=fk.get("options", {}).get("ondelete"),
+        )
+
+
+def upgrade() -> None:
+    if not _binary_requested():
+        return
+    fks = _drop_fks()
+    for table, col in _ID_COLUMNS:
+        op.execute(f"ALTER TABLE {table} MODIFY {col} VARBINARY(36) NOT NULL")
+        op.execute(f"UPDATE {table} SET {col} = UNHEX(REPLACE({col}, '-', ''))")
+        op.execute(f"ALTER TABLE {table} MODIFY {col} BINARY(16) NOT NULL")
+    _create_fks(fks)
+
+
+def downgrade() -> None:
+    if not _binary_requested():
+        return
+    fks = _drop_fks()
+    for table, col in _ID_COLUMNS:
+        op.execute(f"ALTER TABLE {table} MODIFY {col} VARBINARY(36) NOT NULL")
+        op.execute(
+            f"UPDATE {table} SET {col} = LOWER(INSERT(INSERT(INSERT(INSERT(HEX({col}), 9, 0, '-'), "
+            "14, 0, '-'), 19, 0, '-'), 24, 0, '-'))"
+        )
+        op.execute(f"ALTER TABLE {table} MODIFY {col} CHAR(36) NOT NULL")
+    _create_fks(fks)
@@ -0,0 +1,27 @@
+"""última atividade: coluna updated_at em manifestations (GC de rascunhos)
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("manifestations", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE manifestations SET updated_at = created_at")
+    op.create_index("ix_manifestations_status_updated_at", "manifestations", ["status", "updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_manifestations_status_updated_at", table_name="manifestations")
+    op.drop_column("manifestations", "updated_at")
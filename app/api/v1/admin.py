@@ -2,12 +2,32 @@
 Rotas admin (demonstração, sem autenticação).
 """
 
-from fastapi import APIRouter, Depends, Query
+from datetime import date, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.application.use_cases.list_manifestations import list_manifestations
+from app.application.use_cases.list_manifestations import ManifestationFilters, list_manifestations
+from app.application.use_cases.manifestation_stats import StatsQueryError, manifestation_stats
+from app.application.use_cases.map_clusters import clusters_cache
+from app.application.use_cases.search_manifestations import search_manifestations
+from app.application.use_cases.tag_facets import tag_facets
+from app.domain.enums import InputType, ManifestationStatus
+from app.infrastructure.cache.derivative_cache import derivative_cache
+from app.infrastructure.cache.protocol_cache import cache_stats
+from app.infrastructure.db.autosave import autosave_buffer
 from app.infrastructure.db.session import get_db
-from app.schemas.manifestation import ManifestationListItem, ManifestationsListResponse
+from app.infrastructure.events import get_broker
+from app.infrastructure.search import search_index, uses_memory_index
+from app.schemas.manifestation import (
+    ManifestationsListResponse,
+    SearchResponse,
+    StatsResponse,
+    TagFacetsResponse,
+)
+from app.utils.cursor import InvalidCursor
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -16,17 +36,140 @@ router = APIRouter(prefix="/admin", tags=["admin"])
     "/manifestations",
     response_model=ManifestationsListResponse,
     summary="Listar manifestações (admin)",
-    description="Lista manifestações com paginação. Apenas para demonstração.",
+    description="Lista manifestações, mais recentes primeiro. Paginação por cursor (recomendada: repasse "
+    "next_cursor em cursor; custo constante em qualquer profundidade) ou por page (compatibilidade). "
+    "total: exact (padrão no modo page), estimate ou none (padrão no modo cursor). Filtros combináveis "
+    "(repita-os ao seguir o cursor): status, input_type, administrative_region (insensível a acento/caixa), "
+    "created_from/created_to (intervalo [from, to)), anonymous e tag (insensível a acento/caixa). "
+    "Apenas para demonstração.",
 )
 async def admin_list_manifestations(
     db: AsyncSession = Depends(get_db),
-    page: int = Query(1, ge=1, description="Página"),
+    page: int = Query(1, ge=1, description="Página (ignorada quando cursor é informado)"),
     per_page: int = Query(20, ge=1, le=100, description="Itens por página"),
-) -> ManifestationsListResponse:
-    items, total = await list_manifestations(db, page=page, per_page=per_page)
-    return ManifestationsListResponse(
-        total=total,
-        page=page,
-        per_page=per_page,
-        items=[ManifestationListItem(**x) for x in items],
+    cursor: str | None = Query(None, description="next_cursor da resposta anterior"),
+    total: Literal["exact", "estimate", "none"] | None = Query(None, description="Como calcular o total"),
+    status: ManifestationStatus | None = Query(None, description="Status"),
+    input_type: InputType | None = Query(None, description="Tipo de entrada"),
+    administrative_region: str | None = Query(None, description="Região administrativa"),
+    created_from: datetime | None = Query(None, description="Criadas a partir de (inclusivo)"),
+    created_to: datetime | None = Query(None, description="Criadas antes de (exclusivo)"),
+    anonymous: bool | None = Query(None, description="Anônimas (true) ou identificadas (false)"),
+    tag: str | None = Query(None, max_length=200, description="Tag complementar"),
+) -> JSONResponse:
+    if total is None:
+        total = "none" if cursor else "exact"
+    filters = ManifestationFilters(
+        status=status,
+        input_type=input_type,
+        administrative_region=administrative_region,
+        created_from=created_from,
+        created_to=created_to,
+        anonymous=anonymous,
+        tag=tag,
+    )
+    try:
+        result = await list_manifestations(
+            db, page=page, per_page=per_page, cursor=cursor, total=total, filters=filters
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Itens já vêm prontos para JSON do use case: sem validação pydantic por item
+    # (response_model fica só para a documentação OpenAPI).
+    return JSONResponse(
+        content={
+            "total": result.total,
+            "total_estimated": result.total_estimated,
+            "page": None if cursor else page,
+            "per_page": per_page,
+            "next_cursor": result.next_cursor,
+            "items": result.items,
+        }
+    )
+
+
+@router.get(
+    "/manifestations/search",
+    response_model=SearchResponse,
+    summary="Buscar manifestações por conteúdo (admin)",
+    description="Busca em texto original, texto extraído (OCR/transcrição), resumo e assunto. Insensível a "
+    "acento e caixa; resultados por relevância (qualquer termo casa; mais termos e termos raros pesam mais).",
+)
+async def admin_search_manifestations(
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=2, max_length=200, description="Termos de busca"),
+    page: int = Query(1, ge=1, le=500, description="Página"),
+    per_page: int = Query(20, ge=1, le=100, description="Itens por página"),
+) -> JSONResponse:
+    result = await search_manifestations(db, q, page=page, per_page=per_page)
+    return JSONResponse(
+        content={
+            "q": q,
+            "backend": result.backend,
+            "total": result.total,
+            "page": page,
+            "per_page": per_page,
+            "items": result.items,
+        }
+    )
+
+
+@router.get(
+    "/manifestations/tags",
+    response_model=TagFacetsResponse,
+    summary="Tags mais frequentes (admin)",
+    description="Contagem das tags complementares mais usadas (normalizadas, sem acento/caixa) entre as "
+    "manifestações criadas em [created_from, created_to), da mais frequente para a menos frequente.",
+)
+async def admin_tag_facets(
+    db: AsyncSession = Depends(get_db),
+    created_from: datetime | None = Query(None, description="Criadas a partir de (inclusivo)"),
+    created_to: datetime | None = Query(None, description="Criadas antes de (exclusivo)"),
+    limit: int = Query(20, ge=1, le=100, description="Quantidade de tags"),
+) -> JSONResponse:
+    items = await tag_facets(db, created_from=created_from, created_to=created_to, limit=limit)
+    return JSONResponse(
+        content={
+            "created_from": created_from.isoformat() if created_from else None,
+            "created_to": created_to.isoformat() if created_to else None,
+            "items": items,
+        }
     )
+
+
+@router.get(
+    "/stats",
+    response_model=StatsResponse,
+    summary="Estatísticas para dashboard (admin)",
+    description="Contagens por status, tipo de entrada, região administrativa e dia (UTC) no intervalo "
+    "[date_from, date_to] (padrão: últimos 30 dias; máximo 731). Lê só os rollups diários, mantidos a cada "
+    "escrita; o tempo de resposta não depende do tamanho da tabela de manifestações.",
+)
+async def admin_stats(
+    db: AsyncSession = Depends(get_db),
+    date_from: date | None = Query(None, description="Primeiro dia (inclusivo)"),
+    date_to: date | None = Query(None, description="Último dia (inclusivo)"),
+) -> JSONResponse:
+    try:
+        return JSONResponse(content=await manifestation_stats(db, date_from, date_to))
+    except StatsQueryError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get(
+    "/metrics",
+    summary="Métricas em processo (admin)",
+    description="Contadores do processo atual: conexões SSE, fan-out de eventos, caches de leitura e de derivados "
+    "normalização de mídia (bytes antes/depois e tempo), índice de busca em processo e buffer do autosave.",
+)
+async def admin_metrics() -> dict:
+    from app.media.normalization import normalization_stats
+
+    autosave = autosave_buffer()
+    return {
+        "events": get_broker().stats(),
+        "caches": [*cache_stats(), derivative_cache().stats(), clusters_cache().stats()],
+        "normalization": normalization_stats(),
+        "search_index": search_index().stats() if uses_memory_index() else None,
+        "autosave": autosave.stats() if autosave is not None else None,
+    }
@@ -3,14 +3,17 @@ Rotas públicas de manifestações.
 Fluxo modernizado: POST (draft), PATCH, POST attachments, POST submit, GET por protocolo.
 """
 
+import asyncio
 import json
+import time
+from collections.abc import AsyncIterator
+from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from fastapi.responses import Response
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.application.use_cases.add_attachments import (
     AddAttachmentsError,
@@ -23,19 +26,31 @@ from app.application.use_cases.create_manifestation import (
     ValidationError as CreateValidationError,
     create_manifestation,
 )
-from app.application.use_cases.get_manifestation import get_manifestation_by_protocol
+from app.application.use_cases.get_attachment_preview import (
+    PreviewError,
+    find_preview_source,
+    render_attachment_preview,
+)
+from app.application.use_cases.get_manifestation import get_manifestation_view
+from app.application.use_cases.list_attachments import list_attachments_view
 from app.application.use_cases.submit_manifestation import (
+    SubmitConflictError,
     SubmitError,
     submit_manifestation,
 )
 from app.application.use_cases.update_manifestation import (
+    UpdateConflictError,
     UpdateError,
     UpdateManifestationInput,
     update_manifestation,
 )
+from app.core.config import get_settings
+from app.domain.enums import ManifestationStatus
 from app.infrastructure.db.models import AttachmentModel, ManifestationModel
-from app.infrastructure.db.session import get_db
-from app.infrastructure.storage.local_storage import LocalStorage
+from app.infrastructure.db.session import get_db, session_scope
+from app.infrastructure.events import BrokerFullError, Subscription, get_broker
+from app.infrastructure.events.broker import encode_event
+from app.infrastructure.storage.backend import StorageBackend, get_storage
 from app.schemas.manifestation import (
     AttachmentsListResponse,
     AttachmentListItem,
@@ -45,13 +60,16 @@ from app.schemas.manifestation import (
     UpdateManifestationBody,
     UpdateManifestationResponse,
 )
+from app.utils.file_validation import extension_from_mime
+from app.utils.http_cache import cache_headers, etag_matches, not_modified
+from app.utils.range_response import RangedFileResponse
 
 
 router = APIRouter(prefix="/manifestations", tags=["manifestations"])
 
 
-def _storage() -> LocalStorage:
-    return LocalStorage()
+def _storage() -> StorageBackend:
+    return get_storage()
 
 
 def _opt_str(s: str | None) -> str | None:
@@ -152,7 +170,7 @@ async def create(
         )
     except CreateValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return CreateManifestationResponse(id=out.id, protocol=out.protocol, status=out.status)
+    return CreateManifestationResponse(id=out.id, protocol=out.protocol, status=out.status, version=out.version)
 
 
 # --- PATCH update ---
@@ -162,7 +180,8 @@ async def create(
     "/{manifestation_id}",
     response_model=UpdateManifestationResponse,
     summary="Atualizar manifestação (draft)",
-    description="Atualiza qualquer etapa. Apenas rascunhos. Use id retornado no POST.",
+    description="Atualiza qualquer etapa. Apenas rascunhos. Use id retornado no POST. "
+    "Envie version para detectar edição concorrente (409).",
 )
 async def update(
     manifestation_id: str,
@@ -183,12 +202,15 @@ async def update(
         contact_name=body.contact_name,
         contact_email=body.contact_email,
         contact_phone=body.contact_phone,
+        version=body.version,
     )
     try:
         out = await update_manifestation(db, manifestation_id, inp)
+    except UpdateConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except UpdateError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return UpdateManifestationResponse(id=out.id, protocol=out.protocol, status=out.status)
+    return UpdateManifestationResponse(id=out.id, protocol=out.protocol, status=out.status, version=out.version)
 
 
 # --- POST attachments ---
@@ -220,7 +242,7 @@ async def add_attachments_route(
         raise HTTPException(status_code=400, detail=str(e))
     except AddValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return {"manifestation_id": out.manifestation_id, "added_count": out.added_count}
+    return {"manifestation_id": out.manifestation_id, "added_count": out.added_count, "version": out.version}
 
 
 # --- POST submit ---
@@ -234,30 +256,143 @@ async def add_attachments_route(
 )
 async def submit(
     manifestation_id: str,
+    version: int | None = Query(None, description="Versão lida por último; 409 se desatualizada"),
     db: AsyncSession = Depends(get_db),
 ) -> SubmitManifestationResponse:
     try:
-        out = await submit_manifestation(db, manifestation_id)
+        out = await submit_manifestation(db, manifestation_id, version)
+    except SubmitConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except SubmitError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return SubmitManifestationResponse(protocol=out.protocol, status=out.status)
+    return SubmitManifestationResponse(protocol=out.protocol, status=out.status, version=out.version)
+
+
+# --- GET events (SSE) ---
+
+
+class _SSEResponse(StreamingResponse):
+    """
+    Fecha a assinatura em qualquer saída da resposta. O finally de _sse_stream não
+    basta: se o cliente cai antes do primeiro byte, o gerador nunca inicia e a vaga
+    ficaria contada em sse_max_connections até o processo reiniciar.
+    """
+
+    def __init__(self, sub: Subscription, content: AsyncIterator[bytes], **kwargs) -> None:
+        super().__init__(content, **kwargs)
+        self._sub = sub
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._sub.close()
+
+
+async def _sse_stream(
+    request: Request,
+    sub: Subscription,
+    snapshot: bytes,
+) -> AsyncIterator[bytes]:
+    """Envia snapshot inicial, repassa eventos do broker e heartbeats até desconectar."""
+    cfg = get_settings()
+    deadline = time.monotonic() + cfg.sse_max_stream_seconds
+    try:
+        yield snapshot
+        while time.monotonic() < deadline:
+            try:
+                frame = await asyncio.wait_for(sub.get(), timeout=cfg.sse_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield b": ping\n\n"
+                continue
+            yield frame
+    finally:
+        sub.close()
+
+
+@router.get(
+    "/{protocol}/events",
+    summary="Eventos de processamento (SSE)",
+    description="Stream text/event-stream com status e progresso da extração. "
+    "Aceita protocolo ou id (rascunho). Substitui polling do GET por protocolo. 503 se o limite de conexões for atingido.",
+)
+async def stream_events(protocol: str, request: Request) -> StreamingResponse:
+    # Sessão curta: não prende conexão do pool durante o stream.
+    async with session_scope() as db:
+        q = select(ManifestationModel.id, ManifestationModel.protocol, ManifestationModel.status).where(
+            or_(ManifestationModel.protocol == protocol, ManifestationModel.id == protocol)
+        )
+        row = (await db.execute(q)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Manifestação não encontrada.")
+    status = row.status.value if isinstance(row.status, ManifestationStatus) else row.status
+    snapshot = encode_event("status", {"protocol": row.protocol, "status": status})
+    try:
+        sub = get_broker().subscribe(row.id)
+    except BrokerFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return _SSEResponse(
+        sub,
+        _sse_stream(request, sub, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # --- GET (mais específicas primeiro) ---
 
 
+@router.get(
+    "/{protocol}/attachments/{attachment_id}/preview",
+    summary="Pré-visualização do anexo",
+    description="Miniatura (imagem), quadro de pôster (vídeo) ou forma de onda PNG (áudio). "
+    "Gerada no primeiro pedido e mantida em cache em disco; size é ajustado ao tamanho configurado "
+    "mais próximo (PREVIEW_SIZES). Suporta If-None-Match (304).",
+)
+async def attachment_preview(
+    protocol: str,
+    attachment_id: UUID,
+    request: Request,
+    size: int = Query(256, ge=16, le=4096, description="Lado maior em pixels"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    src = await find_preview_source(db, protocol, str(attachment_id), size)
+    if src is None:
+        raise HTTPException(status_code=404, detail="Anexo não encontrado.")
+    headers = cache_headers(src.etag, get_settings().cache_control_download)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
+    try:
+        data, media_type = await render_attachment_preview(_storage(), src)
+    except PreviewError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(content=data, media_type=media_type, headers=headers)
+
+
+@router.head("/{protocol}/attachments/{attachment_id}", include_in_schema=False)
 @router.get(
     "/{protocol}/attachments/{attachment_id}",
     summary="Download do anexo",
-    description="Download do arquivo. Nunca expõe caminhos internos.",
+    description="Download do arquivo em streaming. Nunca expõe caminhos internos. "
+    "Suporta If-None-Match (304) e Range (206, inclusive multipart/byteranges) para seek em players. "
+    "Com DOWNLOAD_MODE=x-accel/x-sendfile, apenas autoriza e delega os bytes ao proxy reverso.",
 )
 async def download_attachment(
     protocol: str,
     attachment_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ) -> Response:
     q = (
-        select(AttachmentModel)
+        select(
+            AttachmentModel.id,
+            AttachmentModel.mime_type,
+            AttachmentModel.size_bytes,
+            AttachmentModel.file_path,
+            AttachmentModel.sha256,
+        )
         .join(ManifestationModel, AttachmentModel.manifestation_id == ManifestationModel.id)
         .where(
             AttachmentModel.id == str(attachment_id),
@@ -265,19 +400,40 @@ async def download_attachment(
         )
     )
     r = await db.execute(q)
-    a = r.scalar_one_or_none()
+    a = r.first()
     if not a:
         raise HTTPException(status_code=404, detail="Anexo não encontrado.")
-    storage = LocalStorage()
-    if not storage.exists(a.file_path):
+    cfg = get_settings()
+    # Anexos são imutáveis: o SHA-256 (ou, em anexos antigos, id + tamanho) identifica o conteúdo.
+    etag = f'"{a.sha256}"' if a.sha256 else f'"{a.id}-{a.size_bytes}"'
+    headers = cache_headers(etag, cfg.cache_control_download)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
+    storage = _storage()
+    # Extensão pelo MIME: file_path pode ser referência de segmento ("_segments/seg-….pack@0+123").
+    filename = f"{attachment_id}.{extension_from_mime(a.mime_type)}"
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    rel_path = await storage.resolve(a.file_path)
+    local = storage.local_path(rel_path)
+    if cfg.download_mode in ("x-accel", "x-sendfile") and local is not None:
+        if cfg.download_mode == "x-accel":
+            # Cabeçalho interno: consumido pelo nginx, não chega ao cliente.
+            headers["X-Accel-Redirect"] = cfg.download_accel_prefix.rstrip("/") + "/" + quote(rel_path)
+        else:
+            headers["X-Sendfile"] = str(local)
+        return Response(media_type=a.mime_type, headers=headers)
+
+    size = await storage.size(rel_path)
+    if size is None:
         raise HTTPException(status_code=404, detail="Arquivo não encontrado no storage.")
-    body = storage.read_bytes(a.file_path)
-    return Response(
-        content=body,
+    return RangedFileResponse(
+        size=size,
         media_type=a.mime_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{attachment_id}.{a.file_path.split(".")[-1]}"',
-        },
+        reader=lambda start, end: storage.open_stream(rel_path, start, end),
+        range_header=request.headers.get("range"),
+        if_range=request.headers.get("if-range"),
+        path=local,
+        headers=headers,
     )
 
 
@@ -285,45 +441,42 @@ async def download_attachment(
     "/{protocol}/attachments",
     response_model=AttachmentsListResponse,
     summary="Listar anexos",
-    description="Lista anexos da manifestação (por protocolo).",
+    description="Lista anexos da manifestação (por protocolo). Suporta If-None-Match (304).",
 )
 async def list_attachments(
     protocol: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> AttachmentsListResponse:
-    q = (
-        select(ManifestationModel)
-        .where(ManifestationModel.protocol == protocol)
-        .options(selectinload(ManifestationModel.attachments))
-    )
-    r = await db.execute(q)
-    m = r.scalar_one_or_none()
-    if not m:
+) -> Response:
+    view = await list_attachments_view(db, protocol)
+    if view is None:
         raise HTTPException(status_code=404, detail="Manifestação não encontrada.")
-    items = [
-        AttachmentListItem(
-            id=a.id,
-            type=a.type.value,
-            mime_type=a.mime_type,
-            size_bytes=a.size_bytes,
-            created_at=a.created_at,
-        )
-        for a in m.attachments
-    ]
-    return AttachmentsListResponse(protocol=protocol, attachments=items)
+    headers = cache_headers(view.etag, get_settings().cache_control_attachments)
+    if etag_matches(request.headers.get("if-none-match"), view.etag):
+        return not_modified(headers)
+    body = AttachmentsListResponse(
+        protocol=protocol,
+        attachments=[AttachmentListItem(**a) for a in view.data],
+    )
+    return JSONResponse(content=body.model_dump(mode="json"), headers=headers)
 
 
 @router.get(
     "/{protocol}",
     response_model=ManifestationDetailResponse,
     summary="Consultar por protocolo",
-    description="Retorna status e dados públicos. Apenas manifestações finalizadas.",
+    description="Retorna status e dados públicos. Apenas manifestações finalizadas. Suporta If-None-Match (304).",
 )
 async def get_by_protocol(
     protocol: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> ManifestationDetailResponse:
-    data = await get_manifestation_by_protocol(db, protocol)
-    if not data:
+) -> Response:
+    view = await get_manifestation_view(db, protocol)
+    if view is None:
         raise HTTPException(status_code=404, detail="Manifestação não encontrada.")
-    return ManifestationDetailResponse(**data)
+    headers = cache_headers(view.etag, get_settings().cache_control_manifestation)
+    if etag_matches(request.headers.get("if-none-match"), view.etag):
+        return not_modified(headers)
+    body = ManifestationDetailResponse(**view.data)
+    return JSONResponse(content=body.model_dump(mode="json"), headers=headers)
@@ -0,0 +1,41 @@
+"""
+Mapa público: manifestações agregadas por célula de grade (sem dados individuais).
+
+    GET /v1/map/clusters?bbox=west,south,east,north&zoom=12
+
+Cada cluster traz centróide (média dos pontos), contagem e limites da célula. A
+grade depende do zoom e é limitada a MAP_MAX_CELLS células. Suporta If-None-Match (304).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.map_clusters import MAX_ZOOM, MapQueryError, map_clusters_view
+from app.core.config import get_settings
+from app.infrastructure.db.session import get_db
+from app.utils.http_cache import cache_headers, etag_matches, not_modified
+
+router = APIRouter(prefix="/map", tags=["map"])
+
+
+@router.get(
+    "/clusters",
+    summary="Clusters do mapa",
+    description="Contagem de manifestações por célula de grade na caixa (west,south,east,north), "
+    "com centróide e limites de cada célula. Rascunhos não aparecem. Suporta If-None-Match (304).",
+)
+async def map_clusters(
+    request: Request,
+    bbox: str = Query(..., description="west,south,east,north em graus"),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    try:
+        view = await map_clusters_view(db, bbox, zoom)
+    except MapQueryError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    headers = cache_headers(view.etag, get_settings().cache_control_map)
+    if etag_matches(request.headers.get("if-none-match"), view.etag):
+        return not_modified(headers)
+    return JSONResponse(content=view.data, headers=headers)
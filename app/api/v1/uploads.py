@@ -0,0 +1,165 @@
+"""
+Uploads retomáveis (subconjunto do protocolo tus 1.0: creation, core e termination).
+Para conexões instáveis: o cliente envia o arquivo em partes e, se a conexão cair,
+consulta o offset (HEAD) e continua de onde parou em vez de reenviar tudo.
+
+    POST   /v1/manifestations/{id}/uploads              Upload-Length, Upload-Metadata → 201 + Location
+    HEAD   /v1/manifestations/{id}/uploads/{upload_id}  → Upload-Offset
+    PATCH  /v1/manifestations/{id}/uploads/{upload_id}  Upload-Offset + bytes → 204 + Upload-Offset
+    DELETE /v1/manifestations/{id}/uploads/{upload_id}  → 204
+
+Quando Upload-Offset atinge Upload-Length o anexo é criado (mesmo fluxo do POST attachments)
+e o PATCH final traz X-Version (nova version do rascunho).
+Upload finalizado segue respondendo ao HEAD (offset == length) e a PATCH com offset == length
+(204, sem criar outro anexo) até expirar: uploads parados ou finalizados há mais de
+RESUMABLE_UPLOAD_TTL_SECONDS são removidos (app.jobs.gc_storage).
+"""
+
+import base64
+import binascii
+from email.utils import formatdate
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.add_attachments import AddAttachmentsError, ValidationError
+from app.application.use_cases.resumable_upload import (
+    UploadLengthInvalid,
+    UploadLengthTooLarge,
+    UploadNotFound,
+    UploadTypeNotAllowed,
+    create_upload,
+    finalize_upload,
+    get_upload,
+    terminate_upload,
+    write_chunk,
+)
+from app.core.config import get_settings
+from app.infrastructure.db.session import get_db
+from app.infrastructure.storage.backend import get_storage
+from app.infrastructure.storage.staging import OffsetMismatch, StagedUpload, UploadTooLarge
+
+router = APIRouter(prefix="/manifestations", tags=["uploads"])
+
+TUS_VERSION = "1.0.0"
+OFFSET_CONTENT_TYPE = "application/offset+octet-stream"
+
+
+def _parse_metadata(value: str | None) -> dict[str, str]:
+    """Upload-Metadata do tus: 'chave base64(valor),chave base64(valor)'."""
+    out: dict[str, str] = {}
+    for pair in (value or "").split(","):
+        key, _, encoded = pair.strip().partition(" ")
+        if not key:
+            continue
+        try:
+            out[key] = base64.b64decode(encoded, validate=True).decode("utf-8") if encoded else ""
+        except (binascii.Error, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail=f"Upload-Metadata inválido: {key}")
+    return out
+
+
+def _headers(up: StagedUpload) -> dict[str, str]:
+    ttl = get_settings().resumable_upload_ttl_seconds
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(up.offset),
+        "Upload-Length": str(up.length),
+        "Upload-Expires": formatdate(up.updated_at + ttl, usegmt=True),
+        "Cache-Control": "no-store",
+    }
+
+
+@router.post(
+    "/{manifestation_id}/uploads",
+    status_code=201,
+    summary="Criar upload retomável (draft)",
+    description="Reserva um upload de Upload-Length bytes. Upload-Metadata (formato tus) informa "
+    "filename e filetype (MIME). Tamanho e tipo são validados antes de qualquer byte ser enviado.",
+)
+async def create_upload_route(
+    manifestation_id: str,
+    request: Request,
+    upload_length: int = Header(..., alias="Upload-Length"),
+    upload_metadata: str | None = Header(None, alias="Upload-Metadata"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    meta = _parse_metadata(upload_metadata)
+    mime = meta.get("filetype") or meta.get("content_type") or "application/octet-stream"
+    filename = meta.get("filename") or "upload"
+    try:
+        up = await create_upload(db, manifestation_id, upload_length, mime, filename)
+    except (AddAttachmentsError, UploadLengthInvalid) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadLengthTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadTypeNotAllowed as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    headers = _headers(up)
+    headers["Location"] = str(request.url_for("patch_upload_route", manifestation_id=manifestation_id, upload_id=up.id))
+    return Response(status_code=201, headers=headers)
+
+
+@router.head(
+    "/{manifestation_id}/uploads/{upload_id}",
+    summary="Offset do upload retomável",
+)
+async def head_upload_route(manifestation_id: str, upload_id: str) -> Response:
+    try:
+        up = await get_upload(manifestation_id, upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload não encontrado ou expirado.")
+    return Response(status_code=200, headers=_headers(up))
+
+
+@router.patch(
+    "/{manifestation_id}/uploads/{upload_id}",
+    status_code=204,
+    summary="Enviar parte do upload retomável",
+    description="Corpo application/offset+octet-stream gravado a partir de Upload-Offset (deve ser o "
+    "offset atual; senão 409). Ao completar Upload-Length, o anexo é adicionado à manifestação.",
+)
+async def patch_upload_route(
+    manifestation_id: str,
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    content_type: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    if (content_type or "").split(";")[0].strip().lower() != OFFSET_CONTENT_TYPE:
+        raise HTTPException(status_code=415, detail=f"Content-Type deve ser {OFFSET_CONTENT_TYPE}.")
+    try:
+        up = await write_chunk(manifestation_id, upload_id, upload_offset, request.stream())
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload não encontrado ou expirado.")
+    except OffsetMismatch as e:
+        raise HTTPException(
+            status_code=409,
+            detail="Upload-Offset não confere com o offset atual.",
+            headers={"Upload-Offset": str(e.current), "Tus-Resumable": TUS_VERSION},
+        )
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="Dados excedem o Upload-Length declarado.")
+    headers = _headers(up)
+    if up.complete and not up.finished:
+        try:
+            out = await finalize_upload(db, get_storage(), up)
+        except (AddAttachmentsError, ValidationError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if out is not None:
+            headers["X-Version"] = str(out.version)  # rascunho sem GET por id: version para o próximo PATCH
+    return Response(status_code=204, headers=headers)
+
+
+@router.delete(
+    "/{manifestation_id}/uploads/{upload_id}",
+    status_code=204,
+    summary="Cancelar upload retomável",
+)
+async def delete_upload_route(manifestation_id: str, upload_id: str) -> Response:
+    try:
+        await terminate_upload(manifestation_id, upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload não encontrado ou expirado.")
+    return Response(status_code=204, headers={"Tus-Resumable": TUS_VERSION})
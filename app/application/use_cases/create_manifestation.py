@@ -4,22 +4,18 @@ Início por texto, áudio, imagem ou vídeo. Status draft, sem protocolo.
 Extrai texto de imagens/áudios/vídeos localmente (OCR, Whisper); persiste em extracted_text.
 """
 
-import logging
 from dataclasses import dataclass
-from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.use_cases.ingest_attachments import ingest_attachments
 from app.domain.enums import AttachmentType, InputType, ManifestationStatus
-from app.infrastructure.db.models import AttachmentModel, ManifestationModel
-from app.infrastructure.storage.local_storage import LocalStorage
-from app.utils.file_validation import (
-    extension_from_mime,
-    max_file_size_bytes,
-    mime_to_attachment_type,
-)
-
-logger = logging.getLogger(__name__)
+from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.db.regions import resolve_region_id
+from app.infrastructure.db.tags import sync_manifestation_tags
+from app.infrastructure.storage.backend import StorageBackend
+from app.utils.file_validation import max_file_size_bytes, mime_to_attachment_type
+from app.utils.geohash import encode_point
 
 
 @dataclass
@@ -49,6 +45,7 @@ class CreateManifestationOutput:
     id: str
     protocol: str | None
     status: str
+    version: int
 
 
 class ValidationError(Exception):
@@ -78,7 +75,7 @@ def _detect_input_type(has_text: bool, types: set[AttachmentType]) -> InputType:
 
 async def create_manifestation(
     session: AsyncSession,
-    storage: LocalStorage,
+    storage: StorageBackend,
     inp: CreateManifestationInput,
 ) -> CreateManifestationOutput:
     """
@@ -120,8 +117,9 @@ async def create_manifestation(
         summary=inp.summary,
         location_lat=inp.location_lat,
         location_lng=inp.location_lng,
+        geohash=encode_point(inp.location_lat, inp.location_lng),
         location_description=inp.location_description,
-        administrative_region=inp.administrative_region,
+        administrative_region_id=await resolve_region_id(session, inp.administrative_region),
         anonymous=inp.anonymous,
         contact_name=inp.contact_name,
         contact_email=inp.contact_email,
@@ -130,73 +128,16 @@ async def create_manifestation(
     )
     session.add(m)
     await session.flush()
+    if m.complementary_tags:
+        await sync_manifestation_tags(session, m)
 
-    saved: list[tuple[str, str, AttachmentType]] = []  # (rel_path, abs_path, atype)
-    for content, mime, atype in validated:
-        att_id = str(uuid4())
-        ext = extension_from_mime(mime)
-        rel_path = storage.save(m.id, att_id, content, ext)
-        abs_path = storage.full_path(rel_path).resolve()
-        
-        from pathlib import Path
-        abs_path_obj = Path(abs_path)
-        if not abs_path_obj.exists():
-            logger.error("Arquivo não existe após salvar: %s (rel: %s, size: %d bytes, base: %s)", abs_path, rel_path, len(content), storage._base)
-            continue
-        
-        if not abs_path_obj.is_file():
-            logger.error("Path não é arquivo após salvar: %s (rel: %s)", abs_path, rel_path)
-            continue
-        
-        file_size = abs_path_obj.stat().st_size
-        if file_size != len(content):
-            logger.error("Tamanho incorreto após salvar: %s (esperado: %d, obtido: %d)", abs_path, len(content), file_size)
-            continue
-        
-        abs_path_str = str(abs_path_obj.absolute())
-        logger.info("Arquivo salvo e verificado: %s (size: %d bytes, tipo: %s)", abs_path_str, file_size, atype.value)
-        saved.append((rel_path, abs_path_str, atype))
-        a = AttachmentModel(
-            id=att_id,
-            manifestation_id=m.id,
-            type=atype,
-            mime_type=mime,
-            size_bytes=len(content),
-            file_path=rel_path,
-        )
-        session.add(a)
+    new_text = await ingest_attachments(session, storage, m.id, validated)
 
-    await session.flush()
-
-    parts: list[str] = []
-    try:
-        from app.media.dispatcher import extract_from_file
-        from pathlib import Path
-
-        for rel_path, abs_path_str, atype in saved:
-            abs_path = Path(abs_path_str)
-            if not abs_path.exists():
-                logger.error("Arquivo não encontrado para extração: %s (rel: %s, abs_path_str: %s)", abs_path, rel_path, abs_path_str)
-                continue
-            
-            if not abs_path.is_file():
-                logger.error("Path não é arquivo para extração: %s (rel: %s)", abs_path, rel_path)
-                continue
-            
-            file_size = abs_path.stat().st_size
-            if file_size == 0:
-                logger.warning("Arquivo vazio para extração: %s (rel: %s)", abs_path, rel_path)
-                continue
-            
-            logger.info("Iniciando extração: %s (tipo: %s, size: %d bytes)", abs_path_str, atype.value, file_size)
-            res = await extract_from_file(atype, abs_path_str)
-            if res.get("raw_text", "").strip():
-                parts.append(res["raw_text"].strip())
-    except Exception as e:
-        logger.warning("Extração de mídia ignorada (create): %s", e, exc_info=True)
-
-    if parts:
-        m.extracted_text = "\n\n---\n\n".join(parts)
+    if new_text:
+        m.extracted_text = new_text
         await session.flush()
 
-    return CreateManifestationOutput(id=m.id, protocol=None, status=ManifestationStatus.DRAFT.value)
+    # O flush do extracted_text já avança a version (version_id_col): devolve a gravada.
+    return CreateManifestationOutput(
+        id=m.id, protocol=None, status=ManifestationStatus.DRAFT.value, version=m.version
+    )
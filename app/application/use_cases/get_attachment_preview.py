@@ -0,0 +1,99 @@
+"""
+Use case: pré-visualização de anexo (miniatura, pôster de vídeo, forma de onda).
+Gerada no primeiro pedido e guardada no cache de derivados em disco (LRU por bytes);
+pedidos concorrentes do mesmo (anexo, tamanho) geram uma única vez.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.domain.enums import AttachmentType
+from app.infrastructure.cache.derivative_cache import derivative_cache
+from app.infrastructure.db.models import AttachmentModel, ManifestationModel
+from app.infrastructure.storage.backend import StorageBackend, local_file
+
+
+class PreviewError(Exception):
+    """Pré-visualização indisponível para o anexo."""
+
+
+@dataclass(frozen=True)
+class PreviewSource:
+    """Dados do anexo necessários para gerar e identificar a pré-visualização."""
+
+    attachment_id: str
+    type: AttachmentType
+    file_path: str
+    size: int  # tamanho do derivado (lado maior, px)
+    etag: str
+
+
+def snap_preview_size(requested: int) -> int:
+    """Menor tamanho configurado >= requested (ou o maior): limita variantes em cache."""
+    sizes = sorted(get_settings().preview_sizes)
+    for s in sizes:
+        if s >= requested:
+            return s
+    return sizes[-1]
+
+
+async def find_preview_source(
+    session: AsyncSession,
+    protocol: str,
+    attachment_id: str,
+    size: int,
+) -> PreviewSource | None:
+    """Anexo do protocolo informado, ou None se não existir."""
+    q = (
+        select(
+            AttachmentModel.id,
+            AttachmentModel.type,
+            AttachmentModel.file_path,
+            AttachmentModel.size_bytes,
+            AttachmentModel.sha256,
+        )
+        .join(ManifestationModel, AttachmentModel.manifestation_id == ManifestationModel.id)
+        .where(
+            AttachmentModel.id == attachment_id,
+            ManifestationModel.protocol == protocol,
+        )
+    )
+    a = (await session.execute(q)).first()
+    if not a:
+        return None
+    size = snap_preview_size(size)
+    content_tag = a.sha256 or f"{a.id}-{a.size_bytes}"
+    return PreviewSource(
+        attachment_id=a.id,
+        type=a.type,
+        file_path=a.file_path,
+        size=size,
+        etag=f'"{content_tag}-p{size}"',
+    )
+
+
+async def render_attachment_preview(storage: StorageBackend, src: PreviewSource) -> tuple[bytes, str]:
+    """(bytes, media type) da pré-visualização, do cache ou gerada agora."""
+    from app.media.previews import PREVIEW_FORMATS, render_preview
+    from app.media.utils import run_sync
+
+    fmt = PREVIEW_FORMATS.get(src.type)
+    if fmt is None:
+        raise PreviewError("Tipo de anexo sem pré-visualização.")
+    ext, media_type = fmt
+
+    async def produce() -> bytes:
+        rel_path = await storage.resolve(src.file_path)
+        try:
+            async with local_file(storage, rel_path) as path:
+                return await run_sync(render_preview, src.type, path, src.size)
+        except FileNotFoundError as e:
+            raise PreviewError("Arquivo não encontrado no storage.") from e
+        except Exception as e:
+            raise PreviewError(f"Não foi possível gerar a pré-visualização: {e}") from e
+
+    data = await derivative_cache().get_or_create(src.attachment_id, str(src.size), ext, produce)
+    return data, media_type
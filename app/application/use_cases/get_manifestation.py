@@ -1,40 +1,68 @@
 """
 Use case: obter manifestação por protocolo.
 Retorna detalhes e quantidade de anexos (apenas manifestações finalizadas).
+Leitura via cache TTL por protocolo; a contagem de anexos é feita no banco (COUNT).
+O ETag é calculado na carga e fica em cache junto dos dados.
 """
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.cache.protocol_cache import manifestation_cache
+from app.infrastructure.db.models import AttachmentModel, ManifestationModel
+from app.utils.http_cache import CachedView, make_view
 
 
-async def get_manifestation_by_protocol(
-    session: AsyncSession,
-    protocol: str,
-) -> dict | None:
-    """
-    Busca manifestação por protocolo (apenas finalizadas).
-    Retorna dict com protocol, status, input_type, created_at, attachments_count,
-    subject_label, summary ou None se não encontrada.
-    """
-    q = (
-        select(ManifestationModel)
-        .where(ManifestationModel.protocol == protocol)
-        .options(selectinload(ManifestationModel.attachments))
+async def _load_manifestation(session: AsyncSession, protocol: str) -> CachedView | None:
+    attachments_count = (
+        select(func.count(AttachmentModel.id))
+        .where(AttachmentModel.manifestation_id == ManifestationModel.id)
+        .scalar_subquery()
     )
+    q = select(
+        ManifestationModel.protocol,
+        ManifestationModel.status,
+        ManifestationModel.input_type,
+        ManifestationModel.created_at,
+        ManifestationModel.subject_label,
+        ManifestationModel.summary,
+        ManifestationModel.extracted_text,
+        attachments_count.label("attachments_count"),
+    ).where(ManifestationModel.protocol == protocol)
     r = await session.execute(q)
-    m = r.scalar_one_or_none()
+    m = r.first()
     if not m:
         return None
-    return {
+    return make_view({
         "protocol": m.protocol,
         "status": m.status.value,
         "input_type": m.input_type.value,
         "created_at": m.created_at,
-        "attachments_count": len(m.attachments),
+        "attachments_count": m.attachments_count,
         "subject_label": m.subject_label,
         "summary": m.summary,
         "extracted_text": m.extracted_text,
-    }
+    })
+
+
+async def get_manifestation_view(
+    session: AsyncSession,
+    protocol: str,
+) -> CachedView | None:
+    """Dados públicos da manifestação + ETag, ou None se não encontrada."""
+    return await manifestation_cache().get_or_load(
+        protocol, lambda: _load_manifestation(session, protocol)
+    )
+
+
+async def get_manifestation_by_protocol(
+    session: AsyncSession,
+    protocol: str,
+) -> dict | None:
+    """
+    Busca manifestação por protocolo (apenas finalizadas).
+    Retorna dict com protocol, status, input_type, created_at, attachments_count,
+    subject_label, summary ou None se não encontrada.
+    """
+    view = await get_manifestation_view(session, protocol)
+    return view.data if view else None
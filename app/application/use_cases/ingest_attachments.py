@@ -0,0 +1,97 @@
+"""
+Ingestão de anexos já validados, comum a create_manifestation e add_attachments.
+Normaliza, grava no storage, calcula SHA-256, registra AttachmentModel e extrai texto
+(OCR, Whisper) publicando o progresso no broker de eventos.
+"""
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.enums import AttachmentType
+from app.infrastructure.db.models import AttachmentModel
+from app.infrastructure.events import get_broker
+from app.infrastructure.storage.backend import StorageBackend, local_file
+from app.infrastructure.storage.io_pool import run_io
+from app.utils.checksum import sha256_many
+from app.utils.file_validation import extension_from_mime
+from app.utils.uuid7 import uuid7_str
+
+logger = logging.getLogger(__name__)
+
+
+async def ingest_attachments(
+    session: AsyncSession,
+    storage: StorageBackend,
+    manifestation_id: str,
+    validated: list[tuple[bytes, str, AttachmentType]],
+) -> str | None:
+    """
+    Grava os anexos (content, mime, tipo) da manifestação e extrai texto.
+    Retorna o texto extraído dos novos anexos (partes separadas por ---) ou None.
+    """
+    # Normalização opcional (WebP/Opus/proxy de vídeo); desabilitada, devolve o próprio upload.
+    from app.media.normalization import normalize_upload
+
+    normalized = [await normalize_upload(content, mime, atype) for content, mime, atype in validated]
+
+    # Grava todos os arquivos (e originais retidos) de uma vez: no modo "group" há um único ciclo de fsync.
+    att_ids = [uuid7_str() for _ in normalized]
+    items = [(att_id, n.content, extension_from_mime(n.mime)) for att_id, n in zip(att_ids, normalized)]
+    originals = [
+        (i, (f"{att_id}.orig", n.original, extension_from_mime(n.original_mime)))
+        for i, (att_id, n) in enumerate(zip(att_ids, normalized))
+        if n.original is not None
+    ]
+    all_paths = await storage.save_many(manifestation_id, items + [item for _, item in originals])
+    rel_paths = all_paths[: len(items)]
+    original_paths = {i: path for (i, _), path in zip(originals, all_paths[len(items) :])}
+    digests = await run_io(sha256_many, [content for _, content, _ in items])
+
+    saved: list[tuple[str, bytes, AttachmentType]] = []  # (rel_path, content, atype)
+    for i, ((att_id, content, _), rel_path, digest, n, (_, _, atype)) in enumerate(
+        zip(items, rel_paths, digests, normalized, validated)
+    ):
+        logger.info("Arquivo salvo: %s (size: %d bytes, tipo: %s)", rel_path, len(content), atype.value)
+        saved.append((rel_path, content, atype))
+        session.add(
+            AttachmentModel(
+                id=att_id,
+                manifestation_id=manifestation_id,
+                type=atype,
+                mime_type=n.mime,
+                size_bytes=len(content),
+                file_path=rel_path,
+                sha256=digest,
+                original_file_path=original_paths.get(i),
+                original_mime_type=n.original_mime,
+            )
+        )
+
+    await session.flush()
+
+    parts: list[str] = []
+    try:
+        from app.media.dispatcher import extract_from_file
+
+        broker = get_broker()
+        for done, (rel_path, content, atype) in enumerate(saved):
+            broker.publish(
+                manifestation_id,
+                "extraction",
+                {"stage": "started", "done": done, "total": len(saved), "type": atype.value},
+            )
+            logger.info("Iniciando extração: %s (tipo: %s)", rel_path, atype.value)
+            async with local_file(storage, rel_path, content) as path:
+                res = await extract_from_file(atype, path)
+            if res.get("raw_text", "").strip():
+                parts.append(res["raw_text"].strip())
+            broker.publish(
+                manifestation_id,
+                "extraction",
+                {"stage": "finished", "done": done + 1, "total": len(saved), "type": atype.value},
+            )
+    except Exception as e:
+        logger.warning("Extração de mídia ignorada (%s): %s", manifestation_id, e, exc_info=True)
+
+    return "\n\n---\n\n".join(parts) if parts else None
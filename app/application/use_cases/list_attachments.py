@@ -0,0 +1,66 @@
+"""
+Use case: listar anexos por protocolo.
+Uma única consulta (LEFT JOIN, só colunas públicas), com cache TTL por protocolo.
+O ETag é calculado na carga e fica em cache junto dos dados.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.cache.protocol_cache import attachments_cache
+from app.infrastructure.db.models import AttachmentModel, ManifestationModel
+from app.utils.http_cache import CachedView, make_view
+
+
+async def _load_attachments(session: AsyncSession, protocol: str) -> CachedView | None:
+    q = (
+        select(
+            ManifestationModel.id.label("manifestation_id"),
+            AttachmentModel.id,
+            AttachmentModel.type,
+            AttachmentModel.mime_type,
+            AttachmentModel.size_bytes,
+            AttachmentModel.created_at,
+        )
+        .outerjoin(AttachmentModel, AttachmentModel.manifestation_id == ManifestationModel.id)
+        .where(ManifestationModel.protocol == protocol)
+        .order_by(AttachmentModel.created_at)
+    )
+    r = await session.execute(q)
+    rows = r.all()
+    if not rows:
+        return None
+    return make_view([
+        {
+            "id": a.id,
+            "type": a.type.value,
+            "mime_type": a.mime_type,
+            "size_bytes": a.size_bytes,
+            "created_at": a.created_at,
+        }
+        for a in rows
+        if a.id is not None
+    ])
+
+
+async def list_attachments_view(
+    session: AsyncSession,
+    protocol: str,
+) -> CachedView | None:
+    """Lista de anexos + ETag, ou None se a manifestação não existir."""
+    return await attachments_cache().get_or_load(
+        protocol, lambda: _load_attachments(session, protocol)
+    )
+
+
+async def list_attachments_by_protocol(
+    session: AsyncSession,
+    protocol: str,
+) -> list[dict] | None:
+    """
+    Lista anexos da manifestação com o protocolo informado.
+    Retorna lista de dicts (id, type, mime_type, size_bytes, created_at)
+    ou None se a manifestação não existir.
+    """
+    view = await list_attachments_view(session, protocol)
+    return view.data if view else None
@@ -1,52 +1,211 @@
 """
 Use case: listar manifestações (admin).
-Paginação simples. Inclui drafts (protocol null) e finalizadas.
+Inclui drafts (protocol null) e finalizadas, da mais recente para a mais antiga.
+
+Dois modos de paginação:
+- keyset (cursor): WHERE (created_at, id) < cursor ORDER BY created_at DESC, id DESC,
+  servido pelo índice ix_manifestations_created_at_id; custo constante em qualquer
+  profundidade. É o modo recomendado.
+- offset (page): mantido por compatibilidade; OFFSET cresce com a página.
+
+Filtros opcionais: status, input_type, administrative_region (via lookup), intervalo
+de created_at, anonymous e tag. Cada filtro de igualdade tem índice (filtro, created_at, id),
+que atende o WHERE e a ordenação por keyset sem sort. Com tag, a consulta parte de
+manifestation_tags (índice tag, created_at, manifestation_id) e ordena/pagina pela cópia
+de created_at dessa tabela.
+
+O total é opcional: "exact" (COUNT(*) com os mesmos filtros), "estimate"
+(estatísticas do banco, O(1); só sem filtros) ou "none".
+
+Só as colunas exibidas são lidas (nada de original_text/extracted_text/summary) e
+attachments_count vem de uma subconsulta correlacionada COUNT(*) por linha da
+página (índice ix_attachments_manifestation_id), sem carregar anexos nem
+instanciar objetos ORM. Os itens saem prontos para JSON.
 """
 
-from sqlalchemy import func, select
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Literal
+
+from sqlalchemy import func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.infrastructure.db.models import ManifestationModel
+from app.domain.enums import InputType, ManifestationStatus
+from app.infrastructure.db.models import AttachmentModel, ManifestationModel, ManifestationTagModel
+from app.infrastructure.db.regions import find_region_id
+from app.infrastructure.db.tags import tag_key
+from app.utils.cursor import decode_cursor, encode_cursor
+
+TotalMode = Literal["exact", "estimate", "none"]
+
+
+@dataclass
+class ManifestationFilters:
+    """Filtros da listagem admin. created_from inclusivo, created_to exclusivo."""
+
+    status: ManifestationStatus | None = None
+    input_type: InputType | None = None
+    administrative_region: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    anonymous: bool | None = None
+    tag: str | None = None
+
+
+@dataclass
+class ManifestationsPage:
+    """Página da listagem. total é None com total="none"."""
+
+    items: list[dict]
+    total: int | None
+    total_estimated: bool
+    next_cursor: str | None
+
+
+def naive_utc(dt: datetime) -> datetime:
+    """created_at é gravado em UTC sem fuso (datetime.utcnow)."""
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _sort_columns(f: ManifestationFilters) -> tuple:
+    """(created_at, id) da ordenação por keyset: de manifestation_tags quando filtra por tag."""
+    if f.tag:
+        return ManifestationTagModel.created_at, ManifestationTagModel.manifestation_id
+    return ManifestationModel.created_at, ManifestationModel.id
+
+
+async def _conditions(session: AsyncSession, f: ManifestationFilters) -> list | None:
+    """Cláusulas WHERE dos filtros. None quando nenhuma linha pode casar (região desconhecida)."""
+    conds: list = []
+    created_col, _ = _sort_columns(f)
+    if f.status is not None:
+        conds.append(ManifestationModel.status == f.status)
+    if f.input_type is not None:
+        conds.append(ManifestationModel.input_type == f.input_type)
+    if f.administrative_region:
+        region_id = await find_region_id(session, f.administrative_region)
+        if region_id is None:
+            return None
+        conds.append(ManifestationModel.administrative_region_id == region_id)
+    if f.tag:
+        conds.append(ManifestationTagModel.manifestation_id == ManifestationModel.id)
+        conds.append(ManifestationTagModel.tag == tag_key(f.tag))
+    if f.created_from is not None:
+        conds.append(created_col >= naive_utc(f.created_from))
+    if f.created_to is not None:
+        conds.append(created_col < naive_utc(f.created_to))
+    if f.anonymous is not None:
+        conds.append(ManifestationModel.anonymous == f.anonymous)
+    return conds
+
+
+async def count_manifestations(
+    session: AsyncSession,
+    mode: TotalMode,
+    conditions: list | None = None,
+) -> tuple[int | None, bool]:
+    """
+    (total, estimado?). "estimate" cai para exato quando há filtros ou o dialeto
+    não oferece estimativa.
+    """
+    if mode == "none":
+        return None, False
+    if mode == "estimate" and not conditions:
+        dialect = session.bind.dialect.name
+        if dialect == "mysql":
+            r = await session.execute(
+                text(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t"
+                ),
+                {"t": ManifestationModel.__tablename__},
+            )
+            est = r.scalar()
+            if est is not None:
+                return int(est), True
+        elif dialect == "sqlite":
+            # max(rowid) lê uma folha da B-tree; superestima após exclusões.
+            r = await session.execute(text(f"SELECT max(rowid) FROM {ManifestationModel.__tablename__}"))
+            return int(r.scalar() or 0), True
+    r = await session.execute(select(func.count()).select_from(ManifestationModel).where(*(conditions or ())))
+    return r.scalar() or 0, False
+
+
+_ATTACHMENTS_COUNT = (
+    select(func.count())
+    .where(AttachmentModel.manifestation_id == ManifestationModel.id)
+    .correlate(ManifestationModel)
+    .scalar_subquery()
+    .label("attachments_count")
+)
+
+_COLUMNS = (
+    ManifestationModel.id,
+    ManifestationModel.protocol,
+    ManifestationModel.input_type,
+    ManifestationModel.anonymous,
+    ManifestationModel.status,
+    ManifestationModel.created_at,
+    _ATTACHMENTS_COUNT,
+)
+
+
+def _item(row) -> dict:
+    """Linha projetada → dict serializável em JSON (mesmo formato de ManifestationListItem)."""
+    return {
+        "id": row.id,
+        "protocol": row.protocol,
+        "input_type": row.input_type.value,
+        "anonymous": row.anonymous,
+        "status": row.status.value,
+        "created_at": row.created_at.isoformat(),
+        "attachments_count": row.attachments_count,
+    }
 
 
 async def list_manifestations(
     session: AsyncSession,
     page: int = 1,
     per_page: int = 20,
-) -> tuple[list[dict], int]:
+    cursor: str | None = None,
+    total: TotalMode = "exact",
+    filters: ManifestationFilters | None = None,
+) -> ManifestationsPage:
     """
-    Lista manifestações com paginação.
-    Retorna (lista de itens, total).
-    Cada item: id, protocol, input_type, anonymous, status, created_at, attachments_count.
+    Lista manifestações. Com cursor usa keyset (page é ignorado); sem cursor, offset por page.
+    next_cursor aponta para a página seguinte em ambos os modos (None na última); o
+    cliente deve repetir os mesmos filtros ao seguir o cursor.
+    Levanta InvalidCursor (app.utils.cursor) para cursor malformado.
     """
-    count_q = select(func.count()).select_from(ManifestationModel)
-    total_r = await session.execute(count_q)
-    total = total_r.scalar() or 0
-
-    offset = max(0, (page - 1) * per_page)
     per_page = max(1, min(per_page, 100))
+    filters = filters or ManifestationFilters()
+    conds = await _conditions(session, filters)
+    if conds is None:
+        empty_total = None if total == "none" else 0
+        return ManifestationsPage(items=[], total=empty_total, total_estimated=False, next_cursor=None)
+    created_col, id_col = _sort_columns(filters)
+    q = select(*_COLUMNS).where(*conds).order_by(created_col.desc(), id_col.desc())
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        # O limite "created_at <= c" redundante torna o predicado sargável: o índice é
+        # percorrido a partir do cursor (só com o OR, SQLite/MySQL varrem do topo).
+        q = q.where(
+            created_col <= created_at,
+            or_(created_col < created_at, id_col < last_id),
+        )
+    else:
+        q = q.offset(max(0, (page - 1) * per_page))
+    # Uma linha a mais indica se existe próxima página sem outra consulta.
+    r = await session.execute(q.limit(per_page + 1))
+    rows = r.all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
 
-    q = (
-        select(ManifestationModel)
-        .options(selectinload(ManifestationModel.attachments))
-        .order_by(ManifestationModel.created_at.desc())
-        .offset(offset)
-        .limit(per_page)
+    count, estimated = await count_manifestations(session, total, conds)
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    return ManifestationsPage(
+        items=[_item(m) for m in rows],
+        total=count,
+        total_estimated=estimated,
+        next_cursor=next_cursor,
     )
-    r = await session.execute(q)
-    rows = r.scalars().all()
-
-    items = [
-        {
-            "id": m.id,
-            "protocol": m.protocol,
-            "input_type": m.input_type.value,
-            "anonymous": m.anonymous,
-            "status": m.status.value,
-            "created_at": m.created_at,
-            "attachments_count": len(m.attachments),
-        }
-        for m in rows
-    ]
-    return items, total
@@ -0,0 +1,72 @@
+"""
+Use case: estatísticas de manifestações para dashboards (admin).
+
+Lê apenas os rollups diários (manifestation_daily_stats, chave primária começando
+por day): o custo depende do intervalo pedido e da quantidade de combinações
+status x tipo x região, não do tamanho da tabela manifestations. Dias em UTC.
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models import AdministrativeRegionModel, ManifestationDailyStatModel
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 731
+
+
+class StatsQueryError(ValueError):
+    """Intervalo de datas inválido."""
+
+
+async def manifestation_stats(session: AsyncSession, date_from: date | None, date_to: date | None) -> dict:
+    """Totais por status, tipo, região e dia em [date_from, date_to] (inclusivo; padrão: últimos 30 dias)."""
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_DAYS - 1)
+    if date_from > date_to:
+        raise StatsQueryError("date_from deve ser anterior ou igual a date_to.")
+    if (date_to - date_from).days + 1 > MAX_DAYS:
+        raise StatsQueryError(f"Intervalo máximo: {MAX_DAYS} dias.")
+
+    t = ManifestationDailyStatModel
+    r = await session.execute(
+        select(t.day, t.status, t.input_type, t.administrative_region_id, t.count).where(
+            t.day >= date_from, t.day <= date_to, t.count != 0
+        )
+    )
+    by_status: Counter = Counter()
+    by_input_type: Counter = Counter()
+    by_region: Counter = Counter()
+    daily: dict[date, Counter] = {}
+    for day, status, input_type, region_id, n in r.all():
+        by_status[status] += n
+        by_input_type[input_type] += n
+        by_region[region_id] += n
+        daily.setdefault(day, Counter())[status] += n
+
+    names: dict[int, str] = {}
+    region_ids = [rid for rid in by_region if rid]
+    if region_ids:
+        r = await session.execute(
+            select(AdministrativeRegionModel.id, AdministrativeRegionModel.name).where(
+                AdministrativeRegionModel.id.in_(region_ids)
+            )
+        )
+        names = dict(r.all())
+
+    return {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "total": sum(by_status.values()),
+        "by_status": dict(by_status.most_common()),
+        "by_input_type": dict(by_input_type.most_common()),
+        "by_region": [
+            {"id": rid or None, "name": names.get(rid), "count": n} for rid, n in by_region.most_common()
+        ],
+        "daily": [
+            {"day": day.isoformat(), "count": sum(c.values()), "by_status": dict(c)} for day, c in sorted(daily.items())
+        ],
+    }
@@ -0,0 +1,156 @@
+"""
+Use case: clusters de manifestações para o mapa (contagem por célula de grade).
+
+A caixa pedida é alinhada a uma grade cujo tamanho de célula depende do zoom
+(CELLS_PER_TILE células por tile de 256 px) e engrossada até caber em
+MAP_MAX_CELLS: a resposta tem tamanho limitado em qualquer zoom. Os pontos são
+lidos pelo índice ix_manifestations_geohash (intervalos de prefixo cobrindo a
+caixa; lat/lng/status vêm do próprio índice) e agregados no banco: GROUP BY pelo
+índice da célula com contagem e somas para o centróide, então só trafegam no máximo
+MAP_MAX_CELLS linhas, não os pontos. Rascunhos não entram no mapa.
+
+Como a caixa é alinhada à grade, pedidos vizinhos no mesmo zoom repetem a chave
+e reaproveitam o cache em processo (TTL curto) e o ETag.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import Integer, and_, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.domain.enums import ManifestationStatus
+from app.infrastructure.cache.ttl_cache import AsyncTTLCache
+from app.infrastructure.db.models import ManifestationModel
+from app.utils.geohash import covering_prefixes, prefix_ranges
+from app.utils.http_cache import CachedView, make_view
+
+CELLS_PER_TILE = 4  # ~64 px por célula
+MAX_ZOOM = 20
+
+
+class MapQueryError(ValueError):
+    """bbox ou zoom inválidos."""
+
+
+@dataclass(frozen=True)
+class Grid:
+    """Grade alinhada: células de cell graus, índices [x0, x0+nx) x [y0, y0+ny)."""
+
+    cell: float
+    x0: int
+    y0: int
+    nx: int
+    ny: int
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """(west, south, east, north) alinhados à grade, limitados ao globo."""
+        return (
+            max(self.x0 * self.cell, -180.0),
+            max(self.y0 * self.cell, -90.0),
+            min((self.x0 + self.nx) * self.cell, 180.0),
+            min((self.y0 + self.ny) * self.cell, 90.0),
+        )
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """'west,south,east,north' em graus."""
+    try:
+        west, south, east, north = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise MapQueryError("bbox deve ser 'west,south,east,north'.")
+    if not (-180 <= west < east <= 180 and -90 <= south < north <= 90):
+        raise MapQueryError("bbox fora dos limites ou invertido (west < east, south < north).")
+    return west, south, east, north
+
+
+def make_grid(west: float, south: float, east: float, north: float, zoom: int, max_cells: int) -> Grid:
+    """Grade do zoom alinhada à caixa, engrossada (x2) até ter no máximo max_cells células."""
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise MapQueryError(f"zoom deve estar entre 0 e {MAX_ZOOM}.")
+    cell = 360.0 / (2**zoom * CELLS_PER_TILE)
+    while True:
+        x0, x1 = math.floor(west / cell), math.ceil(east / cell)
+        y0, y1 = math.floor(south / cell), math.ceil(north / cell)
+        nx, ny = max(x1 - x0, 1), max(y1 - y0, 1)
+        if nx * ny <= max_cells:
+            return Grid(cell, x0, y0, nx, ny)
+        cell *= 2
+
+
+@lru_cache
+def clusters_cache() -> AsyncTTLCache:
+    """Cache do GET /v1/map/clusters (chave: grade alinhada)."""
+    s = get_settings()
+    return AsyncTTLCache("map_clusters", s.map_cache_max_entries, s.map_cache_ttl_seconds)
+
+
+def _cell_index(col, origin: float, cell: float, dialect: str):
+    """Índice da célula (col >= origin): CAST trunca no SQLite; no MySQL CAST arredonda, usa FLOOR."""
+    offset = (col - origin) / cell
+    return func.floor(offset) if dialect == "mysql" else cast(offset, Integer)
+
+
+async def _aggregate(session: AsyncSession, grid: Grid, zoom: int) -> dict:
+    west, south, east, north = grid.bounds
+    m = ManifestationModel
+    dialect = session.bind.dialect.name
+    ix = _cell_index(m.location_lng, grid.x0 * grid.cell, grid.cell, dialect).label("ix")
+    iy = _cell_index(m.location_lat, grid.y0 * grid.cell, grid.cell, dialect).label("iy")
+    q = (
+        select(ix, iy, func.count(), func.sum(m.location_lat), func.sum(m.location_lng))
+        .where(
+            m.status != ManifestationStatus.DRAFT,
+            m.location_lat.between(south, north),
+            m.location_lng.between(west, east),
+        )
+        .group_by(ix, iy)
+    )
+    ranges = prefix_ranges(covering_prefixes(south, west, north, east))
+    if ranges:
+        q = q.where(or_(*(and_(m.geohash >= lo, m.geohash < hi) if hi else m.geohash >= lo for lo, hi in ranges)))
+    else:
+        q = q.where(m.geohash.is_not(None))
+
+    # Pontos na borda leste/norte caem no índice nx/ny: somados à última célula.
+    cells: dict[tuple[int, int], list] = {}
+    for cx, cy, n, sum_lat, sum_lng in (await session.execute(q)).all():
+        key = (min(int(cx), grid.nx - 1), min(int(cy), grid.ny - 1))
+        acc = cells.setdefault(key, [0, 0.0, 0.0])
+        acc[0] += n
+        acc[1] += sum_lat
+        acc[2] += sum_lng
+
+    clusters = []
+    for (cx, cy), (n, sum_lat, sum_lng) in sorted(cells.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        x, y = grid.x0 + cx, grid.y0 + cy
+        clusters.append(
+            {
+                "lat": round(sum_lat / n, 6),
+                "lng": round(sum_lng / n, 6),
+                "count": n,
+                "bounds": [x * grid.cell, y * grid.cell, (x + 1) * grid.cell, (y + 1) * grid.cell],
+            }
+        )
+    return {
+        "zoom": zoom,
+        "cell_size_deg": grid.cell,
+        "bbox": [west, south, east, north],
+        "total": sum(c["count"] for c in clusters),
+        "clusters": clusters,
+    }
+
+
+async def map_clusters_view(session: AsyncSession, bbox: str, zoom: int) -> CachedView:
+    """Clusters da caixa no zoom (com ETag). Levanta MapQueryError."""
+    west, south, east, north = parse_bbox(bbox)
+    grid = make_grid(west, south, east, north, zoom, get_settings().map_max_cells)
+    key = (zoom, grid)
+
+    async def load() -> CachedView:
+        return make_view(await _aggregate(session, grid, zoom))
+
+    return await clusters_cache().get_or_load(key, load)
@@ -0,0 +1,150 @@
+"""
+Use case: upload retomável (estilo tus) de anexos para manifestação em rascunho.
+create → PATCH (chunk no offset) … → finalização automática quando offset == length:
+o arquivo montado no staging é entregue a add_attachments (mesma validação,
+normalização, hash e extração do upload multipart).
+"""
+
+import logging
+from collections.abc import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.add_attachments import (
+    AddAttachmentsError,
+    AddAttachmentsInput,
+    AddAttachmentsOutput,
+    ValidationError,
+    add_attachments,
+)
+from app.domain.enums import ManifestationStatus
+from app.infrastructure.db.hooks import after_commit
+from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.storage.backend import StorageBackend
+from app.infrastructure.storage.io_pool import run_io
+from app.infrastructure.storage.staging import OffsetMismatch, StagedUpload, UploadStaging, UploadTooLarge
+from app.utils.file_validation import max_file_size_bytes, mime_to_attachment_type
+
+logger = logging.getLogger(__name__)
+
+WRITE_BUFFER_BYTES = 1024 * 1024  # agrupa chunks do corpo antes de gravar
+
+
+class UploadNotFound(Exception):
+    """Upload inexistente, expirado ou de outra manifestação."""
+
+
+class UploadLengthInvalid(ValidationError):
+    """Upload-Length zero ou negativo."""
+
+
+class UploadLengthTooLarge(ValidationError):
+    """Upload-Length acima do tamanho máximo de arquivo."""
+
+
+class UploadTypeNotAllowed(ValidationError):
+    """MIME type (filetype do Upload-Metadata) não aceito como anexo."""
+
+
+async def create_upload(
+    session: AsyncSession,
+    manifestation_id: str,
+    length: int,
+    mime_type: str,
+    filename: str,
+) -> StagedUpload:
+    """Valida manifestação (draft), tamanho e tipo antes de aceitar bytes."""
+    r = await session.execute(
+        select(ManifestationModel.status).where(ManifestationModel.id == manifestation_id)
+    )
+    status = r.scalar_one_or_none()
+    if status is None:
+        raise AddAttachmentsError("Manifestação não encontrada.")
+    if status != ManifestationStatus.DRAFT:
+        raise AddAttachmentsError("Apenas manifestações em rascunho podem receber novos anexos.")
+    max_size = max_file_size_bytes()
+    if length <= 0:
+        raise UploadLengthInvalid("Upload-Length deve ser maior que zero.")
+    if length > max_size:
+        raise UploadLengthTooLarge(f"Upload-Length excede o tamanho máximo de {max_size} bytes.")
+    if not mime_to_attachment_type(mime_type):
+        raise UploadTypeNotAllowed(f"MIME type não permitido: {mime_type}.")
+    return await run_io(UploadStaging().create, manifestation_id, length, mime_type, filename)
+
+
+async def get_upload(manifestation_id: str, upload_id: str) -> StagedUpload:
+    up = await run_io(UploadStaging().get, upload_id)
+    if up is None or up.manifestation_id != manifestation_id:
+        raise UploadNotFound()
+    return up
+
+
+async def write_chunk(
+    manifestation_id: str,
+    upload_id: str,
+    offset: int,
+    body: AsyncIterator[bytes],
+) -> StagedUpload:
+    """
+    Grava o corpo do PATCH a partir de offset. Levanta OffsetMismatch / UploadTooLarge
+    (staging) na primeira escrita inválida; bytes já gravados continuam valendo.
+    Upload já completo (finalizado ou em finalização): só aceita offset == length sem corpo.
+    """
+    up = await get_upload(manifestation_id, upload_id)
+    if up.complete:
+        if offset != up.length:
+            raise OffsetMismatch(up.length)
+        async for chunk in body:
+            if chunk:
+                raise UploadTooLarge()
+        return up
+    staging = UploadStaging()
+    buf = bytearray()
+    pos = offset
+    async for chunk in body:
+        buf += chunk
+        if len(buf) >= WRITE_BUFFER_BYTES:
+            pos = await run_io(staging.append, upload_id, pos, bytes(buf))
+            buf.clear()
+    if buf:
+        pos = await run_io(staging.append, upload_id, pos, bytes(buf))
+    return await get_upload(manifestation_id, upload_id)
+
+
+async def finalize_upload(
+    session: AsyncSession,
+    storage: StorageBackend,
+    up: StagedUpload,
+) -> AddAttachmentsOutput | None:
+    """
+    Entrega o arquivo completo a add_attachments; o staging é limpo após o commit.
+    None se outro pedido já está finalizando o mesmo upload.
+    """
+    staging = UploadStaging()
+    content = await run_io(staging.claim, up.id)
+    if content is None:
+        return None
+    try:
+        out = await add_attachments(
+            session,
+            storage,
+            up.manifestation_id,
+            AddAttachmentsInput(files=[(content, up.mime_type, up.filename)]),
+        )
+        await session.flush()
+    except (AddAttachmentsError, ValidationError):
+        await run_io(staging.delete, up.id)  # definitivo: não adianta tentar de novo
+        raise
+    except BaseException:
+        await run_io(staging.release, up.id)
+        raise
+    after_commit(session, lambda: staging.finish(up.id))
+    logger.info("Upload retomável %s finalizado (%d bytes)", up.id, len(content))
+    return out
+
+
+async def terminate_upload(manifestation_id: str, upload_id: str) -> None:
+    """Cancela o upload e remove os bytes recebidos."""
+    await get_upload(manifestation_id, upload_id)
+    await run_io(UploadStaging().delete, upload_id)
@@ -0,0 +1,134 @@
+"""
+Use case: busca textual de manifestações (admin) em original_text, extracted_text,
+summary e subject_label. Insensível a acento e caixa, ordenada por relevância.
+
+- MySQL: MATCH ... AGAINST (NATURAL LANGUAGE MODE) sobre o índice FULLTEXT
+  ft_manifestations_text (migração 007); a insensibilidade a acento vem da collation
+  utf8mb4_*_ci. Palavras menores que innodb_ft_min_token_size (padrão 3) e stopwords
+  do InnoDB são ignoradas pelo banco.
+- Demais bancos (SQLite em dev/testes) ou SEARCH_BACKEND=memory: índice invertido em
+  processo (BM25), mantido após cada commit.
+"""
+
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.search import load_search_index, search_index, tokenize, uses_memory_index
+from app.utils.text import fold_text
+
+SNIPPET_CHARS = 160
+
+_TEXT_FIELDS = ("subject_label", "summary", "original_text", "extracted_text")
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class SearchPage:
+    """Resultado da busca. backend: "fulltext" ou "memory"."""
+
+    items: list[dict]
+    total: int
+    backend: str
+
+
+def _snippet(row, terms: set[str]) -> str | None:
+    """Trecho em torno da primeira ocorrência de um termo (ou início do primeiro campo com texto)."""
+    fallback = None
+    for field in _TEXT_FIELDS:
+        text = getattr(row, field)
+        if not text:
+            continue
+        fallback = fallback or text
+        for m in _WORD.finditer(text):
+            if fold_text(m.group()) in terms:
+                start = max(0, m.start() - SNIPPET_CHARS // 3)
+                piece = text[start : start + SNIPPET_CHARS].strip()
+                return ("…" if start else "") + " ".join(piece.split())
+    return " ".join(fallback[:SNIPPET_CHARS].split()) if fallback else None
+
+
+def _item(row, score: float, terms: set[str]) -> dict:
+    return {
+        "id": row.id,
+        "protocol": row.protocol,
+        "status": row.status.value,
+        "input_type": row.input_type.value,
+        "created_at": row.created_at.isoformat(),
+        "subject_label": row.subject_label,
+        "score": round(float(score), 4),
+        "snippet": _snippet(row, terms),
+    }
+
+
+_COLUMNS = (
+    ManifestationModel.id,
+    ManifestationModel.protocol,
+    ManifestationModel.status,
+    ManifestationModel.input_type,
+    ManifestationModel.created_at,
+    *(getattr(ManifestationModel, f) for f in _TEXT_FIELDS),
+)
+
+
+async def _search_fulltext(session: AsyncSession, q: str, limit: int, offset: int) -> SearchPage:
+    against = match(
+        ManifestationModel.original_text,
+        ManifestationModel.extracted_text,
+        ManifestationModel.summary,
+        ManifestationModel.subject_label,
+        against=q,
+    ).in_natural_language_mode()
+    score = against.label("score")
+    r = await session.execute(
+        select(*_COLUMNS, score)
+        .where(against)
+        .order_by(score.desc(), ManifestationModel.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    rows = r.all()
+    total = (await session.execute(select(func.count()).select_from(ManifestationModel).where(against))).scalar()
+    terms = set(tokenize(q))
+    return SearchPage(items=[_item(row, row.score, terms) for row in rows], total=total or 0, backend="fulltext")
+
+
+async def _search_memory(session: AsyncSession, q: str, limit: int, offset: int) -> SearchPage:
+    await load_search_index()
+    index = search_index()
+    while True:
+        total, hits = index.search(q, limit, offset)
+        if not hits:
+            return SearchPage(items=[], total=total, backend="memory")
+        ids = [doc_id for doc_id, _ in hits]
+        r = await session.execute(select(*_COLUMNS).where(ManifestationModel.id.in_(ids)))
+        rows = {row.id: row for row in r.all()}
+        missing = [doc_id for doc_id in ids if doc_id not in rows]
+        if not missing:
+            break
+        # Apagados fora deste processo (ex.: GC pela CLI): saem do índice e a página é refeita.
+        for doc_id in missing:
+            index.remove(doc_id)
+    terms = set(tokenize(q))
+    items = [_item(rows[doc_id], score, terms) for doc_id, score in hits]
+    return SearchPage(items=items, total=total, backend="memory")
+
+
+async def search_manifestations(
+    session: AsyncSession,
+    q: str,
+    page: int = 1,
+    per_page: int = 20,
+) -> SearchPage:
+    """Página de resultados, do mais relevante ao menos relevante."""
+    per_page = max(1, min(per_page, 100))
+    offset = max(0, (page - 1) * per_page)
+    if not tokenize(q):
+        return SearchPage(items=[], total=0, backend="memory" if uses_memory_index() else "fulltext")
+    if uses_memory_index():
+        return await _search_memory(session, q, per_page, offset)
+    return await _search_fulltext(session, q, per_page, offset)
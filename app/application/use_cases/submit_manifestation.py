@@ -1,16 +1,24 @@
 """
 Use case: finalizar manifestação (submit).
 Gera protocolo definitivo e altera status para received.
+
+Um único UPDATE ... WHERE id = ? AND status = 'draft' [AND version = ?]: dois submits
+concorrentes não geram dois protocolos para a mesma manifestação; rowcount 0 →
+consulta o motivo (inexistente, já finalizada ou versão desatualizada).
 """
 
 from dataclasses import dataclass
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.domain.enums import ManifestationStatus
+from app.infrastructure.cache.protocol_cache import invalidate_protocol_after_commit
+from app.infrastructure.db.autosave import flush_draft
 from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.db.stats import record_status_change
+from app.infrastructure.events import publish_after_commit
 
 
 @dataclass
@@ -19,6 +27,7 @@ class SubmitManifestationOutput:
 
     protocol: str
     status: str
+    version: int
 
 
 class SubmitError(Exception):
@@ -27,6 +36,10 @@ class SubmitError(Exception):
     pass
 
 
+class SubmitConflictError(SubmitError):
+    """A manifestação foi alterada por outra requisição (version desatualizada)."""
+
+
 async def _next_protocol(session: AsyncSession) -> str:
     """Gera próximo protocolo único no formato DF-2026-000001.
     Considera apenas manifestações já finalizadas (protocol IS NOT NULL).
@@ -54,26 +67,60 @@ async def _next_protocol(session: AsyncSession) -> str:
     return f"{prefix}{n:06d}"
 
 
+async def _failure(session: AsyncSession, manifestation_id: str) -> SubmitError:
+    """Motivo de um UPDATE condicional que não afetou linhas."""
+    r = await session.execute(
+        select(ManifestationModel.status, ManifestationModel.version).where(ManifestationModel.id == manifestation_id)
+    )
+    row = r.one_or_none()
+    if row is None:
+        return SubmitError("Manifestação não encontrada.")
+    if row.status != ManifestationStatus.DRAFT:
+        return SubmitError("Apenas manifestações em rascunho podem ser finalizadas.")
+    return SubmitConflictError(
+        f"Manifestação alterada por outra requisição (versão atual: {row.version}). Recarregue e tente novamente."
+    )
+
+
 async def submit_manifestation(
     session: AsyncSession,
     manifestation_id: str,
+    version: int | None = None,
 ) -> SubmitManifestationOutput:
     """
     Finaliza manifestação draft.
     Gera protocolo definitivo, define status=received.
     Acompanhamento será apenas por protocolo.
+    Com version, levanta SubmitConflictError se a manifestação mudou desde a leitura.
     """
-    q = select(ManifestationModel).where(ManifestationModel.id == manifestation_id)
-    r = await session.execute(q)
-    m = r.scalar_one_or_none()
-    if not m:
-        raise SubmitError("Manifestação não encontrada.")
-    if m.status != ManifestationStatus.DRAFT:
-        raise SubmitError("Apenas manifestações em rascunho podem ser finalizadas.")
-
+    await flush_draft(session, manifestation_id)  # edições do autosave ainda em memória
+    m = ManifestationModel
     protocol = await _next_protocol(session)
-    m.protocol = protocol
-    m.status = ManifestationStatus.RECEIVED
-    await session.flush()
+    conditions = [m.id == manifestation_id, m.status == ManifestationStatus.DRAFT]
+    if version is not None:
+        conditions.append(m.version == version)
+    r = await session.execute(
+        update(m)
+        .where(*conditions)
+        .values(protocol=protocol, status=ManifestationStatus.RECEIVED, version=m.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if r.rowcount != 1:
+        raise await _failure(session, manifestation_id)
+    if version is not None:
+        version += 1
+    else:
+        # Sem RETURNING portável (MySQL): relê a version gravada.
+        r = await session.execute(select(m.version).where(m.id == manifestation_id))
+        version = r.scalar_one()
+
+    await record_status_change(session, manifestation_id, ManifestationStatus.DRAFT, ManifestationStatus.RECEIVED)
+    invalidate_protocol_after_commit(session, protocol)
+    publish_after_commit(
+        session,
+        manifestation_id,
+        "status",
+        {"protocol": protocol, "status": ManifestationStatus.RECEIVED.value},
+    )
 
-    return SubmitManifestationOutput(protocol=protocol, status=ManifestationStatus.RECEIVED.value)
+    return SubmitManifestationOutput(protocol=protocol, status=ManifestationStatus.RECEIVED.value, version=version)
@@ -0,0 +1,33 @@
+"""
+Use case: tags complementares mais frequentes (facetas) em um intervalo de criação (admin).
+
+GROUP BY sobre manifestation_tags: lê só o índice (created_at, tag) no intervalo, ou
+(tag, created_at, ...) sem intervalo; nada do JSON de complementary_tags nem das
+linhas de manifestations. Tags vêm normalizadas (sem acento/caixa).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.use_cases.list_manifestations import naive_utc
+from app.infrastructure.db.models import ManifestationTagModel
+
+
+async def tag_facets(
+    session: AsyncSession,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    limit: int = 20,
+) -> list[dict]:
+    """[{"tag", "count"}] das limit tags mais usadas em [created_from, created_to), da mais frequente."""
+    t = ManifestationTagModel
+    n = func.count().label("count")
+    q = select(t.tag, n).group_by(t.tag).order_by(n.desc(), t.tag).limit(max(1, min(limit, 100)))
+    if created_from is not None:
+        q = q.where(t.created_at >= naive_utc(created_from))
+    if created_to is not None:
+        q = q.where(t.created_at < naive_utc(created_to))
+    r = await session.execute(q)
+    return [{"tag": row.tag, "count": row.count} for row in r.all()]
@@ -1,21 +1,42 @@
 """
 Use case: atualizar manifestação (PATCH).
 Atualiza qualquer etapa do fluxo. Apenas draft pode ser alterado.
+
+Concorrência otimista pela coluna version:
+- Com version informada e só campos simples: um único
+  UPDATE ... WHERE id = ? AND status = 'draft' AND version = ?, SET version = version + 1.
+  rowcount 0 → consulta o motivo (inexistente, não é rascunho ou versão desatualizada).
+- Tags, localização ou região (derivam manifestation_tags, geohash, lookup e rollup)
+  ou sem version: lê a linha e grava pelo ORM; o flush também confere version
+  (version_id_col), então PATCHes concorrentes não se sobrescrevem em silêncio.
+- Com autosave write-behind ligado, PATCHes só com campos simples vão para o buffer
+  (app.infrastructure.db.autosave); os demais gravam antes o que estiver pendente.
 """
 
 from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.domain.enums import ManifestationStatus
+from app.infrastructure.cache.protocol_cache import invalidate_protocol_after_commit
+from app.infrastructure.db.autosave import AutosaveBuffer, autosave_buffer, flush_draft
 from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.db.regions import resolve_region_id
+from app.infrastructure.db.tags import sync_manifestation_tags
+from app.infrastructure.search import reindex_after_commit
+from app.infrastructure.search.inverted_index import FIELD_WEIGHTS
+from app.utils.geohash import encode_point
+
+# Campos que exigem o caminho com leitura (atualizam outras tabelas/colunas derivadas).
+_DERIVED_FIELDS = ("complementary_tags", "location_lat", "location_lng", "administrative_region")
 
 
 @dataclass
 class UpdateManifestationInput:
-    """Entrada do use case. Apenas campos enviados."""
+    """Entrada do use case. Apenas campos enviados. version: versão esperada (opcional)."""
 
     original_text: str | None = None
     subject_id: str | None = None
@@ -30,6 +51,7 @@ class UpdateManifestationInput:
     contact_name: str | None = None
     contact_email: str | None = None
     contact_phone: str | None = None
+    version: int | None = None
 
 
 @dataclass
@@ -39,6 +61,7 @@ class UpdateManifestationOutput:
     id: str
     protocol: str | None
     status: str
+    version: int
 
 
 class UpdateError(Exception):
@@ -47,6 +70,97 @@ class UpdateError(Exception):
     pass
 
 
+class UpdateConflictError(UpdateError):
+    """A manifestação foi alterada por outra requisição (version desatualizada)."""
+
+
+def _simple_updates(inp: UpdateManifestationInput) -> dict[str, Any]:
+    """Colunas gravadas diretamente (sem derivados)."""
+    updates: dict[str, Any] = {}
+    if inp.original_text is not None:
+        updates["original_text"] = inp.original_text.strip() or None
+    if inp.subject_id is not None:
+        updates["subject_id"] = inp.subject_id or None
+    if inp.subject_label is not None:
+        updates["subject_label"] = inp.subject_label or None
+    if inp.summary is not None:
+        updates["summary"] = inp.summary.strip() or None
+    if inp.location_description is not None:
+        updates["location_description"] = inp.location_description.strip() or None
+    if inp.anonymous is not None:
+        updates["anonymous"] = inp.anonymous
+    if inp.contact_name is not None:
+        updates["contact_name"] = inp.contact_name.strip() or None
+    if inp.contact_email is not None:
+        updates["contact_email"] = inp.contact_email.strip() or None
+    if inp.contact_phone is not None:
+        updates["contact_phone"] = inp.contact_phone.strip() or None
+    return updates
+
+
+def _conflict(current: int | None = None) -> UpdateConflictError:
+    suffix = f" (versão atual: {current})" if current is not None else ""
+    return UpdateConflictError(f"Manifestação alterada por outra requisição{suffix}. Recarregue e tente novamente.")
+
+
+async def _failure(session: AsyncSession, manifestation_id: str) -> UpdateError:
+    """Motivo de um UPDATE condicional que não afetou linhas."""
+    r = await session.execute(
+        select(ManifestationModel.status, ManifestationModel.version).where(ManifestationModel.id == manifestation_id)
+    )
+    row = r.one_or_none()
+    if row is None:
+        return UpdateError("Manifestação não encontrada.")
+    if row.status != ManifestationStatus.DRAFT:
+        return UpdateError("Apenas manifestações em rascunho podem ser alteradas.")
+    return _conflict(row.version)
+
+
+async def _buffered_update(
+    session: AsyncSession,
+    buf: AutosaveBuffer,
+    manifestation_id: str,
+    inp: UpdateManifestationInput,
+    updates: dict[str, Any],
+) -> UpdateManifestationOutput | None:
+    """Mescla no buffer do autosave; None se o buffer está cheio (grava direto)."""
+    while True:
+        await buf.wait_writable(manifestation_id)
+        p = buf.get(manifestation_id)
+        if p is not None:
+            db_version = p.base_version
+            break
+        if buf.full():
+            return None
+        generation = buf.generation
+        r = await session.execute(
+            select(ManifestationModel.status, ManifestationModel.version).where(
+                ManifestationModel.id == manifestation_id
+            )
+        )
+        row = r.one_or_none()
+        if row is None:
+            raise UpdateError("Manifestação não encontrada.")
+        if row.status != ManifestationStatus.DRAFT:
+            raise UpdateError("Apenas manifestações em rascunho podem ser alteradas.")
+        await buf.wait_writable(manifestation_id)
+        p = buf.get(manifestation_id)
+        if p is not None or buf.generation == generation:
+            db_version = row.version
+            break
+        # Um flush ou retenção terminou durante a leitura: a version lida pode estar velha.
+    current = p.version if p is not None else db_version
+    if inp.version is not None and inp.version != current:
+        raise _conflict(current)
+    p = buf.merge(manifestation_id, db_version, updates)
+    return UpdateManifestationOutput(
+        id=manifestation_id,
+        protocol=None,
+        status=ManifestationStatus.DRAFT.value,
+        version=p.version,
+    )
+
+
 async def update_manifestation(
     session: AsyncSession,
     manifestation_id: str,
@@ -54,8 +168,42 @@ async def update_manifestation(
 ) -> UpdateManifestationOutput:
     """
     Atualiza manifestação por id.
-    Apenas draft pode ser alterado. Retorna id, protocol, status.
+    Apenas draft pode ser alterado. Retorna id, protocol, status e a nova version.
+    Levanta UpdateConflictError quando inp.version não é a atual ou outra escrita venceu.
     """
+    updates = _simple_updates(inp)
+    simple = all(getattr(inp, f) is None for f in _DERIVED_FIELDS)
+    buf = autosave_buffer()
+    if buf is not None:
+        if simple:
+            out = await _buffered_update(session, buf, manifestation_id, inp, updates)
+            if out is not None:
+                return out
+        await flush_draft(session, manifestation_id)
+
+    if inp.version is not None and simple:
+        r = await session.execute(
+            update(ManifestationModel)
+            .where(
+                ManifestationModel.id == manifestation_id,
+                ManifestationModel.status == ManifestationStatus.DRAFT,
+                ManifestationModel.version == inp.version,
+            )
+            .values(**updates, version=ManifestationModel.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        # version sempre muda: rowcount é 1 mesmo no MySQL (que conta linhas alteradas).
+        if r.rowcount != 1:
+            raise await _failure(session, manifestation_id)
+        if updates.keys() & FIELD_WEIGHTS.keys():
+            reindex_after_commit(session, manifestation_id)
+        return UpdateManifestationOutput(
+            id=manifestation_id,
+            protocol=None,
+            status=ManifestationStatus.DRAFT.value,
+            version=inp.version + 1,
+        )
+
     q = select(ManifestationModel).where(ManifestationModel.id == manifestation_id)
     r = await session.execute(q)
     m = r.scalar_one_or_none()
@@ -63,41 +211,33 @@ async def update_manifestation(
         raise UpdateError("Manifestação não encontrada.")
     if m.status != ManifestationStatus.DRAFT:
         raise UpdateError("Apenas manifestações em rascunho podem ser alteradas.")
+    if inp.version is not None and m.version != inp.version:
+        raise _conflict(m.version)
 
-    updates: dict[str, Any] = {}
-    if inp.original_text is not None:
-        updates["original_text"] = inp.original_text.strip() or None
-    if inp.subject_id is not None:
-        updates["subject_id"] = inp.subject_id or None
-    if inp.subject_label is not None:
-        updates["subject_label"] = inp.subject_label or None
     if inp.complementary_tags is not None:
         updates["complementary_tags"] = inp.complementary_tags
-    if inp.summary is not None:
-        updates["summary"] = inp.summary.strip() or None
     if inp.location_lat is not None:
         updates["location_lat"] = inp.location_lat
     if inp.location_lng is not None:
         updates["location_lng"] = inp.location_lng
-    if inp.location_description is not None:
-        updates["location_description"] = inp.location_description.strip() or None
     if inp.administrative_region is not None:
-        updates["administrative_region"] = inp.administrative_region.strip() or None
-    if inp.anonymous is not None:
-        updates["anonymous"] = inp.anonymous
-    if inp.contact_name is not None:
-        updates["contact_name"] = inp.contact_name.strip() or None
-    if inp.contact_email is not None:
-        updates["contact_email"] = inp.contact_email.strip() or None
-    if inp.contact_phone is not None:
-        updates["contact_phone"] = inp.contact_phone.strip() or None
+        updates["administrative_region_id"] = await resolve_region_id(session, inp.administrative_region)
 
     for k, v in updates.items():
         setattr(m, k, v)
-
-    await session.flush()
+    if "location_lat" in updates or "location_lng" in updates:
+        m.geohash = encode_point(m.location_lat, m.location_lng)
+
+    try:
+        await session.flush()
+    except StaleDataError:
+        raise _conflict()
+    if "complementary_tags" in updates:
+        await sync_manifestation_tags(session, m)
+    invalidate_protocol_after_commit(session, m.protocol)
     return UpdateManifestationOutput(
         id=m.id,
         protocol=m.protocol,
         status=m.status.value,
+        version=m.version,
     )
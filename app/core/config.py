@@ -6,7 +6,7 @@ Carrega variáveis de ambiente e define constantes para a API Ouvidoria Particip
 from functools import lru_cache
 from pathlib import Path
 import os
-from typing import List
+from typing import List, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -39,10 +39,44 @@ class Settings(BaseSettings):
     # Database (MySQL)
     database_url: str = "mysql+aiomysql://root:""@localhost:3306/participa_df?charset=utf8mb4"
     database_url_sync: str = "mysql+pymysql://root:""@localhost:3306/participa_df?charset=utf8mb4"
+    # Ids (UUIDv7) no banco: char36 (CHAR(36), padrão) ou binary16 (BINARY(16); migração 011
+    # converte as colunas existentes quando ID_STORAGE=binary16 no momento do upgrade)
+    id_storage: Literal["char36", "binary16"] = "char36"
+
+    # Storage: local (disco, padrão) | s3 (serviço compatível com S3; requer boto3)
+    storage_backend: Literal["local", "s3"] = "local"
+    s3_bucket: str = ""
+    s3_prefix: str = ""  # prefixo das chaves (ex.: "uploads/")
+    s3_endpoint_url: str | None = None  # MinIO, moto server etc.; None = AWS
+    s3_region: str | None = None
+    s3_access_key_id: str | None = None  # None = cadeia padrão de credenciais do boto3
+    s3_secret_access_key: str | None = None
+    s3_max_pool_connections: int = 32
+    s3_multipart_threshold_bytes: int = 8 * 1024 * 1024
+    s3_multipart_part_bytes: int = 8 * 1024 * 1024
 
     # Storage local
     uploads_dir: Path = Path("uploads")
     max_file_size_bytes: int = 50 * 1024 * 1024  # 50 MB por arquivo
+    storage_io_workers: int = 8  # pool de I/O do storage (separado do pool de mídia)
+    # Durabilidade dos uploads: none | file (fsync por arquivo) | group (fsync em lote por upload)
+    storage_durability: Literal["none", "file", "group"] = "file"
+    # Layout do diretório de uploads: flat ({id}/) | sharded ({ab}/{cd}/{id}/)
+    storage_layout: Literal["flat", "sharded"] = "flat"
+    # Segmentos para anexos frios (app.jobs.compact_segments)
+    segment_max_bytes: int = 1024 * 1024 * 1024
+    segment_pack_max_file_bytes: int = 1024 * 1024
+    segment_pack_after_days: int = 30
+    # Normalização na ingestão (app.media.normalization)
+    normalize_images: bool = False  # WebP, EXIF aplicado e removido, lado maior limitado
+    normalize_image_max_px: int = 2048
+    normalize_image_quality: int = 80
+    normalize_audio: bool = False  # mono Opus
+    normalize_audio_bitrate: str = "32k"
+    normalize_video: bool = False  # proxy H.264/AAC
+    normalize_video_max_height: int = 720
+    normalize_video_maxrate: str = "1M"
+    keep_original_uploads: bool = False  # guarda também o arquivo enviado (original_file_path)
     allowed_audio_mimes: List[str] = [
         "audio/mpeg",
         "audio/mp3",
@@ -64,10 +98,68 @@ class Settings(BaseSettings):
         "video/ogg",
     ]
 
+    # GC de rascunhos e órfãos (app.jobs.gc_storage); intervalo 0 = só via CLI
+    gc_interval_seconds: float = 0.0
+    draft_ttl_hours: float = 72.0
+    orphan_grace_seconds: float = 3600.0
+    gc_batch_size: int = 200
+    gc_max_deletes_per_second: float = 50.0
+    # Uploads retomáveis (PATCH /uploads) sem atividade expiram após este tempo (GC)
+    resumable_upload_ttl_seconds: float = 86400.0
+
+    # Scrubber de integridade (app.jobs.scrub_storage); intervalo 0 = só via CLI
+    scrub_interval_seconds: float = 0.0
+    scrub_mb_per_second: float = 20.0
+    scrub_batch_size: int = 100
+
+    # Autosave write-behind: PATCH de rascunho mesclado em memória e gravado quando o
+    # rascunho fica parado um intervalo (ou após max_delay); 0 = cada PATCH grava na hora.
+    # Buffer por processo: ver README.
+    autosave_flush_interval_seconds: float = 0.0
+    autosave_max_delay_seconds: float = 30.0
+    autosave_max_drafts: int = 10_000
+
     # Protocolo
     protocol_prefix: str = "DF"
     protocol_year: int = 2026
 
+    # Cache de leitura por protocolo (em processo)
+    protocol_cache_ttl_seconds: float = 30.0
+    protocol_cache_max_entries: int = 10_000
+
+    # Pré-visualizações (GET .../attachments/{id}/preview); cache em disco com LRU
+    preview_sizes: List[int] = [128, 256, 512]
+    preview_cache_dir: Path | None = None  # padrão: {UPLOADS_DIR}/_derivatives
+    preview_cache_max_bytes: int = 512 * 1024 * 1024
+
+    # Busca textual (GET /v1/admin/manifestations/search): "fulltext" usa o índice
+    # FULLTEXT do MySQL; "memory" um índice invertido em processo (carregado na subida);
+    # "auto" escolhe pelo banco.
+    search_backend: Literal["auto", "fulltext", "memory"] = "auto"
+
+    # Download de anexos: "stream" serve pelo worker; "x-accel" (nginx) e
+    # "x-sendfile" (Apache/lighttpd) só autorizam e delegam os bytes ao proxy.
+    download_mode: Literal["stream", "x-accel", "x-sendfile"] = "stream"
+    download_accel_prefix: str = "/_protected_uploads/"
+
+    # Cache HTTP (Cache-Control por rota; vazio = não envia)
+    cache_control_manifestation: str = "public, max-age=15, s-maxage=30"
+    cache_control_attachments: str = "public, max-age=15, s-maxage=30"
+    cache_control_download: str = "public, max-age=86400, immutable"
+    cache_control_map: str = "public, max-age=60"
+
+    # Mapa de clusters (GET /v1/map/clusters): limite de células por resposta e cache em processo
+    map_max_cells: int = 2000
+    map_cache_ttl_seconds: float = 60.0
+    map_cache_max_entries: int = 512
+
+    # Eventos (SSE)
+    sse_max_connections: int = 1000
+    sse_max_connections_per_topic: int = 100
+    sse_queue_size: int = 16
+    sse_heartbeat_seconds: float = 15.0
+    sse_max_stream_seconds: float = 900.0
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,6 @@
+"""Cache em processo: TTL + LRU com coalescência de cargas concorrentes."""
+
+from app.infrastructure.cache.single_flight import SingleFlight
+from app.infrastructure.cache.ttl_cache import AsyncTTLCache, LatencyHistogram
+
+__all__ = ["AsyncTTLCache", "LatencyHistogram", "SingleFlight"]
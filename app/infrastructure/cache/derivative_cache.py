@@ -0,0 +1,171 @@
+"""
+Cache em disco de derivados (miniaturas, pôsteres de vídeo, formas de onda).
+Um arquivo por (anexo, tamanho) em PREVIEW_CACHE_DIR (padrão uploads/_derivatives),
+com limite total em bytes e remoção LRU. Gerações concorrentes da mesma chave são
+coalescidas (SingleFlight): o derivado é produzido uma única vez.
+
+O índice LRU fica em memória e é reconstruído no primeiro uso a partir do mtime dos
+arquivos (acessos atualizam o mtime, então a ordem sobrevive a reinícios). Com vários
+processos cada um mantém seu índice; um arquivo removido por outro processo é
+simplesmente gerado de novo.
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.infrastructure.cache.single_flight import SingleFlight
+from app.infrastructure.storage.io_pool import run_io
+from app.infrastructure.storage.local_storage import shard_prefix
+
+DERIVATIVES_DIR = "_derivatives"
+
+
+class DerivativeCache:
+    """Derivados em disco com limite de bytes e LRU."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self._index: OrderedDict[str, int] | None = None  # nome relativo -> bytes
+        self._lock = threading.Lock()  # índice acessado pelas threads do pool de I/O
+        self._total = 0
+        self._flight: SingleFlight[bytes] = SingleFlight()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _name(attachment_id: str, variant: str, ext: str) -> str:
+        # Shard por hash: o prefixo de um UUIDv7 é o timestamp (igual por anos).
+        return f"{shard_prefix(attachment_id)}/{attachment_id}-{variant}.{ext}"
+
+    def _ensure_index(self) -> OrderedDict[str, int]:
+        with self._lock:
+            if self._index is None:
+                self._scan()
+            return self._index
+
+    def _scan(self) -> None:
+        entries: list[tuple[float, str, int]] = []
+        if self._root.is_dir():
+            for dirpath, _, files in os.walk(self._root):
+                for f in files:
+                    if f.startswith("."):
+                        continue  # temporários de escrita
+                    p = Path(dirpath) / f
+                    try:
+                        st = p.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, p.relative_to(self._root).as_posix(), st.st_size))
+        entries.sort()
+        self._index = OrderedDict((name, size) for _, name, size in entries)
+        self._total = sum(size for _, _, size in entries)
+        self._evict()
+
+    def _read(self, name: str) -> bytes | None:
+        """Lê o derivado e o marca como recente (mtime). None se não existe."""
+        index = self._ensure_index()
+        path = self._root / name
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                size = index.pop(name, None)
+                if size is not None:
+                    self._total -= size
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if name in index:
+                index.move_to_end(name)
+            else:
+                index[name] = len(data)
+                self._total += len(data)
+        return data
+
+    def _write(self, name: str, data: bytes) -> None:
+        """Grava de forma atômica (temporário + rename) e aplica o limite."""
+        index = self._ensure_index()
+        path = self._root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            old = index.pop(name, None)
+            if old is not None:
+                self._total -= old
+            index[name] = len(data)
+            self._total += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove os menos recentes até caber no limite (chamado com o lock)."""
+        while self._total > self._max_bytes and self._index:
+            name, size = self._index.popitem(last=False)
+            self._total -= size
+            self._evictions += 1
+            try:
+                (self._root / name).unlink()
+            except FileNotFoundError:
+                pass
+
+    async def get_or_create(
+        self,
+        attachment_id: str,
+        variant: str,
+        ext: str,
+        producer: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """Derivado em cache ou gerado por producer() (uma vez por chave, mesmo sob concorrência)."""
+        name = self._name(attachment_id, variant, ext)
+        data = await run_io(self._read, name)
+        if data is not None:
+            self._hits += 1
+            return data
+        self._misses += 1
+
+        async def build() -> bytes:
+            out = await producer()
+            await run_io(self._write, name, out)
+            return out
+
+        return await self._flight.do(name, build)
+
+    def stats(self) -> dict:
+        return {
+            "name": "derivatives",
+            "entries": len(self._index) if self._index is not None else None,
+            "bytes": self._total,
+            "max_bytes": self._max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._flight.coalesced,
+            "evictions": self._evictions,
+        }
+
+
+@lru_cache
+def derivative_cache() -> DerivativeCache:
+    """Cache de derivados do processo."""
+    s = get_settings()
+    root = s.preview_cache_dir or (s.uploads_dir / DERIVATIVES_DIR)
+    return DerivativeCache(Path(root).resolve(), s.preview_cache_max_bytes)
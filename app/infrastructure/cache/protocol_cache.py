@@ -0,0 +1,45 @@
+"""
+Caches de leitura por protocolo (detalhe e lista de anexos).
+Invalidação explícita quando status ou anexos mudam, sempre após o commit.
+"""
+
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.infrastructure.cache.ttl_cache import AsyncTTLCache
+from app.infrastructure.db.hooks import after_commit
+
+
+@lru_cache
+def manifestation_cache() -> AsyncTTLCache:
+    """Cache do GET /v1/manifestations/{protocol}."""
+    s = get_settings()
+    return AsyncTTLCache("manifestation", s.protocol_cache_max_entries, s.protocol_cache_ttl_seconds)
+
+
+@lru_cache
+def attachments_cache() -> AsyncTTLCache:
+    """Cache do GET /v1/manifestations/{protocol}/attachments."""
+    s = get_settings()
+    return AsyncTTLCache("attachments", s.protocol_cache_max_entries, s.protocol_cache_ttl_seconds)
+
+
+def invalidate_protocol(protocol: str) -> None:
+    """Remove o protocolo de todos os caches de leitura."""
+    manifestation_cache().invalidate(protocol)
+    attachments_cache().invalidate(protocol)
+
+
+def invalidate_protocol_after_commit(session: AsyncSession, protocol: str | None) -> None:
+    """Invalida imediatamente e de novo após o commit (evita repovoar com dado antigo)."""
+    if not protocol:
+        return
+    invalidate_protocol(protocol)
+    after_commit(session, lambda: invalidate_protocol(protocol))
+
+
+def cache_stats() -> list[dict]:
+    """Estatísticas dos caches de protocolo."""
+    return [manifestation_cache().stats(), attachments_cache().stats()]
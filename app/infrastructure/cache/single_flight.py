@@ -0,0 +1,65 @@
+"""
+Coalescência de chamadas concorrentes (single flight).
+Para a mesma chave, apenas a primeira chamada executa a função; as demais
+aguardam o mesmo resultado.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[V]):
+    """Executa no máximo uma carga por chave ao mesmo tempo."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future[V]] = {}
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[V]],
+        on_result: Callable[[V], None] | None = None,
+    ) -> V:
+        """
+        Executa fn() para a chave ou aguarda a execução em andamento.
+        on_result roda só para o líder e só se a chave não foi esquecida (forget) no meio.
+        """
+        while True:
+            fut = self._inflight.get(key)
+            if fut is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                if fut.cancelled():
+                    continue  # líder cancelado: tenta novamente
+                raise
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # marca como consumida se ninguém aguardava
+            raise
+        finally:
+            current = self._inflight.get(key)
+            if current is fut:
+                del self._inflight[key]
+        if current is fut and on_result is not None:
+            on_result(value)
+        fut.set_result(value)
+        return value
+
+    def forget(self, key: Hashable) -> None:
+        """Descarta carga em andamento: o resultado não será armazenado pelo líder."""
+        self._inflight.pop(key, None)
@@ -0,0 +1,114 @@
+"""
+Cache read-through em memória com TTL e despejo LRU limitado por tamanho.
+Falhas concorrentes para a mesma chave executam uma única carga (SingleFlight).
+Expõe taxa de acerto e histogramas de latência.
+"""
+
+import bisect
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from app.infrastructure.cache.single_flight import SingleFlight
+
+V = TypeVar("V")
+
+# Limites superiores dos buckets (ms); o último bucket é +inf.
+_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """Histograma de latência com buckets fixos (ms)."""
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(_BUCKETS_MS) + 1)
+        self._sum_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self._counts[bisect.bisect_left(_BUCKETS_MS, ms)] += 1
+        self._sum_ms += ms
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{b}" for b in _BUCKETS_MS] + ["le_inf"]
+        count = sum(self._counts)
+        return {
+            "count": count,
+            "avg_ms": round(self._sum_ms / count, 3) if count else 0.0,
+            "buckets": dict(zip(labels, self._counts)),
+        }
+
+
+class AsyncTTLCache(Generic[V]):
+    """Cache TTL + LRU. Valores None não são armazenados."""
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float) -> None:
+        self.name = name
+        self._maxsize = maxsize
+        self._ttl = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._flight: SingleFlight[V | None] = SingleFlight()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._hit_latency = LatencyHistogram()
+        self._miss_latency = LatencyHistogram()
+
+    def _get_fresh(self, key: Hashable) -> tuple[bool, V | None]:
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: V | None) -> None:
+        if value is None or self._maxsize <= 0 or self._ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V | None]]) -> V | None:
+        """Retorna valor em cache ou executa loader (uma vez por chave, mesmo sob concorrência)."""
+        start = time.perf_counter()
+        found, value = self._get_fresh(key)
+        if found:
+            self._hits += 1
+            self._hit_latency.observe(time.perf_counter() - start)
+            return value
+        self._misses += 1
+        try:
+            return await self._flight.do(key, loader, on_result=lambda v: self._store(key, v))
+        finally:
+            self._miss_latency.observe(time.perf_counter() - start)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a chave e descarta carga em andamento (não será armazenada)."""
+        self._data.pop(key, None)
+        self._flight.forget(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self._maxsize,
+            "ttl_seconds": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._flight.coalesced,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "hit_latency": self._hit_latency.snapshot(),
+            "miss_latency": self._miss_latency.snapshot(),
+        }
@@ -0,0 +1,241 @@
+"""
+Buffer write-behind do autosave de rascunhos (PATCH a cada etapa do formulário).
+
+Com AUTOSAVE_FLUSH_INTERVAL_SECONDS > 0, PATCHes só com campos simples não gravam na
+hora: os campos são mesclados por rascunho em memória (o último valor de cada campo
+vence) e um laço do lifespan grava os rascunhos parados há um intervalo (fim da rajada
+de digitação) ou com edição pendente há AUTOSAVE_MAX_DELAY_SECONDS: um
+UPDATE ... WHERE id = ? AND status = 'draft' AND version = ? por rascunho, em uma
+transação. Cada PATCH mesclado avança a version lógica como se tivesse gravado, e o
+UPDATE grava a version final: para o cliente, o contrato de version/409 não muda.
+
+Submit, anexos e PATCHes com campos derivados chamam flush_draft antes de tocar o
+rascunho; novas mesclagens do rascunho esperam até o fim da transação desse pedido
+(que muda a version). Se mesmo assim a version do banco mudou (outro processo), o
+flush relê a version e reaplica os campos mesclados; só descarta se o rascunho foi
+removido ou finalizado. Leituras (lista/busca admin) veem o banco: edições pendentes
+aparecem após o flush. O buffer é POR PROCESSO: com vários workers, use roteamento fixo por
+manifestação (ou um único worker); um PATCH em um processo e o submit em outro
+perdem as edições pendentes. Queda do processo perde no máximo AUTOSAVE_MAX_DELAY_SECONDS.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.domain.enums import ManifestationStatus
+from app.infrastructure.db.hooks import after_transaction_end
+from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.db.session import session_scope
+from app.infrastructure.search import reindex_after_commit
+from app.infrastructure.search.inverted_index import FIELD_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+REAPPLY_ATTEMPTS = 3
+
+
+@dataclass
+class PendingDraft:
+    """Edições ainda não gravadas de um rascunho."""
+
+    base_version: int  # version no banco quando o rascunho entrou no buffer
+    version: int  # version lógica (base + PATCHes mesclados)
+    fields: dict[str, Any] = field(default_factory=dict)
+    first_at: float = field(default_factory=time.monotonic)
+    last_at: float = field(default_factory=time.monotonic)
+
+
+class AutosaveBuffer:
+    """Edições pendentes por rascunho. Uso só no event loop (sem locks de thread)."""
+
+    def __init__(self, max_drafts: int, idle_seconds: float, max_delay_seconds: float) -> None:
+        self.max_drafts = max_drafts
+        self.idle_seconds = idle_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._pending: dict[str, PendingDraft] = {}
+        self._flushing: dict[str, asyncio.Event] = {}
+        # Rascunhos retidos por um pedido (submit, anexos) até o fim da transação dele.
+        self._holds: dict[str, int] = {}
+        self._released: dict[str, asyncio.Event] = {}
+        # Incrementa a cada flush concluído: quem leu o banco antes sabe que pode estar velho.
+        self.generation = 0
+        self._merged = 0
+        self._writes = 0
+        self._reapplied = 0
+        self._dropped = 0
+
+    def get(self, manifestation_id: str) -> PendingDraft | None:
+        return self._pending.get(manifestation_id)
+
+    def full(self) -> bool:
+        return len(self._pending) >= self.max_drafts
+
+    async def wait_writable(self, manifestation_id: str) -> None:
+        """Aguarda flush em andamento e pedidos que retêm o rascunho (a version do banco vai mudar)."""
+        while True:
+            done = self._flushing.get(manifestation_id) or self._released.get(manifestation_id)
+            if done is None:
+                return
+            await done.wait()
+
+    async def _wait_flushed(self, manifestation_id: str) -> None:
+        while (done := self._flushing.get(manifestation_id)) is not None:
+            await done.wait()
+
+    def _hold(self, manifestation_id: str) -> None:
+        self._holds[manifestation_id] = self._holds.get(manifestation_id, 0) + 1
+        self._released.setdefault(manifestation_id, asyncio.Event())
+
+    def _release(self, manifestation_id: str) -> None:
+        n = self._holds.pop(manifestation_id, 1) - 1
+        if n > 0:
+            self._holds[manifestation_id] = n
+            return
+        self.generation += 1  # quem leu a version durante a retenção relê
+        self._released.pop(manifestation_id).set()
+
+    def merge(self, manifestation_id: str, db_version: int, updates: dict[str, Any]) -> PendingDraft:
+        """Mescla updates no rascunho (abre a entrada com db_version se não houver)."""
+        p = self._pending.setdefault(manifestation_id, PendingDraft(db_version, db_version))
+        p.fields.update(updates)
+        p.version += 1
+        p.last_at = time.monotonic()
+        self._merged += 1
+        return p
+
+    async def flush_draft(self, session: AsyncSession, manifestation_id: str) -> None:
+        """
+        Grava agora as edições pendentes do rascunho (transação própria) e retém o
+        rascunho até o fim da transação de session: PATCHes que chegarem enquanto o
+        pedido trabalha esperam em vez de mesclar sobre uma version prestes a mudar.
+        """
+        await session.connection()  # inicia a transação cujo fim libera o rascunho
+        self._hold(manifestation_id)
+        after_transaction_end(session, lambda: self._release(manifestation_id))
+        await self._wait_flushed(manifestation_id)
+        p = self._pending.pop(manifestation_id, None)
+        if p is not None:
+            await self._flush({manifestation_id: p})
+
+    async def flush_due(self) -> int:
+        """Grava os rascunhos parados há idle_seconds ou pendentes há max_delay_seconds."""
+        now = time.monotonic()
+        batch = {
+            mid: p
+            for mid, p in self._pending.items()
+            if now - p.last_at >= self.idle_seconds or now - p.first_at >= self.max_delay_seconds
+        }
+        for mid in batch:
+            del self._pending[mid]
+        if batch:
+            await self._flush(batch)
+        return len(batch)
+
+    async def flush_all(self) -> int:
+        """Grava todos os rascunhos pendentes; retorna quantos."""
+        batch, self._pending = self._pending, {}
+        if batch:
+            await self._flush(batch)
+        return len(batch)
+
+    async def _flush(self, batch: dict[str, PendingDraft]) -> None:
+        done = asyncio.Event()
+        for mid in batch:
+            self._flushing[mid] = done
+        try:
+            async with session_scope() as db:
+                for mid, p in sorted(batch.items()):  # ordem fixa de linhas: menos deadlock
+                    await self._write(db, mid, p)
+        except BaseException:
+            # Banco indisponível ou cancelamento: devolve ao buffer para a próxima rodada.
+            for mid, p in batch.items():
+                self._pending.setdefault(mid, p)
+            raise
+        finally:
+            for mid in batch:
+                self._flushing.pop(mid, None)
+            self.generation += 1
+            done.set()
+
+    async def _write(self, session: AsyncSession, manifestation_id: str, p: PendingDraft) -> None:
+        m = ManifestationModel
+        expected = p.base_version
+        for _ in range(REAPPLY_ATTEMPTS):
+            r = await session.execute(
+                update(m)
+                .where(m.id == manifestation_id, m.status == ManifestationStatus.DRAFT, m.version == expected)
+                # Sempre acima da version atual: quem leu uma version anterior recebe 409.
+                .values(**p.fields, version=max(p.version, expected + 1))
+                .execution_options(synchronize_session=False)
+            )
+            self._writes += 1
+            if r.rowcount == 1:
+                if p.fields.keys() & FIELD_WEIGHTS.keys():
+                    reindex_after_commit(session, manifestation_id)
+                return
+            r = await session.execute(select(m.status, m.version).where(m.id == manifestation_id))
+            row = r.one_or_none()
+            if row is None or row.status != ManifestationStatus.DRAFT:
+                break
+            # Outra escrita (ex.: outro processo) mudou a version: reaplica os campos sobre ela.
+            self._reapplied += 1
+            expected = row.version
+        self._dropped += 1
+        logger.warning("Autosave descartado para %s: rascunho removido, finalizado ou em disputa", manifestation_id)
+
+    def stats(self) -> dict:
+        return {
+            "pending_drafts": len(self._pending),
+            "max_drafts": self.max_drafts,
+            "idle_seconds": self.idle_seconds,
+            "max_delay_seconds": self.max_delay_seconds,
+            "merged_patches": self._merged,
+            "db_writes": self._writes,
+            "reapplied": self._reapplied,
+            "dropped": self._dropped,
+            "coalescing_ratio": round(self._merged / self._writes, 2) if self._writes else 0.0,
+        }
+
+
+@lru_cache
+def autosave_buffer() -> AutosaveBuffer | None:
+    """Buffer do processo; None quando o write-behind está desligado (intervalo 0)."""
+    s = get_settings()
+    if s.autosave_flush_interval_seconds <= 0:
+        return None
+    return AutosaveBuffer(s.autosave_max_drafts, s.autosave_flush_interval_seconds, s.autosave_max_delay_seconds)
+
+
+async def flush_draft(session: AsyncSession, manifestation_id: str) -> None:
+    """Antes de submit/anexos/PATCH com derivados: grava as edições pendentes e retém o rascunho."""
+    buf = autosave_buffer()
+    if buf is not None:
+        await buf.flush_draft(session, manifestation_id)
+
+
+async def run_periodic(interval_seconds: float) -> None:
+    """Laço do lifespan: grava os rascunhos vencidos a cada meio intervalo; ao ser cancelado, grava o resto."""
+    buf = autosave_buffer()
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds / 2)
+            started = time.perf_counter()
+            try:
+                n = await buf.flush_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Flush do autosave falhou; edições mantidas para a próxima rodada")
+                continue
+            if n:
+                logger.debug("Autosave: %d rascunhos gravados em %.1f ms", n, (time.perf_counter() - started) * 1000)
+    finally:
+        await buf.flush_all()
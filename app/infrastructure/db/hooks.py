@@ -0,0 +1,57 @@
+"""
+Hooks de transação.
+Permite agendar efeitos colaterais (eventos, invalidação de cache) para rodar
+somente depois do commit. Em rollback, os callbacks pendentes são descartados.
+after_transaction_end roda com commit ou rollback (liberar algo retido pela transação).
+"""
+
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+_AFTER_END_KEY = "after_transaction_end_callbacks"
+
+
+def after_commit(session: AsyncSession | Session, callback: Callable[[], None]) -> None:
+    """Agenda callback (síncrono) para depois do commit da sessão."""
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    sync_session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+def after_transaction_end(session: AsyncSession | Session, callback: Callable[[], None]) -> None:
+    """Agenda callback (síncrono) para o fim da transação da sessão, com commit ou rollback."""
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    sync_session.info.setdefault(_AFTER_END_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    callbacks = session.info.pop(_AFTER_COMMIT_KEY, [])
+    for cb in callbacks:
+        try:
+            cb()
+        except Exception as e:
+            logger.warning("Callback after_commit falhou: %s", e, exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _run_after_transaction_end(session: Session, transaction) -> None:
+    if transaction.parent is not None:  # savepoint / subtransação
+        return
+    callbacks = session.info.pop(_AFTER_END_KEY, [])
+    for cb in callbacks:
+        try:
+            cb()
+        except Exception as e:
+            logger.warning("Callback after_transaction_end falhou: %s", e, exc_info=True)
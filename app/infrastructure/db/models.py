@@ -1,18 +1,20 @@
 """
-Modelos ORM (SQLAlchemy) para Manifestation e Attachment.
+Modelos ORM (SQLAlchemy) para Manifestation, Attachment, regiões administrativas, tags,
+rollups de estatísticas e cursores de jobs.
 Mapeiam as entidades de domínio para o banco MySQL.
-Compatível com MySQL: UUID como String(36), Enum nativo, JSON para complementary_tags.
+Compatível com MySQL: UUIDv7 como CHAR(36) ou BINARY(16) (ID_STORAGE), Enum nativo, JSON para complementary_tags.
 """
 
-import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import List
 
 from sqlalchemy import (
     Boolean,
+    Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -23,11 +25,13 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.domain.enums import AttachmentType, InputType, ManifestationStatus
 from app.infrastructure.db.base import Base
+from app.infrastructure.db.types import id_type
+from app.utils.uuid7 import uuid7_str
 
 
 def _gen_uuid_str() -> str:
-    """Gera UUID como string (36 chars) para armazenamento em MySQL."""
-    return str(uuid.uuid4())
+    """Gera UUIDv7 como string (36 chars): ordenado no tempo, inserções no fim do índice."""
+    return uuid7_str()
 
 
 class ManifestationModel(Base):
@@ -36,8 +40,21 @@ class ManifestationModel(Base):
     """
 
     __tablename__ = "manifestations"
+    # Listagem admin por keyset (ORDER BY created_at DESC, id DESC), com e sem filtro
+    # de igualdade: (filtro, created_at, id) serve o WHERE e a ordenação.
+    __table_args__ = (
+        Index("ix_manifestations_created_at_id", "created_at", "id"),
+        Index("ix_manifestations_status_created_at", "status", "created_at", "id"),
+        Index("ix_manifestations_input_type_created_at", "input_type", "created_at", "id"),
+        Index("ix_manifestations_region_created_at", "administrative_region_id", "created_at", "id"),
+        Index("ix_manifestations_anonymous_created_at", "anonymous", "created_at", "id"),
+        # GC de rascunhos: status = 'draft' AND updated_at < corte.
+        Index("ix_manifestations_status_updated_at", "status", "updated_at"),
+        # Mapa: intervalos de prefixo do geohash; lat/lng/status no índice evitam ler a linha.
+        Index("ix_manifestations_geohash", "geohash", "location_lat", "location_lng", "status"),
+    )
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_gen_uuid_str)
+    id: Mapped[str] = mapped_column(id_type(), primary_key=True, default=_gen_uuid_str)
     protocol: Mapped[str | None] = mapped_column(String(32), unique=True, index=True, nullable=True)
     input_type: Mapped[InputType] = mapped_column(
         SQLEnum(
@@ -57,7 +74,13 @@ class ManifestationModel(Base):
     location_lat: Mapped[float | None] = mapped_column(Float, nullable=True)
     location_lng: Mapped[float | None] = mapped_column(Float, nullable=True)
     location_description: Mapped[str | None] = mapped_column(String(512), nullable=True)
-    administrative_region: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Geohash de (location_lat, location_lng), calculado na escrita (app.utils.geohash)
+    geohash: Mapped[str | None] = mapped_column(String(12), nullable=True)
+    administrative_region_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("administrative_regions.id", name="fk_manifestations_administrative_region"),
+        nullable=True,
+    )
     anonymous: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     contact_name: Mapped[str | None] = mapped_column(String(256), nullable=True)
     contact_email: Mapped[str | None] = mapped_column(String(256), nullable=True)
@@ -73,6 +96,16 @@ class ManifestationModel(Base):
         nullable=False,
     )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    # Última escrita (GC de rascunhos parados). onupdate vale também para os UPDATEs
+    # condicionais (PATCH, submit, flush do autosave), que não listam a coluna.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    # Concorrência otimista: PATCH/submit com version esperada usam UPDATE ... WHERE version = ?;
+    # flushes do ORM também conferem e incrementam (version_id_col → StaleDataError).
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     attachments: Mapped[List["AttachmentModel"]] = relationship(
         "AttachmentModel",
@@ -81,16 +114,48 @@ class ManifestationModel(Base):
     )
 
 
+class AdministrativeRegionModel(Base):
+    """Modelo ORM: região administrativa (lookup; key = nome normalizado, sem acento/caixa)."""
+
+    __tablename__ = "administrative_regions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    key: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+
+
+class ManifestationTagModel(Base):
+    """Modelo ORM: tag complementar normalizada (fold_text) de uma manifestação.
+    Espelha complementary_tags (JSON) para filtro e contagem por índice; created_at
+    copiado da manifestação para que (tag, created_at) atenda a listagem por keyset.
+    """
+
+    __tablename__ = "manifestation_tags"
+    __table_args__ = (
+        Index("ix_manifestation_tags_tag_created_at", "tag", "created_at", "manifestation_id"),
+        Index("ix_manifestation_tags_created_at_tag", "created_at", "tag"),
+    )
+
+    manifestation_id: Mapped[str] = mapped_column(
+        id_type(),
+        ForeignKey("manifestations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    tag: Mapped[str] = mapped_column(String(64), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class AttachmentModel(Base):
     """Modelo ORM: anexo."""
 
     __tablename__ = "attachments"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_gen_uuid_str)
+    id: Mapped[str] = mapped_column(id_type(), primary_key=True, default=_gen_uuid_str)
     manifestation_id: Mapped[str] = mapped_column(
-        String(36),
+        id_type(),
         ForeignKey("manifestations.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,  # ix_attachments_manifestation_id (migração 001)
     )
     type: Mapped[AttachmentType] = mapped_column(
         SQLEnum(
@@ -104,9 +169,43 @@ class AttachmentModel(Base):
     mime_type: Mapped[str] = mapped_column(String(128), nullable=False)
     size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
     file_path: Mapped[str] = mapped_column(String(512), nullable=False)
+    # Original retido quando a ingestão normaliza a mídia (KEEP_ORIGINAL_UPLOADS)
+    original_file_path: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    original_mime_type: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Integridade: SHA-256 (hex) calculado na ingestão; verificado pelo scrubber.
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    verified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    checksum_mismatch: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
     manifestation: Mapped["ManifestationModel"] = relationship(
         "ManifestationModel",
         back_populates="attachments",
     )
+
+
+class ManifestationDailyStatModel(Base):
+    """Modelo ORM: rollup de contagem de manifestações por dia (UTC de created_at) x status x
+    input_type x região (0 = sem região). Mantido na mesma transação das escritas
+    (app.infrastructure.db.stats); reconstruído por app.jobs.rebuild_stats.
+    """
+
+    __tablename__ = "manifestation_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+    input_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    administrative_region_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class JobCursorModel(Base):
+    """Modelo ORM: posição de retomada de jobs em lote (ex.: scrubber)."""
+
+    __tablename__ = "job_cursors"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    position: Mapped[str] = mapped_column(String(512), nullable=False, default="")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
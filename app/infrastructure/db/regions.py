@@ -0,0 +1,65 @@
+"""
+Lookup de regiões administrativas (tabela administrative_regions).
+Manifestações guardam só administrative_region_id (INT indexável); o nome digitado
+é normalizado (fold_text) para que grafias diferentes caiam na mesma região.
+Ids já confirmados no banco ficam em cache no processo (linhas nunca mudam).
+"""
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.hooks import after_commit
+from app.infrastructure.db.models import AdministrativeRegionModel
+from app.utils.text import fold_text
+
+_ids: dict[str, int] = {}  # key → id
+
+
+def region_key(name: str) -> str:
+    return fold_text(name)[:128]
+
+
+async def find_region_id(session: AsyncSession, name: str) -> int | None:
+    """Id da região pelo nome (qualquer grafia), sem criar. None se não existe."""
+    key = region_key(name)
+    if not key:
+        return None
+    if key in _ids:
+        return _ids[key]
+    r = await session.execute(select(AdministrativeRegionModel.id).where(AdministrativeRegionModel.key == key))
+    region_id = r.scalar_one_or_none()
+    if region_id is not None:
+        _ids[key] = region_id
+    return region_id
+
+
+async def resolve_region_id(session: AsyncSession, name: str | None) -> int | None:
+    """Id da região, criando-a na primeira ocorrência. None para nome vazio."""
+    if not name or not name.strip():
+        return None
+    region_id = await find_region_id(session, name)
+    if region_id is not None:
+        return region_id
+    key = region_key(name)
+    values = {"key": key, "name": " ".join(name.split())[:128]}
+    dialect = session.bind.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(AdministrativeRegionModel).values(**values).prefix_with("IGNORE")
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(AdministrativeRegionModel).values(**values).on_conflict_do_nothing()
+    else:
+        stmt = insert(AdministrativeRegionModel).values(**values)
+    await session.execute(stmt)
+    # Leitura com lock (MySQL): enxerga a linha de uma transação concorrente já
+    # commitada, que o snapshot REPEATABLE READ esconderia.
+    r = await session.execute(
+        select(AdministrativeRegionModel.id)
+        .where(AdministrativeRegionModel.key == key)
+        .with_for_update(read=True)
+    )
+    region_id = r.scalar_one()
+    # Só entra no cache depois do commit: em rollback a linha nova deixa de existir.
+    after_commit(session, lambda: _ids.setdefault(key, region_id))
+    return region_id
@@ -3,12 +3,14 @@ Sessão async do SQLAlchemy e factory de dependência.
 """
 
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import get_settings
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.models import AttachmentModel, ManifestationModel  # noqa: F401
+from app.infrastructure.db import stats  # noqa: F401  (listener dos rollups de estatísticas)
 
 _settings = get_settings()
 _engine = create_async_engine(
@@ -37,6 +39,18 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """Sessão fora do ciclo de request (streams, jobs). Commit ao sair, rollback em erro."""
+    async with _async_session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
 async def init_db() -> None:
     """Cria tabelas (útil para testes; em produção use Alembic)."""
     async with _engine.begin() as conn:
@@ -0,0 +1,162 @@
+"""
+Rollups de estatísticas (tabela manifestation_daily_stats).
+
+Cada linha conta manifestações por dia (UTC de created_at) x status x input_type x
+região. Inserções, mudanças de status/tipo/região e exclusões via ORM viram deltas
+(+1/-1) coletados no flush e aplicados por upsert na mesma transação: em rollback
+o rollup volta junto. DELETEs em massa (GC de rascunhos) chamam record_bulk_delete
+antes de apagar; UPDATEs diretos de status (submit) chamam record_status_change.
+Divergências (SQL manual, dialeto sem upsert) são corrigidas por
+python -m app.jobs.rebuild_stats.
+"""
+
+import logging
+from collections import Counter
+from datetime import date, datetime
+from enum import Enum
+
+from sqlalchemy import event, func, inspect, literal, select, true, union_all
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.infrastructure.db.models import ManifestationDailyStatModel, ManifestationModel
+
+logger = logging.getLogger(__name__)
+
+StatKey = tuple[date, str, str, int]  # (dia, status, input_type, região; 0 = sem região)
+
+_TRACKED = ("created_at", "status", "input_type", "administrative_region_id")
+_INSERTS = {"mysql": mysql_insert, "postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _value(v) -> str:
+    return v.value if isinstance(v, Enum) else v
+
+
+def stat_key(created_at: datetime | date | str, status, input_type, region_id: int | None) -> StatKey:
+    """Chave do rollup. created_at pode vir como datetime, date ou 'YYYY-MM-DD' (DATE() do SQLite)."""
+    if isinstance(created_at, str):
+        day = date.fromisoformat(created_at[:10])
+    elif isinstance(created_at, datetime):
+        day = created_at.date()
+    else:
+        day = created_at
+    return day, _value(status), _value(input_type), region_id or 0
+
+
+def upsert_statement(dialect: str, deltas: Counter):
+    """INSERT ... (ON DUPLICATE KEY | ON CONFLICT) somando os deltas; None sem delta ou sem upsert no dialeto."""
+    rows = [
+        {"day": k[0], "status": k[1], "input_type": k[2], "administrative_region_id": k[3], "count": n}
+        for k, n in sorted(deltas.items())  # ordem fixa de chaves: menos deadlock entre transações
+        if n
+    ]
+    ins = _INSERTS.get(dialect)
+    if not rows or ins is None:
+        return None
+    return _add_on_conflict(ins(ManifestationDailyStatModel).values(rows), dialect)
+
+
+def _add_on_conflict(stmt, dialect: str):
+    """Em chave existente, soma count em vez de falhar."""
+    t = ManifestationDailyStatModel
+    if dialect == "mysql":
+        return stmt.on_duplicate_key_update(count=t.count + stmt.inserted["count"])
+    return stmt.on_conflict_do_update(
+        index_elements=[t.day, t.status, t.input_type, t.administrative_region_id],
+        set_={"count": t.count + stmt.excluded["count"]},
+    )
+
+
+def _key_from(values: dict) -> StatKey | None:
+    if values.get("created_at") is None:
+        return None
+    return stat_key(values["created_at"], values["status"], values["input_type"], values.get("administrative_region_id"))
+
+
+def _old_values(obj: ManifestationModel) -> dict:
+    """Valores antes do flush (histórico ainda disponível em after_flush)."""
+    attrs = inspect(obj).attrs
+    out = {}
+    for name in _TRACKED:
+        hist = attrs[name].history
+        if hist.deleted:
+            out[name] = hist.deleted[0]
+        elif hist.unchanged:
+            out[name] = hist.unchanged[0]
+        else:
+            out[name] = obj.__dict__.get(name)
+    return out
+
+
+def _collect(session: Session) -> Counter:
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, ManifestationModel):
+            deltas[_key_from(obj.__dict__)] += 1
+    for obj in session.dirty:
+        if isinstance(obj, ManifestationModel) and any(inspect(obj).attrs[a].history.has_changes() for a in _TRACKED):
+            deltas[_key_from(_old_values(obj))] -= 1
+            deltas[_key_from(obj.__dict__)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, ManifestationModel):
+            deltas[_key_from(_old_values(obj))] -= 1
+    if deltas.pop(None, 0):
+        logger.warning("Rollup de estatísticas: objeto sem created_at carregado; rode app.jobs.rebuild_stats")
+    return deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_deltas(session: Session, flush_context) -> None:
+    deltas = _collect(session)
+    if not deltas:
+        return
+    conn = session.connection()
+    stmt = upsert_statement(conn.dialect.name, deltas)
+    if stmt is not None:
+        conn.execute(stmt)
+
+
+async def record_bulk_delete(session: AsyncSession, ids: list[str]) -> None:
+    """Desconta do rollup as manifestações ids (antes de um DELETE em massa, mesma transação)."""
+    m = ManifestationModel
+    r = await session.execute(select(*(getattr(m, a) for a in _TRACKED)).where(m.id.in_(ids)))
+    deltas: Counter = Counter()
+    for row in r.all():
+        deltas[stat_key(*row)] -= 1
+    stmt = upsert_statement(session.bind.dialect.name, deltas)
+    if stmt is not None:
+        await session.execute(stmt)
+
+
+async def record_status_change(session: AsyncSession, manifestation_id: str, old, new) -> None:
+    """
+    Move a manifestação de old para new no rollup após um UPDATE direto de status
+    (sem flush do ORM). INSERT ... SELECT: a chave (dia, tipo, região) é lida pelo
+    próprio banco, sem ida e volta para buscar a linha.
+    """
+    dialect = session.bind.dialect.name
+    ins = _INSERTS.get(dialect)
+    if ins is None:
+        return
+    m, t = ManifestationModel, ManifestationDailyStatModel
+    rows = union_all(
+        *(
+            select(
+                func.date(m.created_at).label("day"),
+                literal(_value(status)).label("status"),
+                m.input_type.label("input_type"),
+                func.coalesce(m.administrative_region_id, 0).label("region_id"),
+                literal(delta).label("count"),
+            ).where(m.id == manifestation_id)
+            for status, delta in ((old, -1), (new, 1))
+        )
+    ).subquery()
+    # WHERE true: no SQLite, INSERT ... SELECT com upsert exige WHERE (ambiguidade com ON).
+    stmt = ins(t).from_select(
+        [t.day, t.status, t.input_type, t.administrative_region_id, t.count], select(rows).where(true())
+    )
+    await session.execute(_add_on_conflict(stmt, dialect))
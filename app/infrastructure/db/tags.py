@@ -0,0 +1,35 @@
+"""
+Tags complementares indexadas (tabela manifestation_tags).
+complementary_tags (JSON) continua sendo o valor exibido; cada tag também vira uma
+linha (manifestation_id, tag normalizada, created_at) para filtrar e contar por
+índice em vez de varrer o JSON de todas as linhas.
+"""
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.db.models import ManifestationModel, ManifestationTagModel
+from app.utils.text import fold_text
+
+MAX_TAG_LEN = 64
+
+
+def tag_key(tag) -> str:
+    """Tag normalizada (sem acento/caixa, espaços colapsados)."""
+    return fold_text(str(tag))[:MAX_TAG_LEN]
+
+
+def tag_keys(tags: list | None) -> list[str]:
+    """Tags normalizadas, sem vazias nem repetidas, na ordem original."""
+    return list(dict.fromkeys(k for k in map(tag_key, tags or ()) if k))
+
+
+async def sync_manifestation_tags(session: AsyncSession, m: ManifestationModel) -> None:
+    """Substitui as linhas de manifestation_tags de m por complementary_tags (m já no banco)."""
+    await session.execute(delete(ManifestationTagModel).where(ManifestationTagModel.manifestation_id == m.id))
+    keys = tag_keys(m.complementary_tags)
+    if keys:
+        await session.execute(
+            insert(ManifestationTagModel),
+            [{"manifestation_id": m.id, "tag": k, "created_at": m.created_at} for k in keys],
+        )
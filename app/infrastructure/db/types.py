@@ -0,0 +1,51 @@
+"""
+Tipos de coluna customizados.
+
+Ids (manifestações, anexos e FKs) são str na aplicação e na API. No banco ficam
+como CHAR(36) (padrão) ou BINARY(16) com ID_STORAGE=binary16: 16 bytes em vez
+de 36 por chave, no índice clusterizado e em cada índice secundário que a carrega.
+A conversão é feita aqui, na fronteira com o banco; a ordem dos bytes é a mesma do
+texto hex, então comparações (cursor keyset, scrubber) não mudam.
+"""
+
+import uuid
+
+from sqlalchemy import String
+from sqlalchemy.dialects.mysql import BINARY
+from sqlalchemy.types import LargeBinary, TypeDecorator, TypeEngine
+
+from app.core.config import get_settings
+
+
+class UUIDBinary(TypeDecorator):
+    """UUID em texto (str) na aplicação, 16 bytes no banco (BINARY(16) no MySQL, BLOB no SQLite)."""
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(BINARY(16))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            # Texto que não é UUID (id inválido na URL, cursor vazio do scrubber): bytes
+            # do próprio texto, que não casam com nenhum id de 16 bytes.
+            return str(value).encode()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+def id_type() -> TypeEngine:
+    """Tipo das colunas de id conforme ID_STORAGE (char36 | binary16)."""
+    return UUIDBinary() if get_settings().id_storage == "binary16" else String(36)
@@ -0,0 +1,17 @@
+"""Eventos: pub/sub em processo para notificações (SSE)."""
+
+from app.infrastructure.events.broker import (
+    BrokerFullError,
+    EventBroker,
+    Subscription,
+    get_broker,
+    publish_after_commit,
+)
+
+__all__ = [
+    "BrokerFullError",
+    "EventBroker",
+    "Subscription",
+    "get_broker",
+    "publish_after_commit",
+]
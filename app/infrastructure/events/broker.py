@@ -0,0 +1,141 @@
+"""
+Pub/sub em processo para eventos de manifestação.
+Tópico = id da manifestação. Cada publicação é codificada uma única vez como
+frame SSE e os mesmos bytes são entregues a todos os assinantes do tópico.
+Número de conexões e tamanho das filas são limitados; assinante lento perde
+os eventos mais antigos (o último estado sempre chega).
+"""
+
+import asyncio
+import json
+import logging
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.infrastructure.db.hooks import after_commit
+
+logger = logging.getLogger(__name__)
+
+
+class BrokerFullError(Exception):
+    """Limite de assinantes (total ou por tópico) atingido."""
+
+    pass
+
+
+def encode_event(event_type: str, data: dict[str, Any]) -> bytes:
+    """Codifica evento no formato text/event-stream."""
+    payload = json.dumps(data, ensure_ascii=False, default=str, separators=(",", ":"))
+    return f"event: {event_type}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """Assinatura de um tópico. Fila limitada de frames SSE já codificados."""
+
+    def __init__(self, broker: "EventBroker", topic: str, queue_size: int) -> None:
+        self.topic = topic
+        self._broker = broker
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def _offer(self, frame: bytes) -> None:
+        """Enfileira sem bloquear; descarta o mais antigo se a fila estiver cheia."""
+        if self._queue.full():
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self._queue.put_nowait(frame)
+
+    async def get(self) -> bytes:
+        """Aguarda o próximo frame."""
+        return await self._queue.get()
+
+    def close(self) -> None:
+        """Cancela a assinatura."""
+        self._broker._unsubscribe(self)
+
+
+class EventBroker:
+    """Broker em memória, limitado por conexões totais e por tópico."""
+
+    def __init__(self, max_subscribers: int, max_per_topic: int, queue_size: int) -> None:
+        self._max_subscribers = max_subscribers
+        self._max_per_topic = max_per_topic
+        self._queue_size = queue_size
+        self._topics: dict[str, set[Subscription]] = {}
+        self._count = 0
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._rejected = 0
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Registra assinante. Levanta BrokerFullError se algum limite for atingido."""
+        subs = self._topics.get(topic)
+        if self._count >= self._max_subscribers or (subs and len(subs) >= self._max_per_topic):
+            self._rejected += 1
+            raise BrokerFullError("Limite de conexões de eventos atingido.")
+        sub = Subscription(self, topic, self._queue_size)
+        self._topics.setdefault(topic, set()).add(sub)
+        self._count += 1
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        subs = self._topics.get(sub.topic)
+        if not subs or sub not in subs:
+            return
+        subs.discard(sub)
+        self._count -= 1
+        self._dropped += sub.dropped
+        if not subs:
+            del self._topics[sub.topic]
+
+    def publish(self, topic: str, event_type: str, data: dict[str, Any]) -> int:
+        """Publica evento no tópico. Retorna quantos assinantes receberam."""
+        subs = self._topics.get(topic)
+        self._published += 1
+        if not subs:
+            return 0
+        frame = encode_event(event_type, data)
+        for sub in subs:
+            sub._offer(frame)
+        self._delivered += len(subs)
+        return len(subs)
+
+    def stats(self) -> dict[str, int]:
+        """Contadores para monitoramento e testes de carga."""
+        return {
+            "subscribers": self._count,
+            "topics": len(self._topics),
+            "max_subscribers": self._max_subscribers,
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped + sum(s.dropped for subs in self._topics.values() for s in subs),
+            "rejected": self._rejected,
+        }
+
+
+@lru_cache
+def get_broker() -> EventBroker:
+    """Broker do processo (singleton)."""
+    s = get_settings()
+    return EventBroker(
+        max_subscribers=s.sse_max_connections,
+        max_per_topic=s.sse_max_connections_per_topic,
+        queue_size=s.sse_queue_size,
+    )
+
+
+def publish_after_commit(
+    session: AsyncSession,
+    manifestation_id: str,
+    event_type: str,
+    data: dict[str, Any],
+) -> None:
+    """Publica evento somente após o commit da transação corrente."""
+    after_commit(session, lambda: get_broker().publish(manifestation_id, event_type, data))
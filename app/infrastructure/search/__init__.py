@@ -0,0 +1,20 @@
+"""Busca textual: índice invertido em processo (fallback do FULLTEXT do MySQL)."""
+
+from app.infrastructure.search.index_sync import (
+    load_search_index,
+    reindex_after_commit,
+    remove_after_commit,
+    search_index,
+    uses_memory_index,
+)
+from app.infrastructure.search.inverted_index import InvertedIndex, tokenize
+
+__all__ = [
+    "InvertedIndex",
+    "load_search_index",
+    "reindex_after_commit",
+    "remove_after_commit",
+    "search_index",
+    "tokenize",
+    "uses_memory_index",
+]
@@ -0,0 +1,146 @@
+"""
+Manutenção do índice de busca em processo: carga inicial do banco e atualização
+incremental. Criação, PATCH, texto extraído e exclusões via ORM de
+ManifestationModel são coletados no flush e aplicados após o commit
+(hooks.after_commit); em rollback nada muda. UPDATEs diretos (PATCH sem leitura)
+chamam reindex_after_commit; DELETEs em massa (GC de rascunhos) chamam
+remove_after_commit. Ids apagados por outro processo (GC pela CLI) saem do índice
+quando a busca não os encontra no banco.
+Inativo (custo zero por flush) quando a busca usa o FULLTEXT do MySQL.
+"""
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.infrastructure.db.hooks import after_commit
+from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.search.inverted_index import FIELD_WEIGHTS, InvertedIndex
+
+logger = logging.getLogger(__name__)
+
+LOAD_BATCH_SIZE = 2000
+
+_index = InvertedIndex()
+_active = False  # carga iniciada: a partir daqui mudanças são aplicadas
+_ready = asyncio.Event()
+_touched: set[str] | None = None  # ids alterados durante a carga (a carga não os sobrescreve)
+_refreshes: set[asyncio.Task] = set()
+_DELETED = object()
+
+
+def search_index() -> InvertedIndex:
+    return _index
+
+
+def uses_memory_index() -> bool:
+    """True quando a busca usa o índice em processo (SEARCH_BACKEND ou banco sem FULLTEXT)."""
+    backend = get_settings().search_backend
+    if backend == "auto":
+        return make_url(get_settings().database_url).get_backend_name() != "mysql"
+    return backend == "memory"
+
+
+def _columns() -> tuple:
+    return (ManifestationModel.id, *(getattr(ManifestationModel, f) for f in FIELD_WEIGHTS))
+
+
+async def load_search_index() -> None:
+    """Carrega o índice do banco (uma vez por processo; chamadas concorrentes aguardam)."""
+    global _active, _touched
+    if _active:
+        await _ready.wait()
+        return
+    from app.infrastructure.db.session import session_scope
+
+    _active = True
+    _touched = set()
+    started = time.perf_counter()
+    try:
+        async with session_scope() as db:
+            result = await db.stream(select(*_columns()).execution_options(yield_per=LOAD_BATCH_SIZE))
+            async for rows in result.partitions(LOAD_BATCH_SIZE):
+                touched = _touched
+                docs = [(r.id, {f: getattr(r, f) for f in FIELD_WEIGHTS}) for r in rows if r.id not in touched]
+                await asyncio.to_thread(_index.upsert_many, docs)
+    except BaseException:
+        _active = False
+        _touched = None
+        raise
+    _touched = None
+    _ready.set()
+    logger.info("Índice de busca carregado: %d documentos em %.1f s", len(_index), time.perf_counter() - started)
+
+
+async def _refresh(doc_id: str) -> None:
+    from app.infrastructure.db.session import session_scope
+
+    async with session_scope() as db:
+        row = (await db.execute(select(*_columns()).where(ManifestationModel.id == doc_id))).one_or_none()
+    if row is None:
+        _index.remove(doc_id)
+    else:
+        _index.upsert(doc_id, {f: getattr(row, f) for f in FIELD_WEIGHTS})
+
+
+def _apply(changes: dict) -> None:
+    for doc_id, fields in changes.items():
+        if _touched is not None:
+            _touched.add(doc_id)
+        if fields is _DELETED:
+            _index.remove(doc_id)
+        elif fields is None:
+            # Algum campo não estava carregado no objeto: relê do banco.
+            task = asyncio.get_running_loop().create_task(_refresh(doc_id))
+            _refreshes.add(task)
+            task.add_done_callback(_refreshes.discard)
+        else:
+            _index.upsert(doc_id, fields)
+
+
+def reindex_after_commit(session, doc_id: str) -> None:
+    """Relê e reindexa doc_id após o commit (escrita que não passou pelo flush do ORM)."""
+    if _active:
+        after_commit(session, lambda: _apply({doc_id: None}))
+
+
+def remove_after_commit(session, doc_ids: list[str]) -> None:
+    """Remove doc_ids do índice após o commit (DELETE em massa, sem flush do ORM)."""
+    if _active and doc_ids:
+        removed = dict.fromkeys(doc_ids, _DELETED)
+        after_commit(session, lambda: _apply(removed))
+
+
+def _text_changed(obj: ManifestationModel) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[f].history.has_changes() for f in FIELD_WEIGHTS)
+
+
+def _loaded_fields(obj: ManifestationModel, new: bool = False) -> dict | None:
+    d = obj.__dict__  # sem disparar lazy load (proibido em sessão async)
+    if new or all(f in d for f in FIELD_WEIGHTS):  # objeto novo: campo ausente = NULL
+        return {f: d.get(f) for f in FIELD_WEIGHTS}
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    if not _active:
+        return
+    changes: dict = {}
+    for obj in session.new:
+        if isinstance(obj, ManifestationModel):
+            changes[obj.id] = _loaded_fields(obj, new=True)
+    for obj in session.dirty:
+        if isinstance(obj, ManifestationModel) and _text_changed(obj):
+            changes[obj.id] = _loaded_fields(obj)
+    for obj in session.deleted:
+        if isinstance(obj, ManifestationModel):
+            changes[obj.id] = _DELETED
+    if changes:
+        after_commit(session, lambda: _apply(changes))
@@ -0,0 +1,224 @@
+"""
+Índice invertido em processo (fallback da busca textual quando não há FULLTEXT do MySQL).
+
+- Tokens: texto normalizado por fold_text (sem acento/caixa), palavras com 2+
+  caracteres, sem stopwords comuns do português.
+- Postings compactas: por token, um array('Q') com (docno << 16 | tf); 8 bytes por
+  ocorrência, sem dict por documento.
+- Atualização incremental: upsert dá um docno novo ao documento e marca o antigo
+  como morto; as entradas mortas são ignoradas na busca e removidas por compactação
+  quando passam das vivas.
+- Ranking BM25 com pesos por campo (assunto > resumo > texto), semântica OR como o
+  NATURAL LANGUAGE MODE do MySQL. Com numpy instalado o cálculo é vetorizado sobre as
+  postings (views sem cópia dos arrays); sem numpy, laço em Python.
+
+Thread-safe (lock único). O índice vive em um processo: com vários workers cada
+um mantém sua cópia, carregada do banco na subida.
+"""
+
+import heapq
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+
+from app.utils.text import fold_text
+
+try:
+    import numpy as np
+except ImportError:  # opcional: busca mais lenta em termos muito frequentes
+    np = None
+
+FIELD_WEIGHTS: dict[str, int] = {
+    "subject_label": 3,
+    "summary": 2,
+    "original_text": 1,
+    "extracted_text": 1,
+}
+
+STOPWORDS = frozenset(
+    "a ao aos as com da das de do dos e ela ele em entre era essa esse esta este eu foi ha isso ja "
+    "mais mas me mesmo na nao nas no nos num numa o os ou para pela pelas pelo pelos por qual que "
+    "se sem ser seu sua suas seus so tambem te tem um uma umas uns voce".split()
+)
+
+_WORD = re.compile(r"\w+")
+_TF_MAX = 0xFFFF
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Tokens de busca do texto (normalizados, sem stopwords)."""
+    if not text:
+        return []
+    return [t for t in _WORD.findall(fold_text(text)) if len(t) > 1 and t not in STOPWORDS]
+
+
+def _weighted_terms(fields: dict[str, str | None]) -> Counter:
+    terms: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for t in tokenize(fields.get(field)):
+            terms[t] += weight
+    return terms
+
+
+class InvertedIndex:
+    """Índice invertido com BM25; documentos identificados pelo id da manifestação."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._docno: dict[str, int] = {}  # id → docno vigente
+        self._ids: list[str | None] = []  # docno → id (None = morto)
+        self._alive = bytearray()  # docno → 1 vivo / 0 morto
+        self._lens = array("I")  # docno → comprimento ponderado
+        self._postings: dict[str, array] = {}
+        self._total_len = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._docno)
+
+    def _drop(self, doc_id: str) -> None:
+        docno = self._docno.pop(doc_id, None)
+        if docno is not None:
+            self._ids[docno] = None
+            self._alive[docno] = 0
+            self._total_len -= self._lens[docno]
+            self._dead += 1
+
+    def _add(self, doc_id: str, terms: Counter) -> None:
+        if not terms:
+            return
+        docno = len(self._ids)
+        self._ids.append(doc_id)
+        self._alive.append(1)
+        length = sum(terms.values())
+        self._lens.append(length)
+        self._total_len += length
+        self._docno[doc_id] = docno
+        for t, tf in terms.items():
+            postings = self._postings.get(t)
+            if postings is None:
+                postings = self._postings[t] = array("Q")
+            postings.append(docno << 16 | min(tf, _TF_MAX))
+
+    def upsert(self, doc_id: str, fields: dict[str, str | None]) -> None:
+        """Indexa (ou reindexa) o documento com os campos de FIELD_WEIGHTS."""
+        terms = _weighted_terms(fields)  # fora do lock
+        with self._lock:
+            self._drop(doc_id)
+            self._add(doc_id, terms)
+            self._maybe_compact()
+
+    def upsert_many(self, docs: list[tuple[str, dict[str, str | None]]]) -> None:
+        prepared = [(doc_id, _weighted_terms(fields)) for doc_id, fields in docs]
+        with self._lock:
+            for doc_id, terms in prepared:
+                self._drop(doc_id)
+                self._add(doc_id, terms)
+            self._maybe_compact()
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._drop(doc_id)
+            self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if self._dead < 10_000 or self._dead < len(self._docno):
+            return
+        remap = array("q", [-1]) * len(self._ids)
+        ids: list[str | None] = []
+        lens = array("I")
+        for old, doc_id in enumerate(self._ids):
+            if doc_id is not None:
+                remap[old] = len(ids)
+                ids.append(doc_id)
+                lens.append(self._lens[old])
+        postings: dict[str, array] = {}
+        for t, entries in self._postings.items():
+            kept = array("Q")
+            for e in entries:
+                new = remap[e >> 16]
+                if new >= 0:
+                    kept.append(new << 16 | (e & _TF_MAX))
+            if kept:
+                postings[t] = kept
+        self._ids, self._lens, self._postings, self._dead = ids, lens, postings, 0
+        self._alive = bytearray(b"\x01") * len(ids)
+        self._docno = {doc_id: n for n, doc_id in enumerate(ids)}
+
+    def search(self, query: str, limit: int, offset: int = 0) -> tuple[int, list[tuple[str, float]]]:
+        """(total de documentos que casam, [(id, score)] da página), do mais relevante ao menos."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._docno)
+            if not terms or not n_docs:
+                return 0, []
+            lists = [self._postings[t] for t in terms if t in self._postings]
+            if not lists:
+                return 0, []
+            scorer = self._score_numpy if np is not None else self._score_python
+            total, top = scorer(lists, n_docs, offset + limit)
+            return total, [(self._ids[docno], score) for docno, score in top[offset:]]
+
+    def _idf(self, df: int, n_docs: int) -> float:
+        # df inclui entradas mortas ainda não compactadas (aproximação).
+        return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+    def _score_python(self, lists: list[array], n_docs: int, k: int) -> tuple[int, list[tuple[int, float]]]:
+        avgdl = self._total_len / n_docs
+        alive, lens = self._alive, self._lens
+        scores: dict[int, float] = {}
+        for entries in lists:
+            idf = self._idf(len(entries), n_docs)
+            for e in entries:
+                docno = e >> 16
+                if not alive[docno]:
+                    continue
+                tf = e & _TF_MAX
+                norm = _K1 * (1 - _B + _B * lens[docno] / avgdl)
+                scores[docno] = scores.get(docno, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+        # Empate: docno maior (indexado/atualizado mais recentemente) primeiro.
+        return len(scores), heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], kv[0]))
+
+    def _score_numpy(self, lists: list[array], n_docs: int, k: int) -> tuple[int, list[tuple[int, float]]]:
+        avgdl = self._total_len / n_docs
+        alive = np.frombuffer(self._alive, dtype=np.uint8)
+        lens = np.frombuffer(self._lens, dtype=np.uint32)
+        docnos_parts, scores_parts = [], []
+        for entries in lists:
+            e = np.frombuffer(entries, dtype=np.uint64)
+            docnos = (e >> np.uint64(16)).astype(np.int64)
+            keep = alive[docnos].astype(bool)
+            docnos = docnos[keep]
+            tf = (e[keep] & np.uint64(_TF_MAX)).astype(np.float64)
+            norm = _K1 * (1 - _B + _B * lens[docnos] / avgdl)
+            docnos_parts.append(docnos)
+            scores_parts.append(self._idf(len(entries), n_docs) * tf * (_K1 + 1) / (tf + norm))
+        docnos = np.concatenate(docnos_parts)
+        scores = np.concatenate(scores_parts)
+        if len(docnos_parts) > 1:
+            # Soma por documento: acumulador denso por docno (O(entradas + docs), sem sort).
+            acc = np.bincount(docnos, weights=scores, minlength=len(alive))
+            docnos = np.flatnonzero(acc)  # BM25 > 0 para todo termo presente
+            scores = acc[docnos]
+        total = len(docnos)
+        if total > k:
+            # Corte no k-ésimo score, mantendo os empatados nele (desempate determinístico abaixo).
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            keep = scores >= kth
+            docnos, scores = docnos[keep], scores[keep]
+        # Empate: docno maior (indexado/atualizado mais recentemente) primeiro.
+        order = np.lexsort((-docnos, -scores))[:k]
+        return total, [(int(docnos[i]), float(scores[i])) for i in order]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._docno),
+                "dead": self._dead,
+                "terms": len(self._postings),
+                "postings_bytes": sum(a.itemsize * len(a) for a in self._postings.values()),
+            }
@@ -0,0 +1,94 @@
+"""
+Interface assíncrona do storage local (backend "local", ver backend.py).
+Todas as operações de disco rodam no pool dedicado (io_pool), nunca no event loop.
+LocalStorage continua disponível como API síncrona (jobs, scripts).
+"""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app.infrastructure.storage.io_pool import run_io
+from app.infrastructure.storage.local_storage import LocalStorage
+from app.infrastructure.storage.segments import pread
+
+CHUNK_SIZE = 256 * 1024
+
+
+class AsyncLocalStorage:
+    """Storage local com API async: save, open_stream, exists, size, delete."""
+
+    def __init__(self, sync: LocalStorage | None = None) -> None:
+        self.sync = sync or LocalStorage()
+
+    def full_path(self, relative_path: str) -> Path:
+        """Path absoluto (só cálculo, sem I/O)."""
+        return self.sync.full_path(relative_path)
+
+    def is_packed(self, relative_path: str) -> bool:
+        """True se o anexo está em segmento (não há arquivo avulso para sendfile/proxy)."""
+        return self.sync.is_packed(relative_path)
+
+    def local_path(self, relative_path: str) -> Path | None:
+        """Arquivo avulso no disco; None para empacotados."""
+        if self.is_packed(relative_path):
+            return None
+        return self.sync.full_path(relative_path)
+
+    async def save(
+        self,
+        manifestation_id: str,
+        attachment_id: str,
+        content: bytes,
+        extension: str,
+    ) -> str:
+        """Salva arquivo e retorna path relativo. Ver LocalStorage.save."""
+        return await run_io(self.sync.save, manifestation_id, attachment_id, content, extension)
+
+    async def save_many(
+        self,
+        manifestation_id: str,
+        items: list[tuple[str, bytes, str]],
+    ) -> list[str]:
+        """Salva vários arquivos com um ciclo de durabilidade. Ver LocalStorage.save_many."""
+        return await run_io(self.sync.save_many, manifestation_id, items)
+
+    async def resolve(self, relative_path: str) -> str:
+        """Path relativo efetivo (resolve os dois layouts durante migração)."""
+        return await run_io(self.sync.resolve, relative_path)
+
+    async def exists(self, relative_path: str) -> bool:
+        return await run_io(self.sync.exists, relative_path)
+
+    async def size(self, relative_path: str) -> int | None:
+        """Tamanho em bytes ou None se o arquivo não existir."""
+        return await run_io(self.sync.size, relative_path)
+
+    async def delete(self, relative_path: str) -> bool:
+        """Remove o arquivo. Retorna False se já não existia."""
+        return await run_io(self.sync.delete, relative_path)
+
+    async def read_bytes(self, relative_path: str) -> bytes:
+        return await run_io(self.sync.read_bytes, relative_path)
+
+    async def open_stream(
+        self,
+        relative_path: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Lê o intervalo [start, end] (inclusivo; end=None até o fim) em blocos."""
+        f, base, length = await run_io(self.sync.open_region, relative_path)
+        if length is not None:
+            end = length - 1 if end is None else min(end, length - 1)
+        try:
+            pos = start
+            while end is None or pos <= end:
+                n = chunk_size if end is None else min(chunk_size, end - pos + 1)
+                chunk = await run_io(pread, f, n, base + pos)
+                if not chunk:
+                    break
+                pos += len(chunk)
+                yield chunk
+        finally:
+            await run_io(f.close)
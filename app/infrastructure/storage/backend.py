@@ -0,0 +1,98 @@
+"""
+Contrato do backend de storage e seleção via Settings (STORAGE_BACKEND).
+- local: AsyncLocalStorage (disco compartilhado; padrão).
+- s3: S3Storage (qualquer serviço compatível com S3; permite escalar API horizontalmente).
+
+Paths relativos ({manifestation_dir}/{attachment_id}.{ext}) são os mesmos em todos os
+backends: AttachmentModel.file_path não depende de onde os bytes estão.
+"""
+
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+
+from app.core.config import get_settings
+from app.infrastructure.storage.io_pool import run_io
+
+
+class StorageBackend(Protocol):
+    """Operações assíncronas de storage usadas pela API e pelos use cases."""
+
+    def local_path(self, relative_path: str) -> Path | None:
+        """Arquivo avulso no disco local (sendfile/proxy/extração), ou None."""
+        ...
+
+    async def save_many(
+        self,
+        manifestation_id: str,
+        items: list[tuple[str, bytes, str]],
+    ) -> list[str]:
+        """Salva (attachment_id, content, extension); retorna paths relativos na mesma ordem."""
+        ...
+
+    async def resolve(self, relative_path: str) -> str: ...
+
+    async def exists(self, relative_path: str) -> bool: ...
+
+    async def size(self, relative_path: str) -> int | None: ...
+
+    async def delete(self, relative_path: str) -> bool: ...
+
+    async def read_bytes(self, relative_path: str) -> bytes: ...
+
+    def open_stream(
+        self,
+        relative_path: str,
+        start: int = 0,
+        end: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Lê o intervalo [start, end] (inclusivo; end=None até o fim) em blocos."""
+        ...
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """Backend configurado (instância única por processo: reaproveita pool de conexões)."""
+    cfg = get_settings()
+    if cfg.storage_backend == "s3":
+        from app.infrastructure.storage.s3_storage import S3Storage
+
+        return S3Storage()
+    from app.infrastructure.storage.async_storage import AsyncLocalStorage
+
+    return AsyncLocalStorage()
+
+
+def _write_temp(content: bytes, suffix: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    return path
+
+
+@asynccontextmanager
+async def local_file(
+    storage: StorageBackend,
+    relative_path: str,
+    content: bytes | None = None,
+) -> AsyncIterator[str]:
+    """
+    Path local para ferramentas que só leem de arquivo (OCR, Whisper, ffmpeg).
+    Usa o arquivo do backend quando existe; senão grava cópia temporária
+    (de content, se já em memória, ou baixada do backend) e remove ao sair.
+    """
+    path = storage.local_path(relative_path)
+    if path is not None:
+        yield str(path)
+        return
+    if content is None:
+        content = await storage.read_bytes(relative_path)
+    tmp = await run_io(_write_temp, content, Path(relative_path).suffix)
+    try:
+        yield tmp
+    finally:
+        await run_io(os.unlink, tmp)
@@ -0,0 +1,41 @@
+"""
+Pool de threads dedicado ao I/O de storage.
+Separado do executor padrão (usado pela mídia: OCR, Whisper, ffmpeg) para que
+extrações longas não atrasem gravações/leituras e um fsync lento não bloqueie
+o event loop.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Executor do storage (criado sob demanda, tamanho limitado por configuração)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().storage_io_workers,
+            thread_name_prefix="storage-io",
+        )
+    return _executor
+
+
+async def run_io(func: Callable[..., T], *args: Any) -> T:
+    """Executa operação de I/O bloqueante no pool do storage."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), func, *args)
+
+
+def shutdown_io_executor() -> None:
+    """Encerra o pool (shutdown da aplicação)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -1,27 +1,106 @@
 """
 Storage local de arquivos.
-Salva em uploads/{manifestation_id}/{attachment_id}.{ext}
+Layout (STORAGE_LAYOUT):
+- flat: uploads/{manifestation_id}/{attachment_id}.{ext}
+- sharded: uploads/{ab}/{cd}/{manifestation_id}/{attachment_id}.{ext}, com ab/cd
+  derivados do hash do id (distribuição uniforme mesmo com ids ordenados no tempo).
+Leituras resolvem os dois layouts (migração online: app.jobs.migrate_storage_layout).
+Anexos frios podem estar empacotados em segmentos (ver segments.py); leituras
+tratam os dois casos de forma transparente.
 Compatível com draft (sem protocolo) e manifestações finalizadas.
 Nunca expõe caminhos internos; acesso via API.
+
+Durabilidade (STORAGE_DURABILITY):
+- none: sem fsync (confia no page cache; rápido, pode perder dados em queda de energia).
+- file: fsync de cada arquivo ao gravar + fsync do diretório.
+- group: grava todos os arquivos do upload, depois fsync de todos em sequência
+  e um único fsync do diretório (group commit), antes do commit no banco.
 """
 
+import hashlib
+import os
 from pathlib import Path
+from typing import BinaryIO
 
 from app.core.config import get_settings
+from app.infrastructure.storage.segments import parse_packed, pread, read_packed
+
+
+def _fsync_file(f: BinaryIO) -> None:
+    try:
+        os.fsync(f.fileno())
+    except (OSError, AttributeError):
+        pass
+
+
+def _fsync_dir(path: Path) -> None:
+    """fsync da entrada de diretório (POSIX). Ignorado onde não suportado (Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _make_dirs(path: Path) -> list[Path]:
+    """mkdir -p que devolve os diretórios criados agora (do mais alto ao mais fundo)."""
+    missing: list[Path] = []
+    p = path
+    while not p.is_dir():
+        missing.append(p)
+        p = p.parent
+    created: list[Path] = []
+    for d in reversed(missing):
+        try:
+            d.mkdir()
+        except FileExistsError:
+            continue  # criado por outro pedido em paralelo
+        created.append(d)
+    return created
+
+
+def shard_prefix(manifestation_id: str) -> str:
+    """Prefixo de shard 'ab/cd' derivado do id."""
+    h = hashlib.sha1(manifestation_id.encode("utf-8")).hexdigest()
+    return f"{h[:2]}/{h[2:4]}"
+
+
+def manifestation_rel_dir(manifestation_id: str, layout: str) -> str:
+    """Diretório relativo da manifestação no layout informado."""
+    if layout == "sharded":
+        return f"{shard_prefix(manifestation_id)}/{manifestation_id}"
+    return manifestation_id
+
+
+def alternate_layout_path(relative_path: str) -> str | None:
+    """Mesmo arquivo no outro layout (flat <-> sharded), ou None se o path não segue nenhum."""
+    parts = relative_path.split("/")
+    if len(parts) == 2:
+        return f"{shard_prefix(parts[0])}/{relative_path}"
+    if len(parts) == 4 and f"{parts[0]}/{parts[1]}" == shard_prefix(parts[2]):
+        return f"{parts[2]}/{parts[3]}"
+    return None
 
 
 class LocalStorage:
     """Armazena e recupera arquivos no disco local."""
 
     def __init__(self) -> None:
-        base = get_settings().uploads_dir
+        settings = get_settings()
+        base = settings.uploads_dir
         self._base = base.resolve() if isinstance(base, Path) else Path(base).resolve()
+        self._durability = settings.storage_durability
+        self._layout = settings.storage_layout
 
-    def _manifestation_dir(self, manifestation_id: str) -> Path:
-        """Diretório da manifestação: uploads/{manifestation_id}/."""
-        d = self._base / manifestation_id
-        d.mkdir(parents=True, exist_ok=True)
-        return d
+    def _manifestation_dir(self, manifestation_id: str) -> tuple[Path, list[Path]]:
+        """Diretório da manifestação conforme o layout (criado se preciso) e os diretórios criados agora."""
+        d = self._base / manifestation_rel_dir(manifestation_id, self._layout)
+        return d, _make_dirs(d)
 
     def save(
         self,
@@ -32,39 +111,125 @@ class LocalStorage:
     ) -> str:
         """
         Salva arquivo e retorna path relativo (para persistir no banco).
-        Formato: {manifestation_id}/{attachment_id}.{ext}
-        Garante que o arquivo foi escrito no disco antes de retornar.
+        Formato: [{ab}/{cd}/]{manifestation_id}/{attachment_id}.{ext}
+        """
+        return self.save_many(manifestation_id, [(attachment_id, content, extension)])[0]
+
+    def save_many(
+        self,
+        manifestation_id: str,
+        items: list[tuple[str, bytes, str]],
+    ) -> list[str]:
         """
-        directory = self._manifestation_dir(manifestation_id)
-        ext = extension.lstrip(".")
-        filename = f"{attachment_id}.{ext}"
-        path = directory / filename
-        
-        with path.open("wb") as f:
-            f.write(content)
-            f.flush()
-            import os
-            try:
-                os.fsync(f.fileno())
-            except (OSError, AttributeError):
-                pass
-        
-        if not path.exists():
-            raise RuntimeError(f"Arquivo não foi salvo: {path}")
-        
-        if path.stat().st_size != len(content):
-            raise RuntimeError(f"Arquivo salvo com tamanho incorreto: esperado {len(content)}, obtido {path.stat().st_size}")
-        
-        return f"{manifestation_id}/{filename}"
+        Salva vários arquivos (attachment_id, content, extension) da mesma manifestação.
+        Retorna paths relativos na mesma ordem. Aplica o modo de durabilidade configurado;
+        ao retornar, os arquivos estão duráveis conforme o modo (antes do commit no banco).
+        """
+        if not items:
+            return []
+        directory, created = self._manifestation_dir(manifestation_id)
+        rel_dir = manifestation_rel_dir(manifestation_id, self._layout)
+        rel_paths: list[str] = []
+        pending: list[BinaryIO] = []
+        try:
+            for attachment_id, content, extension in items:
+                filename = f"{attachment_id}.{extension.lstrip('.')}"
+                f = (directory / filename).open("wb")
+                pending.append(f)
+                written = f.write(content)
+                if written != len(content):
+                    raise RuntimeError(
+                        f"Arquivo salvo com tamanho incorreto: esperado {len(content)}, obtido {written}"
+                    )
+                f.flush()
+                if self._durability == "file":
+                    _fsync_file(f)
+                rel_paths.append(f"{rel_dir}/{filename}")
+            if self._durability == "group":
+                for f in pending:
+                    _fsync_file(f)
+        finally:
+            for f in pending:
+                f.close()
+        if self._durability != "none":
+            _fsync_dir(directory)
+            # Diretórios recém-criados (manifestação, shards): a entrada de cada um vive no pai.
+            for d in reversed(created):
+                _fsync_dir(d.parent)
+        return rel_paths
 
     def full_path(self, relative_path: str) -> Path:
-        """Path absoluto do arquivo a partir do path relativo armazenado."""
+        """Path absoluto do arquivo a partir do path relativo armazenado (sem I/O)."""
         return self._base / relative_path
 
+    def is_packed(self, relative_path: str) -> bool:
+        """True se o anexo está empacotado em segmento (sem I/O)."""
+        return parse_packed(relative_path) is not None
+
+    def resolve(self, relative_path: str) -> str:
+        """
+        Path relativo onde o arquivo está de fato.
+        Durante a migração de layout, tenta o path armazenado e depois o do outro layout.
+        """
+        if self.is_packed(relative_path) or self.full_path(relative_path).exists():
+            return relative_path
+        alt = alternate_layout_path(relative_path)
+        if alt is not None and self.full_path(alt).exists():
+            return alt
+        return relative_path
+
+    def locate(self, relative_path: str) -> Path:
+        """Path absoluto resolvido (ver resolve). Para empacotados, o arquivo do segmento."""
+        ref = parse_packed(relative_path)
+        if ref is not None:
+            return self.full_path(ref.segment_path)
+        return self.full_path(self.resolve(relative_path))
+
     def exists(self, relative_path: str) -> bool:
         """Verifica se o arquivo existe."""
-        return self.full_path(relative_path).exists()
+        return self.locate(relative_path).exists()
+
+    def size(self, relative_path: str) -> int | None:
+        """Tamanho do arquivo em bytes ou None se não existir."""
+        try:
+            st = self.locate(relative_path).stat()
+        except FileNotFoundError:
+            return None
+        ref = parse_packed(relative_path)
+        return ref.length if ref is not None else st.st_size
+
+    def delete(self, relative_path: str) -> bool:
+        """
+        Remove o arquivo (e o diretório da manifestação, se ficar vazio).
+        Empacotados não são removidos: segmentos são append-only.
+        """
+        if self.is_packed(relative_path):
+            return False
+        path = self.locate(relative_path)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        try:
+            path.parent.rmdir()
+        except OSError:
+            pass
+        return True
 
     def read_bytes(self, relative_path: str) -> bytes:
         """Lê conteúdo do arquivo."""
-        return self.full_path(relative_path).read_bytes()
+        ref = parse_packed(relative_path)
+        if ref is not None:
+            return read_packed(self._base, ref)
+        return self.locate(relative_path).read_bytes()
+
+    def open_region(self, relative_path: str) -> tuple[BinaryIO, int, int | None]:
+        """
+        Abre o arquivo para leitura posicional.
+        Retorna (arquivo, offset base, tamanho ou None = até o fim).
+        """
+        ref = parse_packed(relative_path)
+        f = self.locate(relative_path).open("rb")
+        if ref is not None:
+            return f, ref.offset, ref.length
+        return f, 0, None
@@ -0,0 +1,186 @@
+"""
+Storage em serviço compatível com S3 (AWS S3, MinIO, Ceph RGW...).
+Dependência opcional: boto3 (pip install boto3). Chamadas bloqueantes do boto3
+rodam no pool de I/O do storage; o client é único por processo (thread-safe) e
+mantém pool de conexões (S3_MAX_POOL_CONNECTIONS).
+
+Objetos: s3://{S3_BUCKET}/{S3_PREFIX}{path relativo}. Arquivos acima de
+S3_MULTIPART_THRESHOLD_BYTES sobem em multipart (partes de S3_MULTIPART_PART_BYTES).
+Leituras parciais usam GET com Range. S3_ENDPOINT_URL aponta para um serviço
+local (ex.: MinIO ou moto server) para rodar sem acesso à AWS.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.infrastructure.storage.io_pool import run_io
+from app.infrastructure.storage.local_storage import manifestation_rel_dir
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+_MIN_PART_BYTES = 5 * 1024 * 1024  # mínimo do S3 para partes (exceto a última)
+
+
+def _is_not_found(exc: Exception) -> bool:
+    code = str(getattr(exc, "response", {}).get("Error", {}).get("Code", ""))
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage:
+    """Backend S3 com API async equivalente a AsyncLocalStorage."""
+
+    def __init__(self) -> None:
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=s3 requer boto3 (pip install boto3).") from e
+        cfg = get_settings()
+        if not cfg.s3_bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requer S3_BUCKET.")
+        self._bucket = cfg.s3_bucket
+        self._prefix = cfg.s3_prefix
+        self._layout = cfg.storage_layout
+        self._threshold = cfg.s3_multipart_threshold_bytes
+        self._part_size = max(cfg.s3_multipart_part_bytes, _MIN_PART_BYTES)
+        self._client = boto3.session.Session().client(
+            "s3",
+            endpoint_url=cfg.s3_endpoint_url,
+            region_name=cfg.s3_region,
+            aws_access_key_id=cfg.s3_access_key_id,
+            aws_secret_access_key=cfg.s3_secret_access_key,
+            config=Config(
+                max_pool_connections=cfg.s3_max_pool_connections,
+                retries={"max_attempts": 5, "mode": "standard"},
+            ),
+        )
+
+    def _key(self, relative_path: str) -> str:
+        return self._prefix + relative_path
+
+    def local_path(self, relative_path: str) -> Path | None:
+        """Objetos remotos não têm arquivo local."""
+        return None
+
+    def _upload(self, key: str, content: bytes) -> None:
+        if len(content) <= self._threshold:
+            self._client.put_object(Bucket=self._bucket, Key=key, Body=content)
+            return
+        upload_id = self._client.create_multipart_upload(Bucket=self._bucket, Key=key)["UploadId"]
+        try:
+            view = memoryview(content)
+            parts = []
+            for number, pos in enumerate(range(0, len(content), self._part_size), start=1):
+                r = self._client.upload_part(
+                    Bucket=self._bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=bytes(view[pos : pos + self._part_size]),
+                )
+                parts.append({"PartNumber": number, "ETag": r["ETag"]})
+            self._client.complete_multipart_upload(
+                Bucket=self._bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            self._client.abort_multipart_upload(Bucket=self._bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def save(
+        self,
+        manifestation_id: str,
+        attachment_id: str,
+        content: bytes,
+        extension: str,
+    ) -> str:
+        return (await self.save_many(manifestation_id, [(attachment_id, content, extension)]))[0]
+
+    async def save_many(
+        self,
+        manifestation_id: str,
+        items: list[tuple[str, bytes, str]],
+    ) -> list[str]:
+        """Envia os arquivos em paralelo. PUT/multipart concluído = objeto durável."""
+        rel_dir = manifestation_rel_dir(manifestation_id, self._layout)
+        rel_paths = [f"{rel_dir}/{att_id}.{ext.lstrip('.')}" for att_id, _, ext in items]
+        await asyncio.gather(
+            *(run_io(self._upload, self._key(rel), content) for rel, (_, content, _) in zip(rel_paths, items))
+        )
+        return rel_paths
+
+    async def resolve(self, relative_path: str) -> str:
+        """Sem layouts alternativos no bucket: o path armazenado é o efetivo."""
+        return relative_path
+
+    def _head(self, relative_path: str) -> dict | None:
+        try:
+            return self._client.head_object(Bucket=self._bucket, Key=self._key(relative_path))
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+
+    async def exists(self, relative_path: str) -> bool:
+        return await run_io(self._head, relative_path) is not None
+
+    async def size(self, relative_path: str) -> int | None:
+        """Tamanho em bytes ou None se o objeto não existir."""
+        head = await run_io(self._head, relative_path)
+        return None if head is None else int(head["ContentLength"])
+
+    def _delete(self, relative_path: str) -> None:
+        self._client.delete_object(Bucket=self._bucket, Key=self._key(relative_path))
+
+    async def delete(self, relative_path: str) -> bool:
+        """Remove o objeto. Retorna False se já não existia."""
+        if not await self.exists(relative_path):
+            return False
+        await run_io(self._delete, relative_path)
+        return True
+
+    def _get(self, relative_path: str, byte_range: str | None = None):
+        kwargs = {"Bucket": self._bucket, "Key": self._key(relative_path)}
+        if byte_range:
+            kwargs["Range"] = byte_range
+        try:
+            return self._client.get_object(**kwargs)["Body"]
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(relative_path) from e
+            raise
+
+    def _read_all(self, relative_path: str) -> bytes:
+        body = self._get(relative_path)
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    async def read_bytes(self, relative_path: str) -> bytes:
+        return await run_io(self._read_all, relative_path)
+
+    async def open_stream(
+        self,
+        relative_path: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """GET com Range; o corpo é lido em blocos sem carregar o objeto inteiro."""
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        body = await run_io(self._get, relative_path, byte_range)
+        try:
+            while True:
+                chunk = await run_io(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await run_io(body.close)
@@ -0,0 +1,126 @@
+"""
+Segmentos append-only para anexos frios (pequenos e antigos).
+Muitos arquivos pequenos são empacotados em poucos arquivos grandes em
+uploads/_segments/, reduzindo inodes e I/O de metadados em backup/replicação.
+
+O índice fica no banco: AttachmentModel.file_path de um anexo empacotado é
+'_segments/{segmento}@{offset}+{tamanho}'. Leitura direta com mmap/pread.
+Diretórios com prefixo '_' em uploads/ são internos (não são manifestações).
+"""
+
+import mmap
+import os
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+SEGMENTS_DIR = "_segments"
+_PREFIX = SEGMENTS_DIR + "/"
+
+
+@dataclass(frozen=True)
+class PackedRef:
+    """Localização de um anexo dentro de um segmento."""
+
+    segment: str
+    offset: int
+    length: int
+
+    @property
+    def segment_path(self) -> str:
+        """Path relativo do arquivo de segmento."""
+        return _PREFIX + self.segment
+
+    def to_path(self) -> str:
+        """Representação persistida em AttachmentModel.file_path."""
+        return f"{_PREFIX}{self.segment}@{self.offset}+{self.length}"
+
+
+def parse_packed(relative_path: str) -> PackedRef | None:
+    """Interpreta file_path de anexo empacotado; None se for arquivo avulso."""
+    if not relative_path.startswith(_PREFIX):
+        return None
+    name, _, loc = relative_path[len(_PREFIX):].partition("@")
+    offset, _, length = loc.partition("+")
+    try:
+        return PackedRef(segment=name, offset=int(offset), length=int(length))
+    except ValueError:
+        return None
+
+
+def pread(f: BinaryIO, n: int, offset: int) -> bytes:
+    """Leitura posicional (os.pread no POSIX; seek+read no Windows)."""
+    if hasattr(os, "pread"):
+        return os.pread(f.fileno(), n, offset)
+    f.seek(offset)
+    return f.read(n)
+
+
+def read_packed(base: Path, ref: PackedRef) -> bytes:
+    """Lê o anexo inteiro do segmento via mmap."""
+    with (base / ref.segment_path).open("rb") as f:
+        if ref.length == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[ref.offset : ref.offset + ref.length]
+
+
+class SegmentWriter:
+    """
+    Escreve anexos em segmentos append-only, abrindo um novo ao atingir max_bytes.
+    Chame sync() antes de gravar no banco os PackedRef devolvidos por append().
+    """
+
+    def __init__(self, base: Path, max_bytes: int) -> None:
+        self._dir = base / SEGMENTS_DIR
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._file: BinaryIO | None = None
+        self._name = ""
+        self._size = 0
+        self._open: list[BinaryIO] = []
+
+    def _roll(self) -> None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        self._name = f"seg-{stamp}-{secrets.token_hex(4)}.pack"
+        self._file = (self._dir / self._name).open("ab")
+        self._size = 0
+        self._open.append(self._file)
+
+    def append(self, content: bytes) -> PackedRef:
+        """Acrescenta conteúdo ao segmento corrente."""
+        if self._file is None or (self._size and self._size + len(content) > self._max_bytes):
+            self._roll()
+        assert self._file is not None
+        offset = self._size
+        self._file.write(content)
+        self._size += len(content)
+        return PackedRef(segment=self._name, offset=offset, length=len(content))
+
+    def sync(self) -> None:
+        """Flush + fsync dos segmentos tocados e do diretório; fecha os já encerrados."""
+        for f in self._open:
+            f.flush()
+            os.fsync(f.fileno())
+        for f in self._open:
+            if f is not self._file:
+                f.close()
+        self._open = [self._file] if self._file is not None else []
+        try:
+            fd = os.open(self._dir, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        for f in self._open:
+            f.close()
+        self._open = []
+        self._file = None
@@ -0,0 +1,215 @@
+"""
+Área de staging de uploads retomáveis (estilo tus) em uploads/_staging/.
+Cada upload tem {id}.part (bytes recebidos; o tamanho do arquivo é o offset atual)
+e {id}.json (manifestação, tamanho total, tipo e nome). Finalizado, fica só {id}.json
+e {id}.done até expirar: quem perdeu a resposta do último PATCH consulta (HEAD) e vê
+Upload-Offset == Upload-Length em vez de 404 (e não reenvia o arquivo). Operações síncronas: chamar
+via run_io. O staging é sempre local: com várias instâncias, os PATCH de um upload
+precisam chegar à mesma instância (afinidade no balanceador).
+"""
+
+import json
+import os
+import secrets
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from app.core.config import get_settings
+
+STAGING_DIR = "_staging"
+
+
+class OffsetMismatch(Exception):
+    """Upload-Offset do pedido difere do offset atual."""
+
+    def __init__(self, current: int) -> None:
+        super().__init__(f"offset atual: {current}")
+        self.current = current
+
+
+class UploadTooLarge(Exception):
+    """Chunk ultrapassa o Upload-Length declarado."""
+
+
+@dataclass(frozen=True)
+class StagedUpload:
+    """Upload em andamento."""
+
+    id: str
+    manifestation_id: str
+    length: int
+    mime_type: str
+    filename: str
+    created_at: float
+    offset: int = 0
+    updated_at: float = 0.0
+    finished: bool = False  # anexo já criado (registro .done)
+
+    @property
+    def complete(self) -> bool:
+        return self.offset >= self.length
+
+
+class UploadStaging:
+    """Arquivos parciais de uploads retomáveis."""
+
+    def __init__(self, base: Path | None = None) -> None:
+        root = base or get_settings().uploads_dir
+        self._dir = Path(root).resolve() / STAGING_DIR
+
+    def _part(self, upload_id: str) -> Path:
+        return self._dir / f"{upload_id}.part"
+
+    def _meta(self, upload_id: str) -> Path:
+        return self._dir / f"{upload_id}.json"
+
+    def _claimed(self, upload_id: str) -> Path:
+        return self._dir / f"{upload_id}.claimed"
+
+    def _done(self, upload_id: str) -> Path:
+        return self._dir / f"{upload_id}.done"
+
+    def _files(self, upload_id: str) -> tuple[Path, ...]:
+        return (
+            self._part(upload_id),
+            self._meta(upload_id),
+            self._claimed(upload_id),
+            self._done(upload_id),
+            self._dir / f"{upload_id}.tmp",
+        )
+
+    def create(self, manifestation_id: str, length: int, mime_type: str, filename: str) -> StagedUpload:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        upload_id = secrets.token_hex(16)
+        now = time.time()
+        up = StagedUpload(upload_id, manifestation_id, length, mime_type, filename, created_at=now, updated_at=now)
+        meta = {k: v for k, v in asdict(up).items() if k not in ("offset", "updated_at", "finished")}
+        self._part(upload_id).touch()
+        tmp = self._dir / f"{upload_id}.tmp"
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self._meta(upload_id))
+        return up
+
+    def get(self, upload_id: str) -> StagedUpload | None:
+        """Upload com offset atual (em finalização ou finalizado: completo), ou None se não existe (ou expirou)."""
+        if not upload_id.isalnum():
+            return None
+        try:
+            meta = json.loads(self._meta(upload_id).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        for path in (self._part(upload_id), self._claimed(upload_id)):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            return StagedUpload(**meta, offset=st.st_size, updated_at=st.st_mtime)
+        try:
+            st = self._done(upload_id).stat()
+        except FileNotFoundError:
+            return None
+        return StagedUpload(**meta, offset=meta["length"], updated_at=st.st_mtime, finished=True)
+
+    def append(self, upload_id: str, offset: int, data: bytes) -> int:
+        """
+        Grava data na posição offset, que deve ser o fim atual do arquivo.
+        Retorna o novo offset. Lock exclusivo (POSIX) contra PATCH concorrentes.
+        """
+        up = self.get(upload_id)
+        if up is None:
+            raise FileNotFoundError(upload_id)
+        with self._part(upload_id).open("r+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            current = os.fstat(f.fileno()).st_size
+            if offset != current:
+                raise OffsetMismatch(current)
+            if current + len(data) > up.length:
+                raise UploadTooLarge()
+            f.seek(current)
+            f.write(data)
+            f.flush()
+            return current + len(data)
+
+    def claim(self, upload_id: str) -> bytes | None:
+        """
+        Reserva o upload completo para finalização (rename atômico de .part) e lê os bytes.
+        None se outro pedido já reservou: garante um único add_attachments por upload.
+        """
+        claimed = self._claimed(upload_id)
+        try:
+            os.rename(self._part(upload_id), claimed)
+        except FileNotFoundError:
+            return None
+        return claimed.read_bytes()
+
+    def release(self, upload_id: str) -> None:
+        """Desfaz claim() após falha inesperada (o cliente pode tentar finalizar de novo)."""
+        try:
+            os.replace(self._claimed(upload_id), self._part(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def finish(self, upload_id: str) -> None:
+        """Após o commit do anexo: descarta os bytes e mantém o registro de conclusão até expirar."""
+        self._done(upload_id).touch()
+        for p in (self._claimed(upload_id), self._dir / f"{upload_id}.tmp"):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def delete(self, upload_id: str) -> bool:
+        removed = False
+        for p in self._files(upload_id):
+            try:
+                p.unlink()
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def active_manifestation_ids(self, ttl_seconds: float) -> set[str]:
+        """Manifestações com upload ainda não finalizado e com atividade há menos de ttl_seconds."""
+        if not self._dir.is_dir():
+            return set()
+        cutoff = time.time() - ttl_seconds
+        out: set[str] = set()
+        for p in self._dir.glob("*.json"):
+            up = self.get(p.stem)
+            if up is not None and not up.finished and up.updated_at >= cutoff:
+                out.add(up.manifestation_id)
+        return out
+
+    def expire(self, ttl_seconds: float, dry_run: bool = False) -> tuple[int, int]:
+        """Remove uploads sem atividade há mais de ttl_seconds. Retorna (uploads, bytes)."""
+        if not self._dir.is_dir():
+            return 0, 0
+        cutoff = time.time() - ttl_seconds
+        count = size = 0
+        upload_ids = {
+            p.stem for p in self._dir.iterdir() if p.suffix in (".part", ".json", ".claimed", ".done", ".tmp")
+        }
+        for upload_id in sorted(upload_ids):
+            last = 0.0
+            nbytes = 0
+            for p in self._files(upload_id):
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                last = max(last, st.st_mtime)
+                nbytes += st.st_size if p.suffix in (".part", ".claimed") else 0
+            if last >= cutoff:
+                continue
+            count += 1
+            size += nbytes
+            if not dry_run:
+                self.delete(upload_id)
+        return count, size
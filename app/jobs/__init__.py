@@ -0,0 +1 @@
+"""Jobs de manutenção (CLI: python -m app.jobs.<job>)."""
@@ -0,0 +1,118 @@
+"""
+Job: empacota anexos frios em segmentos append-only.
+
+    python -m app.jobs.compact_segments --older-than-days 30 --batch-size 500
+
+Seleciona anexos avulsos pequenos (<= SEGMENT_PACK_MAX_FILE_BYTES) de manifestações
+finalizadas criadas há mais de N dias, em lotes (keyset por id). Rascunhos ficam de
+fora: o GC os apaga, e os bytes de uma referência empacotada não são recuperados.
+Por lote: copia os bytes para o segmento corrente, fsync, reescreve file_path para a
+referência empacotada, commit e só então remove os arquivos avulsos. Se o job cair entre o commit e a
+remoção, sobram arquivos órfãos (limpos pelo reconciliador), nunca referências quebradas.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.core.config import get_settings
+from app.domain.enums import ManifestationStatus
+from app.infrastructure.db.models import AttachmentModel, ManifestationModel
+from app.infrastructure.db.session import session_scope
+from app.infrastructure.storage.io_pool import run_io, shutdown_io_executor
+from app.infrastructure.storage.local_storage import LocalStorage
+from app.infrastructure.storage.segments import SEGMENTS_DIR, SegmentWriter
+
+logger = logging.getLogger(__name__)
+
+
+def _pack_batch(storage: LocalStorage, writer: SegmentWriter, rows: list) -> list[tuple[str, str, str]]:
+    """Copia arquivos do lote para o segmento. Retorna (attachment_id, novo path, path antigo)."""
+    moved: list[tuple[str, str, str]] = []
+    for row in rows:
+        try:
+            content = storage.read_bytes(row.file_path)
+        except FileNotFoundError:
+            logger.warning("Compactação: arquivo ausente, ignorado: %s", row.file_path)
+            continue
+        if len(content) != row.size_bytes:
+            logger.warning("Compactação: tamanho divergente, ignorado: %s", row.file_path)
+            continue
+        ref = writer.append(content)
+        moved.append((row.id, ref.to_path(), row.file_path))
+    writer.sync()
+    return moved
+
+
+async def compact(older_than_days: int, batch_size: int, dry_run: bool) -> dict:
+    """Executa a compactação. Retorna contadores."""
+    cfg = get_settings()
+    storage = LocalStorage()
+    writer = SegmentWriter(storage.full_path(""), cfg.segment_max_bytes)
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    stats = {"packed": 0, "bytes": 0, "skipped": 0}
+    last_id = ""
+    try:
+        while True:
+            async with session_scope() as db:
+                q = (
+                    select(AttachmentModel.id, AttachmentModel.file_path, AttachmentModel.size_bytes)
+                    .join(ManifestationModel, AttachmentModel.manifestation_id == ManifestationModel.id)
+                    .where(
+                        AttachmentModel.id > last_id,
+                        ManifestationModel.created_at < cutoff,
+                        ManifestationModel.status != ManifestationStatus.DRAFT,
+                        AttachmentModel.size_bytes <= cfg.segment_pack_max_file_bytes,
+                        AttachmentModel.file_path.notlike(f"{SEGMENTS_DIR}/%"),
+                    )
+                    .order_by(AttachmentModel.id)
+                    .limit(batch_size)
+                )
+                rows = (await db.execute(q)).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                if dry_run:
+                    stats["packed"] += len(rows)
+                    stats["bytes"] += sum(r.size_bytes for r in rows)
+                    continue
+                moved = await run_io(_pack_batch, storage, writer, rows)
+                for att_id, new_path, _ in moved:
+                    await db.execute(
+                        update(AttachmentModel).where(AttachmentModel.id == att_id).values(file_path=new_path)
+                    )
+                stats["skipped"] += len(rows) - len(moved)
+            # Commit feito: agora é seguro remover os avulsos.
+            for _, _, old_path in moved:
+                await run_io(storage.delete, old_path)
+            moved_ids = {att_id for att_id, _, _ in moved}
+            stats["packed"] += len(moved)
+            stats["bytes"] += sum(r.size_bytes for r in rows if r.id in moved_ids)
+            logger.info("Compactação: %s", stats)
+    finally:
+        writer.close()
+    return stats
+
+
+def main() -> None:
+    cfg = get_settings()
+    parser = argparse.ArgumentParser(description="Empacota anexos frios em segmentos.")
+    parser.add_argument("--older-than-days", type=int, default=cfg.segment_pack_after_days)
+    parser.add_argument("--batch-size", type=int, default=500, help="Anexos por lote/commit")
+    parser.add_argument("--dry-run", action="store_true", help="Só conta, não move nem grava")
+    args = parser.parse_args()
+    if get_settings().storage_backend != "local":
+        parser.error("disponível apenas com STORAGE_BACKEND=local")
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
+    try:
+        stats = asyncio.run(compact(args.older_than_days, args.batch_size, args.dry_run))
+    finally:
+        shutdown_io_executor()
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
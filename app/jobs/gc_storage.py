@@ -0,0 +1,374 @@
+"""
+Job: coleta de rascunhos abandonados e reconciliação de arquivos órfãos.
+
+    python -m app.jobs.gc_storage drafts --ttl-hours 72 --dry-run
+    python -m app.jobs.gc_storage orphans --grace-seconds 3600 --dry-run
+    python -m app.jobs.gc_storage uploads --dry-run
+    python -m app.jobs.gc_storage all
+
+drafts: apaga, em lotes, manifestações DRAFT sem escrita (updated_at) há mais de
+DRAFT_TTL_HOURS (linhas travadas com SKIP LOCKED quando o banco suporta; um submit
+concorrente não é apagado) e, após o commit, os arquivos dos anexos. Rascunhos com
+upload retomável em andamento ou edições pendentes no autosave deste processo ficam.
+
+orphans: arquivos em uploads/ sem AttachmentModel (ex.: upload gravado e transação
+desfeita). Diferença de conjuntos em streaming: a árvore é percorrida em ordem e
+comparada com os paths (file_path e original_file_path) ordenados do banco (merge de duas listas ordenadas; memória
+constante). Candidatos são confirmados por consulta pontual antes de remover e
+arquivos mais novos que o período de carência são ignorados (upload em andamento).
+Diretórios com prefixo '_' (segmentos, staging etc.) não são varridos.
+
+uploads: uploads retomáveis (uploads/_staging) sem atividade há mais de
+RESUMABLE_UPLOAD_TTL_SECONDS.
+
+Remoções respeitam GC_MAX_DELETES_PER_SECOND. --dry-run só gera o relatório.
+Com GC_INTERVAL_SECONDS > 0 a API roda todos os passos periodicamente (lifespan).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, or_, select, union_all
+
+from app.core.config import get_settings
+from app.domain.enums import ManifestationStatus
+from app.infrastructure.db.autosave import autosave_buffer
+from app.infrastructure.db.models import AttachmentModel, ManifestationModel, ManifestationTagModel
+from app.infrastructure.db.session import session_scope
+from app.infrastructure.db.stats import record_bulk_delete
+from app.infrastructure.search import remove_after_commit
+from app.infrastructure.storage.backend import get_storage
+from app.infrastructure.storage.io_pool import run_io, shutdown_io_executor
+from app.infrastructure.storage.staging import UploadStaging
+from app.infrastructure.storage.local_storage import alternate_layout_path
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 20  # paths listados no relatório
+
+
+class RateLimiter:
+    """Limita operações por segundo (espaçamento fixo entre chamadas)."""
+
+    def __init__(self, per_second: float) -> None:
+        self._interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        now = time.monotonic()
+        if self._next > now:
+            await asyncio.sleep(self._next - now)
+        self._next = max(now, self._next) + self._interval
+
+
+# ---------------------------------------------------------------------------
+# Rascunhos
+# ---------------------------------------------------------------------------
+
+
+async def sweep_drafts(ttl_hours: float, batch_size: int, dry_run: bool, limiter: RateLimiter) -> dict:
+    """Apaga rascunhos sem atividade há mais de ttl_hours. Retorna relatório."""
+    storage = get_storage()
+    cutoff = datetime.utcnow() - timedelta(hours=ttl_hours)
+    report = {"cutoff": cutoff.isoformat(), "drafts": 0, "files": 0, "skipped_active": 0, "sample": []}
+    # Atividade que ainda não chegou a updated_at: chunks no staging e PATCHes no buffer.
+    uploading = await run_io(UploadStaging().active_manifestation_ids, get_settings().resumable_upload_ttl_seconds)
+    buf = autosave_buffer()
+    last_id = ""
+    while True:
+        async with session_scope() as db:
+            q = (
+                select(ManifestationModel.id)
+                .where(
+                    ManifestationModel.status == ManifestationStatus.DRAFT,
+                    ManifestationModel.updated_at < cutoff,
+                    ManifestationModel.id > last_id,
+                )
+                .order_by(ManifestationModel.id)
+                .limit(batch_size)
+            )
+            if not dry_run:
+                q = q.with_for_update(skip_locked=True)
+            ids = list((await db.execute(q)).scalars())
+            if not ids:
+                break
+            last_id = ids[-1]
+            active = [i for i in ids if i in uploading or (buf is not None and buf.get(i) is not None)]
+            if active:
+                report["skipped_active"] += len(active)
+                ids = [i for i in ids if i not in active]
+                if not ids:
+                    continue
+            rows = (
+                await db.execute(
+                    select(AttachmentModel.file_path, AttachmentModel.original_file_path).where(
+                        AttachmentModel.manifestation_id.in_(ids)
+                    )
+                )
+            ).all()
+            paths = [p for row in rows for p in row if p]
+            report["drafts"] += len(ids)
+            report["files"] += len(paths)
+            room = SAMPLE_SIZE - len(report["sample"])
+            if room > 0:
+                report["sample"].extend(ids[:room])
+            if dry_run:
+                continue
+            await record_bulk_delete(db, ids)  # DELETE em massa não passa pelo flush do ORM
+            # Filhas apagadas explicitamente: o SQLite não aplica ON DELETE CASCADE sem PRAGMA foreign_keys.
+            await db.execute(delete(AttachmentModel).where(AttachmentModel.manifestation_id.in_(ids)))
+            await db.execute(delete(ManifestationTagModel).where(ManifestationTagModel.manifestation_id.in_(ids)))
+            await db.execute(delete(ManifestationModel).where(ManifestationModel.id.in_(ids)))
+            remove_after_commit(db, ids)  # índice de busca em processo (quando o GC roda na API)
+        # Commit feito: arquivos sem linha no banco podem sair.
+        for path in paths:
+            await limiter.wait()
+            await storage.delete(path)
+        logger.info("GC rascunhos: %d manifestações, %d arquivos", report["drafts"], report["files"])
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Órfãos
+# ---------------------------------------------------------------------------
+
+
+def _walk_sorted(base: Path, rel: str = "") -> Iterator[str]:
+    """
+    Paths relativos de arquivos em ordem binária de string.
+    Diretórios são ordenados como 'nome/' para que a ordem da travessia coincida com
+    a ordem dos paths completos (ex.: 'a-b/x' < 'a/x', pois '-' < '/').
+    """
+    try:
+        with os.scandir(base / rel if rel else base) as it:
+            entries = [(e.name + "/" if e.is_dir(follow_symlinks=False) else e.name, e) for e in it]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda t: t[0].encode("utf-8"))
+    for key, entry in entries:
+        path = f"{rel}{entry.name}"
+        if key.endswith("/"):
+            if not rel and entry.name.startswith("_"):
+                continue
+            yield from _walk_sorted(base, path + "/")
+        elif entry.is_file(follow_symlinks=False):
+            yield path
+
+
+async def _iter_disk(base: Path, chunk: int = 1000) -> AsyncIterator[str]:
+    """Travessia em blocos no pool de I/O (o event loop não bloqueia no scandir)."""
+    it = _walk_sorted(base)
+
+    def take() -> list[str]:
+        out = []
+        for path in it:
+            out.append(path)
+            if len(out) >= chunk:
+                break
+        return out
+
+    while True:
+        block = await run_io(take)
+        if not block:
+            return
+        for path in block:
+            yield path
+
+
+async def _confirm_orphan(path: str) -> bool:
+    """Consulta pontual: nenhum anexo aponta para o path (nem no outro layout)."""
+    candidates = [path]
+    alt = alternate_layout_path(path)
+    if alt is not None:
+        candidates.append(alt)
+    async with session_scope() as db:
+        hit = await db.execute(
+            select(AttachmentModel.id)
+            .where(
+                or_(
+                    AttachmentModel.file_path.in_(candidates),
+                    AttachmentModel.original_file_path.in_(candidates),
+                )
+            )
+            .limit(1)
+        )
+        return hit.first() is None
+
+
+def _stat_orphan(base: Path, path: str, min_age_cutoff: float) -> int | None:
+    """Tamanho do arquivo se é mais antigo que a carência; None se recente ou sumiu."""
+    try:
+        st = (base / path).stat()
+    except FileNotFoundError:
+        return None
+    return st.st_size if st.st_mtime < min_age_cutoff else None
+
+
+async def reconcile_orphans(grace_seconds: float, dry_run: bool, limiter: RateLimiter) -> dict:
+    """Remove arquivos de uploads/ sem anexo correspondente. Retorna relatório."""
+    storage = get_storage()
+    base = get_settings().uploads_dir.resolve()
+    min_age_cutoff = time.time() - grace_seconds
+    report = {"scanned": 0, "orphans": 0, "bytes": 0, "deleted": 0, "missing": 0, "sample": []}
+
+    async with session_scope() as db:
+        # Arquivos referenciados: file_path e, quando retido, original_file_path.
+        referenced = union_all(
+            select(AttachmentModel.file_path.label("path")),
+            select(AttachmentModel.original_file_path.label("path")).where(
+                AttachmentModel.original_file_path.is_not(None)
+            ),
+        ).subquery()
+        col = referenced.c.path
+        if db.bind.dialect.name == "mysql":
+            col = col.collate("utf8mb4_bin")  # mesma ordem binária da travessia
+        rows = await db.stream(select(referenced.c.path).order_by(col))
+        db_iter = rows.scalars().__aiter__()
+
+        async def next_db() -> str | None:
+            # Anexos empacotados (_segments/...) não têm arquivo avulso.
+            while True:
+                try:
+                    value = await db_iter.__anext__()
+                except StopAsyncIteration:
+                    return None
+                if not value.startswith("_"):
+                    return value
+
+        db_path = await next_db()
+        async for disk_path in _iter_disk(base):
+            report["scanned"] += 1
+            while db_path is not None and db_path.encode("utf-8") < disk_path.encode("utf-8"):
+                report["missing"] += 1  # linha sem arquivo: só reportado
+                db_path = await next_db()
+            if db_path == disk_path:
+                db_path = await next_db()
+                continue
+            size = await run_io(_stat_orphan, base, disk_path, min_age_cutoff)
+            if size is None or not await _confirm_orphan(disk_path):
+                continue
+            report["orphans"] += 1
+            report["bytes"] += size
+            if len(report["sample"]) < SAMPLE_SIZE:
+                report["sample"].append(disk_path)
+            if not dry_run:
+                await limiter.wait()
+                if await storage.delete(disk_path):
+                    report["deleted"] += 1
+        while db_path is not None:
+            report["missing"] += 1
+            db_path = await next_db()
+
+    logger.info(
+        "GC órfãos: %d varridos, %d órfãos (%d bytes), %d removidos",
+        report["scanned"],
+        report["orphans"],
+        report["bytes"],
+        report["deleted"],
+    )
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Uploads retomáveis expirados
+# ---------------------------------------------------------------------------
+
+
+async def expire_uploads(ttl_seconds: float, dry_run: bool) -> dict:
+    """Remove do staging uploads parados há mais de ttl_seconds."""
+    count, size = await run_io(UploadStaging().expire, ttl_seconds, dry_run)
+    if count:
+        logger.info("GC uploads: %d expirados, %d bytes", count, size)
+    return {"expired": count, "bytes": size}
+
+
+# ---------------------------------------------------------------------------
+# Execução
+# ---------------------------------------------------------------------------
+
+
+async def run_gc(
+    which: str = "all",
+    dry_run: bool = False,
+    ttl_hours: float | None = None,
+    grace_seconds: float | None = None,
+    batch_size: int | None = None,
+    max_deletes_per_second: float | None = None,
+) -> dict:
+    """Executa os passos pedidos. Parâmetros omitidos vêm das Settings."""
+    cfg = get_settings()
+    limiter = RateLimiter(
+        cfg.gc_max_deletes_per_second if max_deletes_per_second is None else max_deletes_per_second
+    )
+    report: dict = {"dry_run": dry_run}
+    if which in ("drafts", "all"):
+        report["drafts"] = await sweep_drafts(
+            cfg.draft_ttl_hours if ttl_hours is None else ttl_hours,
+            batch_size or cfg.gc_batch_size,
+            dry_run,
+            limiter,
+        )
+    if which in ("orphans", "all"):
+        if cfg.storage_backend == "local":
+            report["orphans"] = await reconcile_orphans(
+                cfg.orphan_grace_seconds if grace_seconds is None else grace_seconds,
+                dry_run,
+                limiter,
+            )
+        else:
+            logger.info("GC órfãos: ignorado (disponível apenas com STORAGE_BACKEND=local)")
+    if which in ("uploads", "all"):
+        report["uploads"] = await expire_uploads(cfg.resumable_upload_ttl_seconds, dry_run)
+    return report
+
+
+async def run_periodic(interval_seconds: float) -> None:
+    """Laço do lifespan: roda o GC a cada intervalo até ser cancelado."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_gc()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("GC periódico falhou")
+
+
+def main() -> None:
+    cfg = get_settings()
+    parser = argparse.ArgumentParser(description="Coleta rascunhos abandonados, arquivos órfãos e uploads retomáveis expirados.")
+    parser.add_argument("which", nargs="?", choices=["drafts", "orphans", "uploads", "all"], default="all")
+    parser.add_argument("--ttl-hours", type=float, default=cfg.draft_ttl_hours, help="Idade mínima do rascunho")
+    parser.add_argument("--grace-seconds", type=float, default=cfg.orphan_grace_seconds, help="Idade mínima do órfão")
+    parser.add_argument("--batch-size", type=int, default=cfg.gc_batch_size, help="Rascunhos por lote/commit")
+    parser.add_argument("--max-deletes-per-second", type=float, default=cfg.gc_max_deletes_per_second)
+    parser.add_argument("--dry-run", action="store_true", help="Só gera o relatório, não remove nada")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
+    try:
+        report = asyncio.run(
+            run_gc(
+                args.which,
+                args.dry_run,
+                ttl_hours=args.ttl_hours,
+                grace_seconds=args.grace_seconds,
+                batch_size=args.batch_size,
+                max_deletes_per_second=args.max_deletes_per_second,
+            )
+        )
+    finally:
+        shutdown_io_executor()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
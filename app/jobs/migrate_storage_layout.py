@@ -0,0 +1,121 @@
+"""
+Job: migração online do layout de uploads (flat <-> sharded).
+
+    python -m app.jobs.migrate_storage_layout --to sharded --batch-size 500
+
+Percorre manifestações em lotes (keyset por id). Para cada uma, move o diretório
+inteiro para o layout alvo e reescreve file_path/original_file_path; commit por lote.
+Pode rodar com a API no ar: leituras resolvem os dois layouts (LocalStorage.resolve).
+Idempotente: pode ser interrompido e executado de novo.
+Configure STORAGE_LAYOUT com o layout alvo antes, para que novos uploads já o usem.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+
+from sqlalchemy import select, update
+
+from app.core.config import get_settings
+from app.infrastructure.db.models import AttachmentModel, ManifestationModel
+from app.infrastructure.db.session import session_scope
+from app.infrastructure.storage.io_pool import run_io, shutdown_io_executor
+from app.infrastructure.storage.local_storage import LocalStorage, manifestation_rel_dir
+
+logger = logging.getLogger(__name__)
+
+
+def _move_dir(storage: LocalStorage, src_rel: str, dst_rel: str) -> bool:
+    """Move diretório da manifestação. False se não havia nada a mover."""
+    src = storage.full_path(src_rel)
+    dst = storage.full_path(dst_rel)
+    if not src.is_dir():
+        return False
+    if dst.exists():
+        # Execução anterior interrompida: move arquivo a arquivo para o destino.
+        for entry in os.scandir(src):
+            os.replace(entry.path, dst / entry.name)
+        src.rmdir()
+        return True
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(src, dst)
+    return True
+
+
+async def migrate(target: str, batch_size: int, dry_run: bool) -> dict:
+    """Executa a migração. Retorna contadores."""
+    source = "flat" if target == "sharded" else "sharded"
+    storage = LocalStorage()
+    stats = {"manifestations": 0, "dirs_moved": 0, "rows_updated": 0}
+    last_id = ""
+    while True:
+        async with session_scope() as db:
+            ids = (
+                await db.execute(
+                    select(ManifestationModel.id)
+                    .where(ManifestationModel.id > last_id)
+                    .order_by(ManifestationModel.id)
+                    .limit(batch_size)
+                )
+            ).scalars().all()
+            if not ids:
+                break
+            last_id = ids[-1]
+            rows = (
+                await db.execute(
+                    select(
+                        AttachmentModel.id,
+                        AttachmentModel.manifestation_id,
+                        AttachmentModel.file_path,
+                        AttachmentModel.original_file_path,
+                    )
+                    .where(AttachmentModel.manifestation_id.in_(ids))
+                )
+            ).all()
+            for mid in ids:
+                stats["manifestations"] += 1
+                src_rel = manifestation_rel_dir(mid, source)
+                dst_rel = manifestation_rel_dir(mid, target)
+                if dry_run:
+                    if await run_io(storage.full_path(src_rel).is_dir):
+                        stats["dirs_moved"] += 1
+                elif await run_io(_move_dir, storage, src_rel, dst_rel):
+                    stats["dirs_moved"] += 1
+            for row in rows:
+                src_prefix = manifestation_rel_dir(row.manifestation_id, source) + "/"
+                dst_prefix = manifestation_rel_dir(row.manifestation_id, target) + "/"
+                values = {
+                    col: dst_prefix + path[len(src_prefix):]
+                    for col, path in (("file_path", row.file_path), ("original_file_path", row.original_file_path))
+                    if path and path.startswith(src_prefix)
+                }
+                if not values:
+                    continue
+                stats["rows_updated"] += 1
+                if not dry_run:
+                    await db.execute(update(AttachmentModel).where(AttachmentModel.id == row.id).values(**values))
+            if dry_run:
+                await db.rollback()
+        logger.info("Migração de layout: %s", stats)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migra o layout do diretório de uploads.")
+    parser.add_argument("--to", choices=["flat", "sharded"], default="sharded", help="Layout alvo")
+    parser.add_argument("--batch-size", type=int, default=500, help="Manifestações por lote/commit")
+    parser.add_argument("--dry-run", action="store_true", help="Só conta, não move nem grava")
+    args = parser.parse_args()
+    if get_settings().storage_backend != "local":
+        parser.error("disponível apenas com STORAGE_BACKEND=local")
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
+    try:
+        stats = asyncio.run(migrate(args.to, args.batch_size, args.dry_run))
+    finally:
+        shutdown_io_executor()
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Job: reconstrói do zero os rollups de estatísticas (manifestation_daily_stats).
+
+    python -m app.jobs.rebuild_stats
+    python -m app.jobs.rebuild_stats --dry-run
+
+Em uma transação: GROUP BY sobre manifestations, comparação com os rollups atuais
+(relatório das chaves divergentes) e substituição. Escritas concorrentes esperam
+pelos locks das linhas do rollup; prefira rodar fora do pico. --dry-run só relata.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from collections import Counter
+
+from sqlalchemy import delete, func, insert, select
+
+from app.infrastructure.db.models import ManifestationDailyStatModel, ManifestationModel
+from app.infrastructure.db.session import session_scope
+from app.infrastructure.db.stats import stat_key
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 20
+INSERT_BATCH_SIZE = 1000
+
+
+async def rebuild(dry_run: bool = False) -> dict:
+    """Recalcula os rollups; retorna relatório (chaves, total, divergências)."""
+    m, t = ManifestationModel, ManifestationDailyStatModel
+    day = func.date(m.created_at)
+    async with session_scope() as db:
+        r = await db.execute(
+            select(day, m.status, m.input_type, m.administrative_region_id, func.count()).group_by(
+                day, m.status, m.input_type, m.administrative_region_id
+            )
+        )
+        expected: Counter = Counter()
+        for d, status, input_type, region_id, n in r.all():
+            expected[stat_key(d, status, input_type, region_id)] += n
+
+        current: Counter = Counter()
+        r = await db.execute(select(t.day, t.status, t.input_type, t.administrative_region_id, t.count))
+        for d, status, input_type, region_id, n in r.all():
+            current[(d, status, input_type, region_id)] = n
+
+        drift = sorted(k for k in expected.keys() | current.keys() if expected[k] != current[k])
+        report = {
+            "keys": len(expected),
+            "manifestations": sum(expected.values()),
+            "drifted_keys": len(drift),
+            "sample": [
+                {"key": [k[0].isoformat(), *k[1:]], "expected": expected[k], "current": current[k]}
+                for k in drift[:SAMPLE_SIZE]
+            ],
+        }
+        if dry_run or not drift:
+            return report
+
+        await db.execute(delete(t))
+        rows = [
+            {"day": k[0], "status": k[1], "input_type": k[2], "administrative_region_id": k[3], "count": n}
+            for k, n in sorted(expected.items())
+        ]
+        for i in range(0, len(rows), INSERT_BATCH_SIZE):
+            await db.execute(insert(t), rows[i : i + INSERT_BATCH_SIZE])
+    logger.info("Rollups reconstruídos: %d chaves, %d divergentes", report["keys"], report["drifted_keys"])
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconstrói os rollups de estatísticas de manifestações.")
+    parser.add_argument("--dry-run", action="store_true", help="Só relata divergências, sem alterar")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
+    print(json.dumps(asyncio.run(rebuild(args.dry_run)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Job: verificação de integridade (scrubbing) dos anexos.
+
+    python -m app.jobs.scrub_storage --mb-per-second 20
+    python -m app.jobs.scrub_storage --restart --max-files 1000
+
+Relê cada anexo pelo backend configurado (local, segmentos ou S3), recalcula o
+SHA-256 respeitando um orçamento de leitura (SCRUB_MB_PER_SECOND) e grava
+verified_at. Hash ou tamanho divergente, ou arquivo ausente, marca
+checksum_mismatch. Anexos antigos sem sha256 recebem o hash calculado (backfill).
+
+Percorre attachments por id em lotes; o cursor fica em job_cursors e é gravado na
+mesma transação dos resultados do lote, então o job retoma de onde parou após
+reinício. Ao fim de uma passada completa o cursor volta ao início.
+Com SCRUB_INTERVAL_SECONDS > 0 a API roda o scrubber em segundo plano (lifespan).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from app.core.config import get_settings
+from app.infrastructure.db.models import AttachmentModel, JobCursorModel
+from app.infrastructure.db.session import session_scope
+from app.infrastructure.storage.backend import StorageBackend, get_storage
+from app.infrastructure.storage.io_pool import run_io, shutdown_io_executor
+
+logger = logging.getLogger(__name__)
+
+CURSOR_NAME = "scrub_storage"
+
+
+class ByteThrottle:
+    """Limita a vazão de leitura a bytes_per_second (0 = sem limite)."""
+
+    def __init__(self, bytes_per_second: float) -> None:
+        self._rate = bytes_per_second
+        self._next = 0.0
+
+    async def consume(self, n: int) -> None:
+        if self._rate <= 0:
+            return
+        now = time.monotonic()
+        self._next = max(self._next, now) + n / self._rate
+        delay = self._next - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _hash(storage: StorageBackend, relative_path: str, throttle: ByteThrottle) -> tuple[str, int] | None:
+    """(sha256 hex, bytes lidos) do arquivo, ou None se não existe."""
+    h = hashlib.sha256()
+    total = 0
+    try:
+        async for chunk in storage.open_stream(relative_path):
+            await run_io(h.update, chunk)
+            total += len(chunk)
+            await throttle.consume(len(chunk))
+    except FileNotFoundError:
+        return None
+    return h.hexdigest(), total
+
+
+async def _load_cursor() -> str:
+    async with session_scope() as db:
+        c = await db.get(JobCursorModel, CURSOR_NAME)
+        return c.position if c else ""
+
+
+async def scrub(
+    mb_per_second: float,
+    batch_size: int,
+    max_files: int | None = None,
+    restart: bool = False,
+) -> dict:
+    """Verifica anexos a partir do cursor. Retorna contadores."""
+    storage = get_storage()
+    throttle = ByteThrottle(mb_per_second * 1024 * 1024)
+    cursor = "" if restart else await _load_cursor()
+    stats = {"start": cursor, "verified": 0, "backfilled": 0, "mismatches": 0, "bytes": 0, "pass_complete": False}
+    while max_files is None or stats["verified"] < max_files:
+        limit = batch_size if max_files is None else min(batch_size, max_files - stats["verified"])
+        async with session_scope() as db:
+            rows = (
+                await db.execute(
+                    select(
+                        AttachmentModel.id,
+                        AttachmentModel.file_path,
+                        AttachmentModel.size_bytes,
+                        AttachmentModel.sha256,
+                    )
+                    .where(AttachmentModel.id > cursor)
+                    .order_by(AttachmentModel.id)
+                    .limit(limit)
+                )
+            ).all()
+        if not rows:
+            cursor = ""
+            stats["pass_complete"] = True
+        results: list[tuple[str, dict]] = []
+        for row in rows:
+            res = await _hash(storage, row.file_path, throttle)
+            values: dict = {"verified_at": datetime.utcnow()}
+            if res is None:
+                ok = False
+                logger.error("Scrub: arquivo ausente: anexo %s (%s)", row.id, row.file_path)
+            else:
+                digest, size = res
+                stats["bytes"] += size
+                ok = size == row.size_bytes and (row.sha256 is None or digest == row.sha256)
+                if not ok:
+                    logger.error(
+                        "Scrub: divergência no anexo %s (%s): tamanho %d/%d, sha256 %s/%s",
+                        row.id,
+                        row.file_path,
+                        size,
+                        row.size_bytes,
+                        digest,
+                        row.sha256,
+                    )
+                elif row.sha256 is None:
+                    values["sha256"] = digest
+                    stats["backfilled"] += 1
+            values["checksum_mismatch"] = not ok
+            stats["mismatches"] += 0 if ok else 1
+            results.append((row.id, values))
+        if rows:
+            cursor = rows[-1].id
+        # Resultados e cursor na mesma transação: retomada exata após reinício.
+        async with session_scope() as db:
+            for att_id, values in results:
+                await db.execute(update(AttachmentModel).where(AttachmentModel.id == att_id).values(**values))
+            await db.merge(JobCursorModel(name=CURSOR_NAME, position=cursor))
+        stats["verified"] += len(rows)
+        if not rows:
+            break
+        logger.info("Scrub: %d verificados, %d divergências (cursor %s)", stats["verified"], stats["mismatches"], cursor)
+    stats["cursor"] = cursor
+    return stats
+
+
+async def run_periodic(interval_seconds: float) -> None:
+    """Laço do lifespan: uma passada completa, pausa de interval_seconds, repete."""
+    cfg = get_settings()
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await scrub(cfg.scrub_mb_per_second, cfg.scrub_batch_size)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Scrub periódico falhou")
+
+
+def main() -> None:
+    cfg = get_settings()
+    parser = argparse.ArgumentParser(description="Verifica a integridade dos anexos (SHA-256).")
+    parser.add_argument("--mb-per-second", type=float, default=cfg.scrub_mb_per_second, help="0 = sem limite")
+    parser.add_argument("--batch-size", type=int, default=cfg.scrub_batch_size, help="Anexos por lote/commit")
+    parser.add_argument("--max-files", type=int, default=None, help="Para após N anexos (cursor salvo)")
+    parser.add_argument("--restart", action="store_true", help="Ignora o cursor e recomeça do início")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
+    try:
+        stats = asyncio.run(scrub(args.mb_per_second, args.batch_size, args.max_files, args.restart))
+    finally:
+        shutdown_io_executor()
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,23 @@ API Ouvidoria Participa DF - Hackathon.
 FastAPI com versionamento /v1, CORS, Swagger e Redoc.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.api.v1 import admin, health, manifestations
+from app.api.v1 import admin, health, manifestations, map, uploads
 from app.core.config import get_settings
+from app.infrastructure.db.autosave import run_periodic as run_periodic_autosave
 from app.infrastructure.db.session import init_db
+from app.infrastructure.search import load_search_index, uses_memory_index
+from app.infrastructure.storage.io_pool import shutdown_io_executor
+from app.jobs.gc_storage import run_periodic as run_periodic_gc
+from app.jobs.scrub_storage import run_periodic as run_periodic_scrub
 
 settings = get_settings()
 
@@ -21,8 +29,25 @@ async def lifespan(app: FastAPI):
     """Cria pasta uploads e tabelas ao subir (use Alembic em produção)."""
     Path(settings.uploads_dir).mkdir(parents=True, exist_ok=True)
     await init_db()
+    tasks: list[asyncio.Task] = []
+    if settings.gc_interval_seconds > 0:
+        # Cada worker roda o próprio laço; lotes usam SKIP LOCKED e remoções são idempotentes.
+        tasks.append(asyncio.create_task(run_periodic_gc(settings.gc_interval_seconds)))
+    if settings.scrub_interval_seconds > 0:
+        # Habilite em um único worker: o cursor é compartilhado e o orçamento de MB/s é por processo.
+        tasks.append(asyncio.create_task(run_periodic_scrub(settings.scrub_interval_seconds)))
+    if settings.autosave_flush_interval_seconds > 0:
+        # Buffer por processo; ao cancelar, o laço grava o que estiver pendente.
+        tasks.append(asyncio.create_task(run_periodic_autosave(settings.autosave_flush_interval_seconds)))
+    if uses_memory_index():
+        # Carga em segundo plano; buscas antes do fim aguardam a carga.
+        tasks.append(asyncio.create_task(load_search_index()))
     yield
-    # shutdown, se necessário
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    shutdown_io_executor()
 
 
 app = FastAPI(
@@ -45,9 +70,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError) -> JSONResponse:
+    """Flush/commit do ORM perdeu a corrida pela coluna version (ex.: anexo x PATCH)."""
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "Manifestação alterada por outra requisição; tente novamente."},
+    )
+
+
 # API v1
 app.include_router(health.router, prefix=settings.api_v1_prefix)
 app.include_router(manifestations.router, prefix=settings.api_v1_prefix)
+app.include_router(uploads.router, prefix=settings.api_v1_prefix)
+app.include_router(map.router, prefix=settings.api_v1_prefix)
 app.include_router(admin.router, prefix=settings.api_v1_prefix)
 
 
@@ -4,6 +4,8 @@ Usa image_ocr, audio_transcription e video_processing. Nunca levanta exceção.
 """
 
 import logging
+import os
+import stat
 from pathlib import Path
 
 from app.domain.enums import AttachmentType
@@ -16,40 +18,24 @@ logger = logging.getLogger(__name__)
 
 
 def _extract_sync(attachment_type: AttachmentType, path: str) -> str:
-    """Extração síncrona. Roda em thread."""
-    p = Path(path).resolve()
-    if not p.exists():
-        logger.warning("Dispatcher: arquivo não existe para extração: %s (tipo: %s, original: %s)", p, attachment_type.value, path)
-        return ""
-    
-    if not p.is_file():
-        logger.warning("Dispatcher: path não é arquivo: %s (tipo: %s)", p, attachment_type.value)
-        return ""
-    
-    file_size = p.stat().st_size
-    if file_size == 0:
-        logger.warning("Dispatcher: arquivo vazio: %s (tipo: %s)", p, attachment_type.value)
-        return ""
-    
-    logger.info("Dispatcher: extraindo %s (tipo: %s, size: %d bytes)", p, attachment_type.value, file_size)
-    import os
-    path_str = os.path.normpath(str(p.absolute()))
-    
-    if not os.path.exists(path_str):
-        logger.error("Dispatcher: os.path.exists False imediatamente antes de extrair %s", path_str)
+    """Extração síncrona. Roda em thread. Um único stat antes de extrair."""
+    path_str = os.path.normpath(str(Path(path).resolve()))
+    try:
+        st = os.stat(path_str)
+    except OSError as e:
+        logger.warning("Dispatcher: arquivo inacessível para extração: %s (tipo: %s): %s", path_str, attachment_type.value, e)
         return ""
-    
-    if not os.path.isfile(path_str):
-        logger.error("Dispatcher: os.path.isfile False imediatamente antes de extrair %s", path_str)
+
+    if not stat.S_ISREG(st.st_mode):
+        logger.warning("Dispatcher: path não é arquivo: %s (tipo: %s)", path_str, attachment_type.value)
         return ""
-    
-    try:
-        with open(path_str, "rb") as test_file:
-            test_file.read(1)
-    except (OSError, PermissionError) as e:
-        logger.error("Dispatcher: não consegue abrir arquivo %s: %s", path_str, e)
+
+    if st.st_size == 0:
+        logger.warning("Dispatcher: arquivo vazio: %s (tipo: %s)", path_str, attachment_type.value)
         return ""
-    
+
+    logger.info("Dispatcher: extraindo %s (tipo: %s, size: %d bytes)", path_str, attachment_type.value, st.st_size)
+
     try:
         if attachment_type == AttachmentType.IMAGE:
             return extract_text_from_image(path_str)
@@ -59,10 +45,10 @@ def _extract_sync(attachment_type: AttachmentType, path: str) -> str:
             return extract_text_from_video(path_str)
         return ""
     except FileNotFoundError as e:
-        logger.error("Dispatcher: FileNotFoundError durante extração %s: %s (path usado: %s)", p, e, path_str)
+        logger.error("Dispatcher: FileNotFoundError durante extração %s: %s", path_str, e)
         return ""
     except Exception as e:
-        logger.error("Dispatcher: erro durante extração %s: %s", p, e, exc_info=True)
+        logger.error("Dispatcher: erro durante extração %s: %s", path_str, e, exc_info=True)
         return ""
 
 
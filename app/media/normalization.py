@@ -0,0 +1,172 @@
+"""
+Normalização de mídia na ingestão (opcional, por tipo; ver Settings NORMALIZE_*).
+- Imagem: orientação pelo EXIF aplicada, metadados removidos (inclusive GPS),
+  lado maior limitado e reencode em WebP.
+- Áudio: mono Opus (OGG) em bitrate baixo, suficiente para voz e para o Whisper.
+- Vídeo: proxy H.264/AAC com altura e bitrate limitados (faststart).
+Roda no executor de mídia (CPU-bound). Qualquer falha mantém o arquivo original:
+normalização nunca impede um upload válido. Áudio/vídeo só são trocados se o
+resultado for menor; imagens sempre (remoção do EXIF é requisito de privacidade).
+"""
+
+import io
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+from app.core.config import get_settings
+from app.domain.enums import AttachmentType
+from app.media.utils import ffmpeg_cmd, run_sync, safe_unlink
+from app.utils.file_validation import extension_from_mime
+
+logger = logging.getLogger(__name__)
+
+_stats_lock = Lock()
+_stats: dict[str, dict[str, float]] = {}
+
+
+@dataclass(frozen=True)
+class NormalizedUpload:
+    """Resultado da normalização. original só é preenchido quando deve ser retido."""
+
+    content: bytes
+    mime: str
+    original: bytes | None = None
+    original_mime: str | None = None
+
+
+def _record(kind: str, before: int, after: int, seconds: float) -> None:
+    with _stats_lock:
+        s = _stats.setdefault(kind, {"files": 0, "bytes_in": 0, "bytes_out": 0, "seconds": 0.0})
+        s["files"] += 1
+        s["bytes_in"] += before
+        s["bytes_out"] += after
+        s["seconds"] += seconds
+
+
+def normalization_stats() -> dict:
+    """Contadores do processo: arquivos, bytes antes/depois e tempo, por tipo."""
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items()}
+
+
+def normalize_image(content: bytes) -> bytes | None:
+    """WebP com orientação aplicada, sem metadados e lado maior limitado. None = manter original."""
+    from PIL import Image, ImageOps
+
+    cfg = get_settings()
+    with Image.open(io.BytesIO(content)) as img:
+        if getattr(img, "n_frames", 1) > 1:
+            return None  # GIF/WebP animado: mantém
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+        img.thumbnail((cfg.normalize_image_max_px, cfg.normalize_image_max_px))
+        out = io.BytesIO()
+        # Sem exif=/icc_profile=: o WebP sai sem metadados.
+        img.save(out, format="WEBP", quality=cfg.normalize_image_quality, method=4)
+    return out.getvalue()
+
+
+def _transcode(content: bytes, src_ext: str, dst_ext: str, **output_kwargs) -> bytes:
+    """ffmpeg via arquivos temporários (contêineres como MP4 exigem seek)."""
+    import ffmpeg
+
+    fd_in, src = tempfile.mkstemp(suffix="." + src_ext)
+    fd_out, dst = tempfile.mkstemp(suffix="." + dst_ext)
+    os.close(fd_out)
+    try:
+        with os.fdopen(fd_in, "wb") as f:
+            f.write(content)
+        (
+            ffmpeg.input(src)
+            .output(dst, **output_kwargs)
+            .overwrite_output()
+            .run(cmd=ffmpeg_cmd(), capture_stdout=True, capture_stderr=True, quiet=True)
+        )
+        return Path(dst).read_bytes()
+    finally:
+        safe_unlink(Path(src))
+        safe_unlink(Path(dst))
+
+
+def normalize_audio(content: bytes, mime: str) -> bytes:
+    """Mono Opus em OGG."""
+    cfg = get_settings()
+    return _transcode(
+        content,
+        extension_from_mime(mime),
+        "ogg",
+        acodec="libopus",
+        ac=1,
+        audio_bitrate=cfg.normalize_audio_bitrate,
+        vn=None,
+        map_metadata=-1,
+    )
+
+
+def normalize_video(content: bytes, mime: str) -> bytes:
+    """Proxy H.264/AAC com altura e bitrate limitados."""
+    cfg = get_settings()
+    h = cfg.normalize_video_max_height
+    return _transcode(
+        content,
+        extension_from_mime(mime),
+        "mp4",
+        vf=f"scale=-2:'min({h},ih)'",
+        vcodec="libx264",
+        preset="veryfast",
+        crf=28,
+        maxrate=cfg.normalize_video_maxrate,
+        bufsize=cfg.normalize_video_maxrate,
+        acodec="aac",
+        ac=1,
+        audio_bitrate="64k",
+        movflags="+faststart",
+        map_metadata=-1,
+    )
+
+
+def _normalize_sync(content: bytes, mime: str, atype: AttachmentType) -> tuple[bytes, str] | None:
+    cfg = get_settings()
+    if atype == AttachmentType.IMAGE and cfg.normalize_images:
+        out = normalize_image(content)
+        return (out, "image/webp") if out is not None else None
+    if atype == AttachmentType.AUDIO and cfg.normalize_audio:
+        out = normalize_audio(content, mime)
+        return (out, "audio/ogg") if len(out) < len(content) else None
+    if atype == AttachmentType.VIDEO and cfg.normalize_video:
+        out = normalize_video(content, mime)
+        return (out, "video/mp4") if len(out) < len(content) else None
+    return None
+
+
+async def normalize_upload(content: bytes, mime: str, atype: AttachmentType) -> NormalizedUpload:
+    """Normaliza um upload já validado. Em falha ou desabilitado, devolve o original."""
+    started = time.perf_counter()
+    try:
+        res = await run_sync(_normalize_sync, content, mime, atype)
+    except Exception as e:
+        logger.warning("Normalização falhou (%s, %s); mantendo original: %s", atype.value, mime, e)
+        res = None
+    if res is None:
+        return NormalizedUpload(content=content, mime=mime)
+    new_content, new_mime = res
+    elapsed = time.perf_counter() - started
+    _record(atype.value, len(content), len(new_content), elapsed)
+    logger.info(
+        "Normalização %s: %s -> %s, %d -> %d bytes em %.0f ms",
+        atype.value,
+        mime,
+        new_mime,
+        len(content),
+        len(new_content),
+        elapsed * 1000,
+    )
+    if get_settings().keep_original_uploads:
+        return NormalizedUpload(new_content, new_mime, original=content, original_mime=mime)
+    return NormalizedUpload(content=new_content, mime=new_mime)
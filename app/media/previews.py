@@ -0,0 +1,84 @@
+"""
+Pré-visualizações de anexos (geradas sob demanda, cacheadas em disco pela API).
+- Imagem: miniatura WebP (orientação do EXIF aplicada).
+- Vídeo: quadro de pôster (ffmpeg) reduzido para WebP.
+- Áudio: forma de onda em PNG (filtro showwavespic do ffmpeg).
+Funções síncronas (CPU-bound): chamar via run_sync.
+"""
+
+import io
+
+from app.domain.enums import AttachmentType
+from app.media.utils import ffmpeg_cmd
+
+PREVIEW_FORMATS: dict[AttachmentType, tuple[str, str]] = {
+    AttachmentType.IMAGE: ("webp", "image/webp"),
+    AttachmentType.VIDEO: ("webp", "image/webp"),
+    AttachmentType.AUDIO: ("png", "image/png"),
+}
+
+
+def _thumbnail_webp(data: bytes | None, size: int, path: str | None = None) -> bytes:
+    from PIL import Image, ImageOps
+
+    with Image.open(path if data is None else io.BytesIO(data)) as img:
+        img.seek(0)
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+        img.thumbnail((size, size))
+        out = io.BytesIO()
+        img.save(out, format="WEBP", quality=75, method=4)
+    return out.getvalue()
+
+
+def image_thumbnail(path: str, size: int) -> bytes:
+    """Miniatura WebP com lado maior = size."""
+    return _thumbnail_webp(None, size, path)
+
+
+def _ffmpeg_frame(path: str, seek: float, **output_kwargs) -> bytes:
+    import ffmpeg
+
+    out, _ = (
+        ffmpeg.input(path, ss=seek)
+        .output("pipe:1", vframes=1, format="image2", vcodec="png", **output_kwargs)
+        .run(cmd=ffmpeg_cmd(), capture_stdout=True, capture_stderr=True, quiet=True)
+    )
+    return out
+
+
+def video_poster(path: str, size: int) -> bytes:
+    """Quadro de ~1s (ou o primeiro, em vídeos curtos) como WebP."""
+    frame = _ffmpeg_frame(path, 1.0) or _ffmpeg_frame(path, 0.0)
+    if not frame:
+        raise ValueError("nenhum quadro decodificado")
+    return _thumbnail_webp(frame, size)
+
+
+def audio_waveform(path: str, size: int) -> bytes:
+    """Forma de onda PNG de size x size/4."""
+    import ffmpeg
+
+    height = max(size // 4, 16)
+    out, _ = (
+        ffmpeg.input(path)
+        .filter("aformat", channel_layouts="mono")
+        .filter("showwavespic", s=f"{size}x{height}", colors="#1f6feb")
+        .output("pipe:1", vframes=1, format="image2", vcodec="png")
+        .run(cmd=ffmpeg_cmd(), capture_stdout=True, capture_stderr=True, quiet=True)
+    )
+    if not out:
+        raise ValueError("forma de onda vazia")
+    return out
+
+
+def render_preview(attachment_type: AttachmentType, path: str, size: int) -> bytes:
+    """Gera a pré-visualização conforme o tipo do anexo."""
+    if attachment_type == AttachmentType.IMAGE:
+        return image_thumbnail(path, size)
+    if attachment_type == AttachmentType.VIDEO:
+        return video_poster(path, size)
+    if attachment_type == AttachmentType.AUDIO:
+        return audio_waveform(path, size)
+    raise ValueError(f"tipo sem pré-visualização: {attachment_type}")
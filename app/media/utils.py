@@ -5,10 +5,13 @@ Execução em thread para não bloquear o event loop (OCR, Whisper, ffmpeg).
 
 import asyncio
 import logging
+import os
 import tempfile
 from pathlib import Path
 from typing import Any, Callable, TypeVar
 
+from app.core.config import FFMPEG_PATH
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -47,3 +50,8 @@ def safe_unlink(path: Path) -> None:
             path.unlink()
     except OSError as e:
         logger.warning("Erro ao remover %s: %s", path, e)
+
+
+def ffmpeg_cmd() -> str:
+    """Executável do ffmpeg: FFMPEG_PATH se existir, senão o do PATH."""
+    return FFMPEG_PATH if FFMPEG_PATH and os.path.isfile(FFMPEG_PATH) else "ffmpeg"
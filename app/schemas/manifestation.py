@@ -4,7 +4,7 @@ Request/response da API v1.
 Fluxo modernizado: início por mídia, draft, submit, PATCH.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -21,12 +21,18 @@ class CreateManifestationResponse(BaseModel):
     id: str = Field(..., description="ID da manifestação (UUID)")
     protocol: str | None = Field(None, description="Protocolo (null se draft)")
     status: str = Field(..., description="draft | received")
+    version: int = Field(..., description="Versão para concorrência otimista (PATCH/submit)")
 
     model_config = {
         "json_schema_extra": {
             "examples": [
-                {"id": "550e8400-e29b-41d4-a716-446655440000", "protocol": None, "status": "draft"},
-                {"id": "550e8400-e29b-41d4-a716-446655440001", "protocol": "DF-2026-000001", "status": "received"},
+                {"id": "550e8400-e29b-41d4-a716-446655440000", "protocol": None, "status": "draft", "version": 1},
+                {
+                    "id": "550e8400-e29b-41d4-a716-446655440001",
+                    "protocol": "DF-2026-000001",
+                    "status": "received",
+                    "version": 1,
+                },
             ]
         }
     }
@@ -51,6 +57,9 @@ class UpdateManifestationBody(BaseModel):
     contact_name: str | None = None
     contact_email: str | None = None
     contact_phone: str | None = None
+    version: int | None = Field(
+        None, description="Versão lida por último; se não for a atual, responde 409 (sem ela, último grava)"
+    )
 
 
 class UpdateManifestationResponse(BaseModel):
@@ -59,6 +68,7 @@ class UpdateManifestationResponse(BaseModel):
     id: str
     protocol: str | None
     status: str
+    version: int = Field(..., description="Nova versão; enviar no próximo PATCH/submit")
 
 
 # --- Submit ---
@@ -69,8 +79,11 @@ class SubmitManifestationResponse(BaseModel):
 
     protocol: str = Field(..., description="Protocolo definitivo")
     status: str = Field(..., description="received")
+    version: int = Field(..., description="Versão após o submit")
 
-    model_config = {"json_schema_extra": {"examples": [{"protocol": "DF-2026-000001", "status": "received"}]}}
+    model_config = {
+        "json_schema_extra": {"examples": [{"protocol": "DF-2026-000001", "status": "received", "version": 3}]}
+    }
 
 
 # --- Get by protocol ---
@@ -158,7 +171,76 @@ class ManifestationListItem(BaseModel):
 class ManifestationsListResponse(BaseModel):
     """Resposta do GET /v1/admin/manifestations."""
 
+    total: int | None = Field(None, description="Total de manifestações (None com total=none)")
+    total_estimated: bool = Field(False, description="total vem de estatísticas do banco (aproximado)")
+    page: int | None = Field(None, description="Página (modo offset); None no modo cursor")
+    per_page: int
+    next_cursor: str | None = Field(None, description="Cursor opaco da próxima página; None na última")
+    items: list[ManifestationListItem]
+
+
+class SearchResultItem(BaseModel):
+    """Item da busca textual (admin)."""
+
+    id: UUID
+    protocol: str | None
+    status: str
+    input_type: str
+    created_at: datetime
+    subject_label: str | None
+    score: float = Field(..., description="Relevância (maior = mais relevante; escala depende do backend)")
+    snippet: str | None = Field(None, description="Trecho em torno da primeira ocorrência")
+
+
+class SearchResponse(BaseModel):
+    """Resposta do GET /v1/admin/manifestations/search."""
+
+    q: str
+    backend: str = Field(..., description="fulltext (MySQL) ou memory (índice em processo)")
     total: int
     page: int
     per_page: int
-    items: list[ManifestationListItem]
+    items: list[SearchResultItem]
+
+
+class TagFacet(BaseModel):
+    """Tag complementar (normalizada) e quantas manifestações a usam."""
+
+    tag: str
+    count: int
+
+
+class TagFacetsResponse(BaseModel):
+    """Resposta do GET /v1/admin/manifestations/tags."""
+
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    items: list[TagFacet]
+
+
+class RegionCount(BaseModel):
+    """Contagem por região administrativa (id None = sem região)."""
+
+    id: int | None
+    name: str | None
+    count: int
+
+
+class DailyCount(BaseModel):
+    """Contagem de um dia (UTC), total e por status."""
+
+    day: date
+    count: int
+    by_status: dict[str, int]
+
+
+class StatsResponse(BaseModel):
+    """Resposta do GET /v1/admin/stats."""
+
+    date_from: date
+    date_to: date
+    total: int
+    by_status: dict[str, int]
+    by_input_type: dict[str, int]
+    by_region: list[RegionCount]
+    daily: list[DailyCount]
@@ -0,0 +1,16 @@
+"""
+Checksums de anexos (SHA-256 em hex).
+Na ingestão o hash é calculado sobre os bytes já em memória (sem reler o arquivo).
+"""
+
+import hashlib
+
+
+def sha256_hex(content: bytes) -> str:
+    """SHA-256 do conteúdo, em hex (64 chars)."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def sha256_many(contents: list[bytes]) -> list[str]:
+    """SHA-256 de vários conteúdos (uma chamada no pool de I/O por upload)."""
+    return [sha256_hex(c) for c in contents]
@@ -0,0 +1,29 @@
+"""
+Cursores opacos para paginação por keyset (ex.: (created_at, id)).
+O cliente só repassa o valor recebido em next_cursor; o formato interno
+(JSON em base64 URL-safe, sem padding) pode mudar sem quebrar a API.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    """Cursor malformado ou de outro endpoint."""
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """(created_at, id) do cursor. Levanta InvalidCursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor("Cursor inválido.")
@@ -0,0 +1,106 @@
+"""
+Geohash (base32) para indexar pontos lat/lng em uma coluna texto ordenável.
+Células vizinhas compartilham prefixo: uma caixa vira poucos intervalos
+[prefixo, próximo prefixo) consultáveis por índice B-tree comum.
+"""
+
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_INDEX = {c: i for i, c in enumerate(BASE32)}
+DEFAULT_PRECISION = 9  # ~4,8 m x 4,8 m
+
+
+def encode(lat: float, lng: float, precision: int = DEFAULT_PRECISION) -> str:
+    """Geohash de (lat, lng) com precision caracteres."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    out = []
+    bits = 0
+    value = 0
+    even = True  # bits pares = longitude
+    while len(out) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                value = value << 1 | 1
+                lng_lo = mid
+            else:
+                value <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                value = value << 1 | 1
+                lat_lo = mid
+            else:
+                value <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(BASE32[value])
+            bits = value = 0
+    return "".join(out)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(altura em graus de latitude, largura em graus de longitude) da célula."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def prefix_upper(prefix: str) -> str | None:
+    """Menor string maior que todas as que começam com prefix (None: não há limite)."""
+    chars = list(prefix)
+    while chars:
+        i = _INDEX[chars[-1]]
+        if i + 1 < len(BASE32):
+            chars[-1] = BASE32[i + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def covering_prefixes(
+    south: float, west: float, north: float, east: float, max_prefixes: int = 16
+) -> list[str]:
+    """
+    Prefixos cujas células cobrem a caixa, na maior precisão com até max_prefixes células.
+    Lista vazia significa caixa grande demais para filtrar por prefixo (consultar sem ele).
+    """
+    best: list[str] = []
+    for precision in range(1, 10):
+        dlat, dlng = cell_size(precision)
+        rows = math.floor(north / dlat) - math.floor(south / dlat) + 1
+        cols = math.floor(east / dlng) - math.floor(west / dlng) + 1
+        if rows * cols > max_prefixes:
+            break
+        cells = set()
+        for r in range(rows):
+            lat = min((math.floor(south / dlat) + r + 0.5) * dlat, 90.0 - 1e-9)
+            for c in range(cols):
+                lng = min((math.floor(west / dlng) + c + 0.5) * dlng, 180.0 - 1e-9)
+                cells.add(encode(lat, lng, precision))
+        best = sorted(cells)
+    return best
+
+
+def prefix_ranges(prefixes: list[str]) -> list[tuple[str, str | None]]:
+    """Prefixos ordenados → intervalos [início, fim) mesclando os contíguos."""
+    ranges: list[tuple[str, str | None]] = []
+    for p in sorted(prefixes):
+        upper = prefix_upper(p)
+        if ranges and ranges[-1][1] == p:
+            ranges[-1] = (ranges[-1][0], upper)
+        else:
+            ranges.append((p, upper))
+    return ranges
+
+
+def encode_point(lat: float | None, lng: float | None) -> str | None:
+    """Geohash do ponto, ou None sem localização completa/válida."""
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return encode(lat, lng)
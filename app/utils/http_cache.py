@@ -0,0 +1,58 @@
+"""
+Cache HTTP: ETag forte, If-None-Match e Cache-Control.
+ETag calculado uma vez por carga (junto do valor em cache), não por request.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi.responses import Response
+
+
+@dataclass(frozen=True)
+class CachedView:
+    """Dados públicos de uma leitura e o ETag correspondente."""
+
+    data: Any
+    etag: str
+
+
+def make_etag(data: Any) -> str:
+    """ETag forte a partir do hash do conteúdo serializado de forma canônica."""
+    raw = json.dumps(data, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+    return f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+
+def make_view(data: Any) -> CachedView | None:
+    """Empacota dados com ETag. None continua None (não encontrado)."""
+    if data is None:
+        return None
+    return CachedView(data=data, etag=make_etag(data))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110): ignora prefixo W/ e aceita '*'."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        if candidate.strip().removeprefix("W/") == target:
+            return True
+    return False
+
+
+def cache_headers(etag: str, cache_control: str) -> dict[str, str]:
+    """Cabeçalhos de validação/cache para respostas 200 e 304."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Resposta 304 sem corpo."""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,172 @@
+"""
+Resposta de arquivo em streaming com suporte a HTTP Range (RFC 9110).
+- Sem Range: 200 com arquivo inteiro; usa http.response.pathsend (sendfile)
+  quando o servidor ASGI oferece a extensão.
+- Um intervalo: 206 com Content-Range.
+- Vários intervalos: 206 multipart/byteranges.
+- Intervalo fora do arquivo: 416.
+A leitura é delegada a um RangeReader (ex.: AsyncLocalStorage.open_stream);
+nunca carrega o arquivo inteiro em memória.
+"""
+
+import os
+import secrets
+from collections.abc import AsyncIterator, Callable, Mapping
+from pathlib import Path
+
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+MAX_RANGES = 16
+
+# (start, end) inclusivo -> blocos de bytes
+RangeReader = Callable[[int, int], AsyncIterator[bytes]]
+
+
+class RangeNotSatisfiable(Exception):
+    """Nenhum intervalo pedido cabe no arquivo."""
+
+    pass
+
+
+def parse_range_header(value: str | None, size: int) -> list[tuple[int, int]] | None:
+    """
+    Interpreta 'bytes=a-b, c-, -n'. Retorna intervalos inclusivos ou None
+    (cabeçalho ausente, inválido ou com intervalos demais: servir o arquivo inteiro).
+    Levanta RangeNotSatisfiable se nenhum intervalo for satisfazível.
+    """
+    if not value:
+        return None
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+    ranges: list[tuple[int, int]] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        if not sep:
+            return None
+        try:
+            if first == "":
+                suffix = int(last)
+                if suffix <= 0:
+                    continue
+                start, end = max(0, size - suffix), size - 1
+            else:
+                start = int(first)
+                end = int(last) if last else size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        if start < 0 or end < start:
+            return None
+        ranges.append((start, min(end, size - 1)))
+    if not ranges:
+        raise RangeNotSatisfiable()
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+
+class RangedFileResponse(Response):
+    """Resposta de arquivo com Range/206, multipart/byteranges e pathsend."""
+
+    def __init__(
+        self,
+        size: int,
+        media_type: str,
+        reader: RangeReader,
+        range_header: str | None = None,
+        if_range: str | None = None,
+        path: str | Path | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.size = size
+        self.reader = reader
+        self.path = path
+        self.background = None
+        self.ranges: list[tuple[int, int]] | None = None
+        self.boundary = ""
+        self.media_type = media_type
+        base = dict(headers or {})
+        base["Accept-Ranges"] = "bytes"
+        # If-Range: se o validador não confere, ignora Range e envia tudo.
+        etag = base.get("ETag")
+        if if_range is not None and if_range.strip() != etag:
+            range_header = None
+        try:
+            self.ranges = parse_range_header(range_header, size)
+        except RangeNotSatisfiable:
+            self.status_code = 416
+            base["Content-Range"] = f"bytes */{size}"
+            base["Content-Length"] = "0"
+            self.init_headers(base)
+            return
+
+        if self.ranges is None:
+            self.status_code = 200
+            base["Content-Length"] = str(size)
+            base["Content-Type"] = media_type
+        elif len(self.ranges) == 1:
+            start, end = self.ranges[0]
+            self.status_code = 206
+            base["Content-Range"] = f"bytes {start}-{end}/{size}"
+            base["Content-Length"] = str(end - start + 1)
+            base["Content-Type"] = media_type
+        else:
+            self.status_code = 206
+            self.boundary = secrets.token_hex(16)
+            base["Content-Type"] = f"multipart/byteranges; boundary={self.boundary}"
+            base["Content-Length"] = str(self._multipart_length())
+        self.init_headers(base)
+
+    def init_headers(self, headers: Mapping[str, str] | None = None) -> None:
+        self.raw_headers = [
+            (k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in (headers or {}).items()
+        ]
+
+    def _part_header(self, start: int, end: int) -> bytes:
+        return (
+            f"--{self.boundary}\r\n"
+            f"Content-Type: {self.media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{self.size}\r\n\r\n"
+        ).encode("latin-1")
+
+    def _closing(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode("latin-1")
+
+    def _multipart_length(self) -> int:
+        total = len(self._closing())
+        for start, end in self.ranges or []:
+            total += len(self._part_header(start, end)) + (end - start + 1) + 2
+        return total
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or self.status_code == 416:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        if self.ranges is None:
+            if self.path is not None and "http.response.pathsend" in scope.get("extensions", {}):
+                await send({"type": "http.response.pathsend", "path": os.fspath(self.path)})
+                return
+            await self._send_range(send, 0, self.size - 1)
+        elif len(self.ranges) == 1:
+            await self._send_range(send, *self.ranges[0])
+        else:
+            for start, end in self.ranges:
+                await send({"type": "http.response.body", "body": self._part_header(start, end), "more_body": True})
+                await self._send_range(send, start, end)
+                await send({"type": "http.response.body", "body": b"\r\n", "more_body": True})
+            await send({"type": "http.response.body", "body": self._closing(), "more_body": False})
+            return
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_range(self, send: Send, start: int, end: int) -> None:
+        if end < start:
+            return
+        async for chunk in self.reader(start, end):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
@@ -0,0 +1,16 @@
+"""
+Normalização de texto para comparação: sem acentos, minúsculas (casefold) e
+espaços colapsados. "Águas  Claras" e "aguas claras" → "aguas claras".
+"""
+
+import re
+import unicodedata
+
+_COMBINING = re.compile(r"[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+")  # marcas combinantes
+
+
+def fold_text(s: str) -> str:
+    """Forma canônica para chaves de busca/lookup (insensível a acento e caixa)."""
+    if not s.isascii():
+        s = _COMBINING.sub("", unicodedata.normalize("NFKD", s))
+    return " ".join(s.casefold().split())
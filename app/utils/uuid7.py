@@ -0,0 +1,45 @@
+"""
+UUID versão 7 (RFC 9562): 48 bits de timestamp em ms + 74 bits aleatórios.
+Ids gerados em sequência ficam em ordem crescente (também como texto hex), então
+inserções caem no fim do índice clusterizado do InnoDB em vez de em páginas
+aleatórias. Dentro do mesmo ms os 12 bits rand_a viram contador (monotônico no
+processo); entre processos a ordem é por ms.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Novo UUIDv7, crescente em relação ao anterior deste processo."""
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms = ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF  # metade baixa: folga para incrementar
+        else:
+            _counter += 1
+            if _counter > 0xFFF:  # contador esgotado no ms (ou relógio voltou): avança o ms lógico
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    value = ms << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+
+def uuid7_str() -> str:
+    return str(uuid7())
+
+
+def uuid7_time_ms(value: str | uuid.UUID) -> int:
+    """Timestamp (ms desde a época) embutido em um UUIDv7."""
+    u = value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+    return u.int >> 80
@@ -0,0 +1,11 @@
+"""
+Benchmarks reproduzíveis em SQLite, com dados sintéticos de semente fixa. Rodar da raiz do repositório:
+
+    python -m benchmarks.list_pagination --rows 1000000   # listagem admin: offset x cursor, totais
+    python -m benchmarks.search_index --docs 1000000      # busca: índice invertido em processo
+    python -m benchmarks.tag_facets --rows 1000000        # tags: tabela indexada x varredura do JSON
+    python -m benchmarks.id_layouts --rows 1000000        # ids: UUID4/UUIDv7 texto x BINARY(16)
+
+Os bancos ficam em --dir (padrão: diretório temporário do sistema) e são reaproveitados
+com --reuse quando já populados.
+"""
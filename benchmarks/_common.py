@@ -0,0 +1,46 @@
+"""Utilitários dos benchmarks: banco de teste e medição de tempo."""
+
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def bench_db(directory: str | None, name: str, reuse: bool) -> tuple[Path, bool]:
+    """
+    Aponta DATABASE_URL para {directory}/{name} (antes de importar app) e devolve
+    (path, precisa_popular). Sem reuse, apaga o arquivo anterior.
+    """
+    path = Path(directory or tempfile.gettempdir()) / name
+    if not reuse and path.exists():
+        path.unlink()
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ.setdefault("UPLOADS_DIR", str(path.parent / "participa-bench-uploads"))
+    return path, not path.exists()
+
+
+def report(label: str, samples_ms: list[float], extra: str = "") -> None:
+    p50 = statistics.median(samples_ms)
+    worst = max(samples_ms)
+    print(f"{label:44s} p50 {p50:9.2f} ms  max {worst:9.2f} ms  {extra}")
+
+
+def timed(fn, repeat: int = 5) -> tuple[list[float], object]:
+    """Executa fn() repeat vezes; retorna (tempos em ms, último resultado)."""
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, result
+
+
+async def timed_async(fn, repeat: int = 5) -> tuple[list[float], object]:
+    """Como timed, para corrotinas (fn devolve um awaitable)."""
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, result
@@ -0,0 +1,77 @@
+"""
+Layouts de chave primária com --rows manifestações (+ um anexo cada) em tabelas
+WITHOUT ROWID do SQLite, que, como o InnoDB, agrupam a tabela pela PK: UUID4 em texto
+(layout antigo), UUIDv7 em texto (ID_STORAGE=char) e UUIDv7 em 16 bytes
+(ID_STORAGE=binary). Mede vazão de inserção, pior lote e tamanho da PK e dos índices
+secundários (dbstat). Cache limitado (--cache-mb) para simular um buffer pool menor que os dados.
+
+    python -m benchmarks.id_layouts --rows 1000000
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from app.utils.uuid7 import uuid7
+
+BATCH = 10_000
+LAYOUTS = {
+    "uuid4 texto(36)": (lambda: str(uuid.uuid4()), "TEXT"),
+    "uuid7 texto(36)": (lambda: str(uuid7()), "TEXT"),
+    "uuid7 binário(16)": (lambda: uuid7().bytes, "BLOB"),
+}
+
+
+def run(name: str, gen, col_type: str, path: Path, rows: int, cache_mb: int) -> None:
+    if path.exists():
+        path.unlink()
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute(f"PRAGMA cache_size=-{cache_mb * 1024}")
+    con.execute(
+        f"CREATE TABLE manifestations (id {col_type} PRIMARY KEY, created_at TEXT, status TEXT, payload TEXT) "
+        "WITHOUT ROWID"
+    )
+    con.execute("CREATE INDEX ix_status_created_at ON manifestations (status, created_at, id)")
+    con.execute(f"CREATE TABLE attachments (id {col_type} PRIMARY KEY, manifestation_id {col_type}) WITHOUT ROWID")
+    con.execute("CREATE INDEX ix_attachments_manifestation_id ON attachments (manifestation_id)")
+    started = last = time.perf_counter()
+    worst = 0.0
+    for _ in range(0, rows, BATCH):
+        batch = [(gen(), "2026-10-19 10:00:00", "draft", "x" * 200) for _ in range(BATCH)]
+        con.executemany("INSERT INTO manifestations VALUES (?, ?, ?, ?)", batch)
+        con.executemany("INSERT INTO attachments VALUES (?, ?)", [(gen(), r[0]) for r in batch])
+        con.commit()
+        now = time.perf_counter()
+        worst = max(worst, now - last)
+        last = now
+    elapsed = time.perf_counter() - started
+    mb = {n: size / 2**20 for n, size in con.execute("SELECT name, sum(pgsize) FROM dbstat GROUP BY name")}
+    con.close()
+    print(
+        f"{name:18s} {rows / elapsed:9.0f} linhas/s  pior lote {worst * 1000:6.0f} ms  "
+        f"PK manifestations {mb['manifestations']:6.1f} MB  ix_status {mb['ix_status_created_at']:5.1f} MB  "
+        f"PK attachments {mb['attachments']:5.1f} MB  "
+        f"ix_manifestation_id {mb['ix_attachments_manifestation_id']:5.1f} MB  "
+        f"arquivo {os.path.getsize(path) / 2**20:.0f} MB"
+    )
+    path.unlink()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cache-mb", type=int, default=16)
+    parser.add_argument("--dir", default=None, help="diretório dos bancos (padrão: temporário do sistema)")
+    args = parser.parse_args()
+    directory = Path(args.dir or tempfile.gettempdir())
+    for i, (name, (gen, col_type)) in enumerate(LAYOUTS.items()):
+        run(name, gen, col_type, directory / f"participa-bench-ids-{i}.db", args.rows, args.cache_mb)
+
+
+if __name__ == "__main__":
+    main()
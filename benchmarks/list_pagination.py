@@ -0,0 +1,96 @@
+"""
+Listagem admin (GET /v1/admin/manifestations) em SQLite com --rows manifestações:
+paginação por offset (primeira, meio e última página) x keyset (cursor no início e
+perto do fim) e o custo de cada modo de total (exact, estimate, none).
+
+    python -m benchmarks.list_pagination --rows 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from benchmarks._common import bench_db, report, timed_async
+
+PER_PAGE = 20
+INSERT_BATCH = 50_000
+
+
+def populate(path, rows: int) -> None:
+    from sqlalchemy import create_engine
+
+    from app.infrastructure.db.base import Base
+    from app.infrastructure.db import models  # noqa: F401
+    from app.utils.uuid7 import uuid7_str
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+    rnd = random.Random(41)
+    base = datetime(2024, 1, 1)
+    con = sqlite3.connect(path)
+    for start in range(0, rows, INSERT_BATCH):
+        batch = []
+        for i in range(start, min(rows, start + INSERT_BATCH)):
+            ts = (base + timedelta(seconds=i // 3)).strftime("%Y-%m-%d %H:%M:%S.%f")
+            status = "draft" if rnd.random() < 0.2 else "received"
+            input_type = rnd.choice(("text", "audio", "image", "video", "mixed"))
+            batch.append((uuid7_str(), input_type, rnd.random() < 0.3, status, ts, ts))
+        con.executemany(
+            "INSERT INTO manifestations (id, input_type, anonymous, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+    con.commit()
+    con.execute("ANALYZE")
+    con.close()
+
+
+def cursor_at(path, offset: int) -> str:
+    """Cursor equivalente a ter paginado até a linha offset (mais recentes primeiro)."""
+    from app.utils.cursor import encode_cursor
+
+    con = sqlite3.connect(path)
+    created_at, last_id = con.execute(
+        "SELECT created_at, id FROM manifestations ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?", (offset,)
+    ).fetchone()
+    con.close()
+    return encode_cursor(datetime.fromisoformat(created_at), last_id)
+
+
+async def run(path, rows: int, repeat: int) -> None:
+    from app.application.use_cases.list_manifestations import list_manifestations
+    from app.infrastructure.db.session import session_scope
+
+    last_page = max(1, (rows + PER_PAGE - 1) // PER_PAGE)
+    async with session_scope() as s:
+
+        async def case(label: str, **kw) -> None:
+            samples, page = await timed_async(lambda: list_manifestations(s, per_page=PER_PAGE, **kw), repeat)
+            report(label, samples, f"itens={len(page.items)} total={page.total}")
+
+        for mode in ("exact", "estimate", "none"):
+            await case(f"offset página 1, total={mode}", page=1, total=mode)
+        await case("offset página do meio, total=none", page=last_page // 2, total="none")
+        await case("offset última página, total=none", page=last_page, total="none")
+        first = await list_manifestations(s, per_page=PER_PAGE, total="none")
+        await case("cursor página 2", cursor=first.next_cursor, total="none")
+        await case("cursor perto do fim", cursor=cursor_at(path, max(0, rows - 2 * PER_PAGE)), total="none")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dir", default=None, help="diretório do banco (padrão: temporário do sistema)")
+    parser.add_argument("--reuse", action="store_true", help="reaproveita o banco já populado")
+    args = parser.parse_args()
+    path, fresh = bench_db(args.dir, f"participa-bench-list-{args.rows}.db", args.reuse)
+    if fresh:
+        populate(path, args.rows)
+    print(f"{args.rows} manifestações em {path}")
+    asyncio.run(run(path, args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
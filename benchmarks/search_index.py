@@ -0,0 +1,69 @@
+"""
+Busca textual em processo (fallback do FULLTEXT): construção do InvertedIndex com --docs
+documentos sintéticos (vocabulário com distribuição de Zipf + termos comuns do domínio),
+memória, latência de consultas (termos raros, comuns e combinados) e upsert incremental.
+
+    python -m benchmarks.search_index --docs 1000000
+"""
+
+import argparse
+import itertools
+import random
+import resource
+import time
+
+from benchmarks._common import report, timed
+
+VOCABULARY = 50_000
+WORDS_PER_DOC = 30
+UPSERT_BATCH = 5000
+COMMON = ["escola", "rua", "buraco", "poste", "saude", "hospital", "onibus", "lixo", "agua", "luz"]
+QUERIES = ["ceilandia", "pal30000", "pal5 escola", "escola", "escola rua", "pal1", "hospital onibus lixo"]
+
+
+def build(docs: int):
+    from app.infrastructure.search.inverted_index import InvertedIndex
+
+    rnd = random.Random(44)
+    vocab = [f"pal{i}" for i in range(VOCABULARY)]
+    weights = list(itertools.accumulate(1 / (i + 1) for i in range(VOCABULARY)))
+    index = InvertedIndex()
+    batch = []
+    for i in range(docs):
+        words = rnd.choices(vocab, cum_weights=weights, k=WORDS_PER_DOC) + rnd.sample(COMMON, 2)
+        if i % 1000 == 0:
+            words.append("ceilandia")  # termo raro: 0,1% dos documentos
+        batch.append((f"doc{i:08d}", {"original_text": " ".join(words), "subject_label": rnd.choice(COMMON)}))
+        if len(batch) == UPSERT_BATCH:
+            index.upsert_many(batch)
+            batch = []
+    if batch:
+        index.upsert_many(batch)
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = build(args.docs)
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{args.docs} documentos indexados em {time.perf_counter() - started:.1f} s, maxrss {rss_mb:.0f} MB")
+    print(index.stats())
+    for q in QUERIES:
+        samples, (total, hits) = timed(lambda: index.search(q, 20), args.repeat)
+        report(f"busca {q!r}", samples, f"casamentos={total}")
+    samples, _ = timed(lambda: index.search("escola", 20, 10_000), args.repeat)
+    report("busca 'escola' página 501", samples)
+    n = 1000
+    samples, _ = timed(
+        lambda: [index.upsert(f"novo{i}", {"original_text": "nova escola em ceilandia"}) for i in range(n)], 1
+    )
+    print(f"upsert incremental: {samples[0] / n:.3f} ms por documento")
+
+
+if __name__ == "__main__":
+    main()
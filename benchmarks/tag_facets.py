@@ -0,0 +1,129 @@
+"""
+Tags complementares em SQLite com --rows manifestações (0 a 4 tags de um vocabulário de
+300, frequência de Zipf): filtro por tag (primeira página, página profunda por cursor,
+COUNT) e facetas top-20 (30 dias e tudo) pela tabela manifestation_tags, comparados à
+varredura do JSON complementary_tags (json_each), que era a única opção antes da tabela.
+
+    python -m benchmarks.tag_facets --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from benchmarks._common import bench_db, report, timed, timed_async
+
+VOCABULARY = 300
+INSERT_BATCH = 50_000
+COMMON_TAG, RARE_TAG = "tag0", "tag250"
+MONTH = (datetime(2025, 3, 1), datetime(2025, 3, 31))
+
+
+def populate(path, rows: int) -> int:
+    from sqlalchemy import create_engine
+
+    from app.infrastructure.db.base import Base
+    from app.infrastructure.db import models  # noqa: F401
+    from app.utils.uuid7 import uuid7_str
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+    rnd = random.Random(46)
+    vocab = [f"tag{i}" for i in range(VOCABULARY)]
+    weights = []
+    acc = 0.0
+    for i in range(VOCABULARY):
+        acc += 1 / (i + 1)
+        weights.append(acc)
+    base = datetime(2025, 1, 1)
+    con = sqlite3.connect(path)
+    tag_rows = 0
+    for start in range(0, rows, INSERT_BATCH):
+        manifestations, tags = [], []
+        for i in range(start, min(rows, start + INSERT_BATCH)):
+            mid = uuid7_str()
+            ts = (base + timedelta(seconds=i * 30)).strftime("%Y-%m-%d %H:%M:%S.%f")
+            picked = list(dict.fromkeys(rnd.choices(vocab, cum_weights=weights, k=rnd.randint(0, 4))))
+            manifestations.append((mid, "received", "text", False, json.dumps(picked) if picked else None, ts, ts))
+            tags.extend((mid, t, ts) for t in picked)
+        con.executemany(
+            "INSERT INTO manifestations "
+            "(id, status, input_type, anonymous, complementary_tags, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            manifestations,
+        )
+        con.executemany("INSERT INTO manifestation_tags (manifestation_id, tag, created_at) VALUES (?, ?, ?)", tags)
+        tag_rows += len(tags)
+    con.commit()
+    con.execute("ANALYZE")
+    con.close()
+    return tag_rows
+
+
+def json_scan(path, repeat: int) -> None:
+    con = sqlite3.connect(path)
+    month = tuple(d.strftime("%Y-%m-%d %H:%M:%S") for d in MONTH)
+    has_tag = "EXISTS (SELECT 1 FROM json_each(m.complementary_tags) WHERE value = ?)"
+    cases = [
+        (f"JSON filtro {RARE_TAG}: página 1",
+         f"SELECT id FROM manifestations m WHERE {has_tag} ORDER BY created_at DESC, id DESC LIMIT 21", (RARE_TAG,)),
+        (f"JSON filtro {RARE_TAG}: COUNT", f"SELECT count(*) FROM manifestations m WHERE {has_tag}", (RARE_TAG,)),
+        ("JSON facetas 30 dias",
+         "SELECT j.value, count(*) c FROM manifestations m, json_each(m.complementary_tags) j "
+         "WHERE m.created_at >= ? AND m.created_at < ? GROUP BY j.value ORDER BY c DESC LIMIT 20", month),
+        ("JSON facetas tudo",
+         "SELECT j.value, count(*) c FROM manifestations m, json_each(m.complementary_tags) j "
+         "GROUP BY j.value ORDER BY c DESC LIMIT 20", ()),
+    ]
+    for label, sql, params in cases:
+        samples, rows = timed(lambda: con.execute(sql, params).fetchall(), repeat)
+        report(label, samples, f"linhas={len(rows)}")
+    con.close()
+
+
+async def indexed(repeat: int) -> None:
+    from app.application.use_cases.list_manifestations import ManifestationFilters, list_manifestations
+    from app.application.use_cases.tag_facets import tag_facets
+    from app.infrastructure.db.session import session_scope
+
+    async with session_scope() as s:
+        for tag in (COMMON_TAG, RARE_TAG):
+            f = ManifestationFilters(tag=tag)
+            samples, page = await timed_async(lambda: list_manifestations(s, total="none", filters=f), repeat)
+            report(f"tabela filtro {tag}: página 1", samples)
+            cursor = page.next_cursor
+            for _ in range(50):
+                if cursor is None:
+                    break
+                cursor = (await list_manifestations(s, cursor=cursor, total="none", filters=f)).next_cursor
+            if cursor is not None:
+                samples, _ = await timed_async(
+                    lambda: list_manifestations(s, cursor=cursor, total="none", filters=f), repeat
+                )
+                report(f"tabela filtro {tag}: página 52 (cursor)", samples)
+            samples, page = await timed_async(lambda: list_manifestations(s, total="exact", filters=f), repeat)
+            report(f"tabela filtro {tag}: COUNT", samples, f"total={page.total}")
+        for label, kw in (("30 dias", dict(created_from=MONTH[0], created_to=MONTH[1])), ("tudo", {})):
+            samples, top = await timed_async(lambda: tag_facets(s, **kw), repeat)
+            report(f"tabela facetas {label}", samples, f"top={top[0] if top else None}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", default=None, help="diretório do banco (padrão: temporário do sistema)")
+    parser.add_argument("--reuse", action="store_true", help="reaproveita o banco já populado")
+    args = parser.parse_args()
+    path, fresh = bench_db(args.dir, f"participa-bench-tags-{args.rows}.db", args.reuse)
+    if fresh:
+        tag_rows = populate(path, args.rows)
+        print(f"{args.rows} manifestações, {tag_rows} linhas em manifestation_tags ({path})")
+    json_scan(path, args.repeat)
+    asyncio.run(indexed(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Configuração dos testes: SQLite e uploads em diretório temporário.
+As variáveis precisam existir antes de importar app (Settings e engine são criados na importação).
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="participa-df-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP}/test.db"
+os.environ["UPLOADS_DIR"] = os.path.join(_TMP, "uploads")
+os.environ["AUTOSAVE_FLUSH_INTERVAL_SECONDS"] = "0"
+os.environ["GC_INTERVAL_SECONDS"] = "0"
+os.environ["SCRUB_INTERVAL_SECONDS"] = "0"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """Sessão com as tabelas criadas; commit ao final do teste."""
+    from app.infrastructure.db.session import init_db, session_scope
+
+    await init_db()
+    async with session_scope() as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    """TestClient com o lifespan da aplicação (cria as tabelas)."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
@@ -0,0 +1,90 @@
+"""
+Listagem admin: toda combinação de filtros de ManifestationFilters, em keyset e offset
+e com total exato, deve ser atendida por índice (EXPLAIN QUERY PLAN do SQLite): nenhuma
+varredura da tabela manifestations nem ordenação em B-tree temporária.
+"""
+
+import re
+from dataclasses import fields
+from datetime import datetime
+from itertools import combinations
+
+import pytest
+from sqlalchemy import event
+
+from app.application.use_cases.list_manifestations import ManifestationFilters, list_manifestations
+from app.domain.enums import InputType, ManifestationStatus
+from app.infrastructure.db.regions import resolve_region_id
+from app.utils.cursor import encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+REGION = "Ceilândia"
+VALUES = {
+    "status": ManifestationStatus.DRAFT,
+    "input_type": InputType.TEXT,
+    "administrative_region": REGION,
+    "created_from": datetime(2026, 1, 1),
+    "created_to": datetime(2026, 12, 31),
+    "anonymous": True,
+    "tag": "escola",
+}
+
+# SCAN sem índice (varredura da tabela); "SCAN ... USING [COVERING] INDEX" percorre o índice em ordem.
+_TABLE_SCAN = re.compile(r"\bSCAN manifestations\b(?! USING)")
+
+
+def _combinations():
+    names = [f.name for f in fields(ManifestationFilters)]
+    assert set(names) == set(VALUES), "filtro novo em ManifestationFilters: inclua em VALUES"
+    for n in range(len(names) + 1):
+        yield from combinations(names, n)
+
+
+async def _plans(db, filters: ManifestationFilters, cursor: str | None) -> list[tuple[str, list[str]]]:
+    """Executa a listagem capturando os SELECTs e devolve (sql, plano) de cada um."""
+    conn = await db.connection()
+    statements: list[tuple[str, tuple]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(conn.sync_connection, "before_cursor_execute", capture)
+    try:
+        await list_manifestations(db, per_page=20, cursor=cursor, total="exact", filters=filters)
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", capture)
+    out = []
+    for sql, params in statements:
+        r = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params)
+        out.append((sql, [row[-1] for row in r.all()]))
+    return out
+
+
+@pytest.mark.parametrize("mode", ["cursor", "offset"])
+async def test_every_filter_combination_uses_an_index(db, mode):
+    await resolve_region_id(db, REGION)  # região existente: o filtro chega à consulta
+    cursor = encode_cursor(datetime(2026, 6, 1), "ffffffff-ffff-7fff-bfff-ffffffffffff") if mode == "cursor" else None
+    checked = 0
+    for combo in _combinations():
+        filters = ManifestationFilters(**{name: VALUES[name] for name in combo})
+        for sql, plan in await _plans(db, filters, cursor):
+            if "manifestations" not in sql:
+                continue  # lookup de região
+            text = "\n".join(plan)
+            assert not _TABLE_SCAN.search(text), f"{combo}: varredura de tabela\n{sql}\n{text}"
+            assert "USE TEMP B-TREE" not in text, f"{combo}: ordenação sem índice\n{sql}\n{text}"
+            checked += 1
+    assert checked >= 2 * 2 ** len(VALUES)  # página + COUNT de cada combinação
+
+
+async def test_plan_check_detects_a_table_scan(db):
+    """Sanidade do detector: filtro sem índice (original_text) precisa acusar SCAN."""
+    conn = await db.connection()
+    r = await conn.exec_driver_sql(
+        "EXPLAIN QUERY PLAN SELECT id FROM manifestations WHERE original_text = ? ORDER BY summary", ("x",)
+    )
+    text = "\n".join(row[-1] for row in r.all())
+    assert _TABLE_SCAN.search(text)
+    assert "USE TEMP B-TREE" in text
@@ -0,0 +1,96 @@
+"""
+S3Storage contra o S3 em processo do moto (sem rede): save, multipart, leitura com
+Range, delete e local_file. Ignorado quando moto/boto3 não estão instalados.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from app.core.config import get_settings  # noqa: E402
+from app.infrastructure.storage import s3_storage  # noqa: E402
+from app.infrastructure.storage.backend import local_file  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+BUCKET = "participa-test"
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    cfg = get_settings().model_copy(
+        update={
+            "s3_bucket": BUCKET,
+            "s3_prefix": "uploads/",
+            "s3_endpoint_url": None,
+            "s3_region": "us-east-1",
+            "s3_access_key_id": "testing",
+            "s3_secret_access_key": "testing",
+            "s3_multipart_threshold_bytes": 1 * MIB,
+            "s3_multipart_part_bytes": 5 * MIB,
+        }
+    )
+    monkeypatch.setattr(s3_storage, "get_settings", lambda: cfg)
+    with moto.mock_aws():
+        st = s3_storage.S3Storage()
+        st._client.create_bucket(Bucket=BUCKET)
+        yield st
+
+
+async def test_save_read_and_delete(storage):
+    content = b"conteudo do anexo"
+    [rel] = await storage.save_many("m1", [("a1", content, "png")])
+    assert rel.endswith("/a1.png")
+    assert storage.local_path(rel) is None
+    assert await storage.exists(rel)
+    assert await storage.size(rel) == len(content)
+    assert await storage.read_bytes(rel) == content
+    assert storage._client.head_object(Bucket=BUCKET, Key="uploads/" + rel)["ContentLength"] == len(content)
+
+    assert await storage.delete(rel) is True
+    assert await storage.delete(rel) is False
+    assert not await storage.exists(rel)
+    assert await storage.size(rel) is None
+    with pytest.raises(FileNotFoundError):
+        await storage.read_bytes(rel)
+
+
+async def test_multipart_upload(storage):
+    content = os.urandom(11 * MIB)  # acima do limiar: partes de 5 + 5 + 1 MiB
+    [rel] = await storage.save_many("m2", [("big", content, "mp4")])
+    head = storage._client.head_object(Bucket=BUCKET, Key="uploads/" + rel)
+    assert head["ETag"].strip('"').endswith("-3")  # ETag de multipart: md5-{partes}
+    assert await storage.read_bytes(rel) == content
+    assert storage._client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+
+async def test_ranged_reads(storage):
+    content = bytes(range(256)) * 100
+    [rel] = await storage.save_many("m3", [("r", content, "bin")])
+
+    async def read(start, end=None, chunk_size=1000):
+        return b"".join([c async for c in storage.open_stream(rel, start, end, chunk_size=chunk_size)])
+
+    assert await read(0) == content
+    assert await read(100, 199) == content[100:200]
+    assert await read(len(content) - 10) == content[-10:]
+    assert await read(5000, 25599, chunk_size=7) == content[5000:25600]
+
+
+async def test_local_file_downloads_a_temporary_copy(storage):
+    content = b"\x89PNG dados"
+    [rel] = await storage.save_many("m4", [("img", content, "png")])
+    async with local_file(storage, rel) as path:
+        assert path.endswith(".png")
+        with open(path, "rb") as f:
+            assert f.read() == content
+    assert not os.path.exists(path)
+
+    async with local_file(storage, rel, content=b"em memoria") as path:
+        with open(path, "rb") as f:
+            assert f.read() == b"em memoria"
+    assert not os.path.exists(path)
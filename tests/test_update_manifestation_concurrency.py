@@ -0,0 +1,69 @@
+"""
+Concorrência otimista no PATCH: dois PATCHes simultâneos com a mesma version não se
+sobrescrevem (um 200, um 409) e o caminho condicional grava com um único statement,
+contra SELECT + UPDATE do caminho com leitura.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import event, select
+
+from app.application.use_cases.update_manifestation import UpdateManifestationInput, update_manifestation
+from app.domain.enums import InputType
+from app.infrastructure.db.models import ManifestationModel
+from app.infrastructure.db.session import session_scope
+from app.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+async def _new_draft(db) -> str:
+    m = ManifestationModel(input_type=InputType.TEXT, original_text="rascunho")
+    db.add(m)
+    await db.commit()
+    return m.id
+
+
+async def test_concurrent_patches_with_same_version(db):
+    mid = await _new_draft(db)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        responses = await asyncio.gather(
+            *(c.patch(f"/v1/manifestations/{mid}", json={"summary": s, "version": 1}) for s in ("alfa", "beta"))
+        )
+    codes = sorted(r.status_code for r in responses)
+    assert codes == [200, 409], [r.text for r in responses]
+    winner = next(r for r in responses if r.status_code == 200)
+    sent = "alfa" if winner is responses[0] else "beta"
+    assert winner.json()["version"] == 2
+
+    async with session_scope() as s:
+        q = select(ManifestationModel.summary, ManifestationModel.version).where(ManifestationModel.id == mid)
+        row = (await s.execute(q)).one()
+    assert (row.summary, row.version) == (sent, 2)
+
+
+async def _statements(db, mid: str, inp: UpdateManifestationInput) -> list[str]:
+    conn = await db.connection()
+    seen: list[str] = []
+
+    def capture(_conn, _cursor, statement, _params, _context, _many):
+        seen.append(statement.split(None, 1)[0].upper())
+
+    event.listen(conn.sync_connection, "before_cursor_execute", capture)
+    try:
+        await update_manifestation(db, mid, inp)
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", capture)
+    await db.commit()
+    return seen
+
+
+async def test_conditional_update_uses_one_statement(db):
+    mid = await _new_draft(db)
+    conditional = await _statements(db, mid, UpdateManifestationInput(summary="a", version=1))
+    read_write = await _statements(db, mid, UpdateManifestationInput(summary="b"))
+    assert conditional == ["UPDATE"]
+    assert read_write == ["SELECT", "UPDATE"]